@@ -4,6 +4,7 @@ import sqlalchemy
 from sqlalchemy import orm
 
 from core.db import config as db_config
+from core.db import session as db_session
 from trading.database import base
 
 _TEST_DATABASE = "test"
@@ -27,3 +28,20 @@ def test_db(mocker: pytest_mock.MockerFixture):
     except Exception as e:
         print(f"Connecting to mysql failed with dsn: {config.dsn}/{_TEST_DATABASE}, did you 'make infra'?")
         raise e
+
+
+@pytest.fixture(scope="function")
+def sqlite_db(mocker: pytest_mock.MockerFixture):
+    """In-memory SQLite served as the test database, no server needed"""
+    mocker.patch.dict(db_session._engines, clear=True)
+    mocker.patch.dict(db_session._sqlite_databases, clear=True)
+    db_session.use_sqlite(_TEST_DATABASE)
+
+    engine = db_session.get_or_create_engine(_TEST_DATABASE)
+    base.Base.metadata.create_all(engine)
+    session = orm.Session(bind=engine)
+
+    yield session
+
+    session.close()
+    engine.dispose()
@@ -1,4 +1,5 @@
 import abc
+import asyncio
 
 from langchain import chat_models
 from langchain_core import messages
@@ -6,6 +7,7 @@ from overrides import overrides
 
 from core.bot import config as llm_config
 from core.bot import models as llm_models
+from core.cassette import cassette
 
 
 class BaseChatClient(abc.ABC):
@@ -24,6 +26,34 @@ class BaseChatClient(abc.ABC):
     def invoke(self, message: str) -> messages.BaseMessage:
         pass
 
+    @abc.abstractmethod
+    async def ainvoke(self, message: str) -> messages.BaseMessage:
+        pass
+
+    async def _ainvoke_all(
+        self, message_list: list[str], max_in_flight: int, timeout: float
+    ) -> list[messages.BaseMessage | Exception]:
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def _bounded(message: str) -> messages.BaseMessage:
+            # the timeout starts once the call is in flight, not while it waits for a slot
+            async with semaphore:
+                return await asyncio.wait_for(self.ainvoke(message), timeout)
+
+        return await asyncio.gather(*[_bounded(m) for m in message_list], return_exceptions=True)
+
+    def invoke_all(
+        self,
+        message_list: list[str],
+        max_in_flight: int = llm_config.MAX_IN_FLIGHT,
+        timeout: float = llm_config.CALL_TIMEOUT,
+    ) -> list[messages.BaseMessage | Exception]:
+        """Invokes messages concurrently with at most `max_in_flight` calls at a time
+
+        Results keep the order of messages, a failed or timed out call leaves its exception in place of the answer.
+        """
+        return asyncio.run(self._ainvoke_all(message_list, max_in_flight, timeout))
+
 
 class OpenAIChatClient(BaseChatClient):
     _system_prompt: str
@@ -36,11 +66,37 @@ class OpenAIChatClient(BaseChatClient):
             api_key=self._config.openai_api_key,
         )
 
+    def _messages(self, message: str) -> list[messages.BaseMessage]:
+        return [
+            messages.SystemMessage(self._system_prompt),
+            messages.HumanMessage(message),
+        ]
+
+    def _invoke(self, message: str) -> messages.BaseMessage:
+        return self._model.invoke(self._messages(message))
+
     @overrides
     def invoke(self, message: str) -> messages.BaseMessage:
-        return self._model.invoke(
-            [
-                messages.SystemMessage(self._system_prompt),
-                messages.HumanMessage(message),
-            ],
+        recorder = cassette.get_cassette()
+        if recorder is None:
+            return self._invoke(message)
+
+        # the chat model talks over httpx, so its answers are recorded at this level instead
+        text = recorder.call(
+            self._model_provider,
+            [self._model.model_name, self._system_prompt, message],
+            lambda: self._invoke(message).content,
         )
+        return messages.AIMessage(text)
+
+    @overrides
+    async def ainvoke(self, message: str) -> messages.BaseMessage:
+        recorder = cassette.get_cassette()
+        if recorder is None:
+            return await self._model.ainvoke(self._messages(message))
+
+        async def _text() -> str:
+            return (await self._model.ainvoke(self._messages(message))).content
+
+        text = await recorder.acall(self._model_provider, [self._model.model_name, self._system_prompt, message], _text)
+        return messages.AIMessage(text)
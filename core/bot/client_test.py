@@ -0,0 +1,48 @@
+import asyncio
+
+from langchain_core import messages
+from overrides import overrides
+
+from core.bot import client
+
+
+class _SlowChatClient(client.BaseChatClient):
+    def __init__(self, delays: dict[str, float]):
+        self._delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @overrides
+    def invoke(self, message: str) -> messages.BaseMessage:
+        raise NotImplementedError
+
+    @overrides
+    async def ainvoke(self, message: str) -> messages.BaseMessage:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delays[message])
+            if message == "error":
+                raise ValueError(message)
+            return messages.AIMessage(f"answer to {message}")
+        finally:
+            self.in_flight -= 1
+
+
+def test_invoke_all_bounds_in_flight_calls():
+    bot = _SlowChatClient({str(i): 0.05 for i in range(8)})
+
+    answers = bot.invoke_all([str(i) for i in range(8)], max_in_flight=4, timeout=1)
+
+    assert [a.content for a in answers] == [f"answer to {i}" for i in range(8)]
+    assert bot.max_in_flight == 4
+
+
+def test_invoke_all_keeps_failures_in_place():
+    bot = _SlowChatClient({"fast": 0.0, "slow": 1.0, "error": 0.0})
+
+    answers = bot.invoke_all(["slow", "fast", "error"], max_in_flight=3, timeout=0.1)
+
+    assert isinstance(answers[0], TimeoutError)
+    assert answers[1].content == "answer to fast"
+    assert isinstance(answers[2], ValueError)
@@ -1,5 +1,9 @@
 import pydantic_settings
 
+# defaults of concurrent chat calls, shared by the clients, the tasks and their command line arguments
+MAX_IN_FLIGHT = 8
+CALL_TIMEOUT = 120.0  # seconds
+
 
 class LangchainConfig(pydantic_settings.BaseSettings):
     openai_api_key: str
@@ -0,0 +1,236 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import pathlib
+import time
+from typing import Awaitable, Callable
+from urllib import parse
+
+from loguru import logger
+import requests
+from requests import adapters
+from requests import structures
+
+from core.cassette import config as cassette_config
+
+# credentials are dropped from request keys and redacted from saved responses, so recordings neither leak nor
+# depend on them
+_SECRET_FIELDS = {"crtfc_key", "appkey", "appsecret", "secretkey", "authorization", "approval_key", "access_token"}
+_REDACTED = "REDACTED"
+# headers which tell requests apart, KIS picks the endpoint by tr_id on shared paths and pages with tr_cont
+_KEY_HEADERS = ("tr_id", "tr_cont", "custtype")
+
+_ORIGINAL_SEND = adapters.HTTPAdapter.send
+_CASSETTE = None
+
+
+class CassetteMissError(RuntimeError):
+    """Raised on replay when an interaction was never recorded"""
+
+
+def _strip_secrets(items: dict) -> dict:
+    return {k: v for k, v in sorted(items.items()) if k.lower() not in _SECRET_FIELDS}
+
+
+def _redact(value):
+    if isinstance(value, dict):
+        return {k: _REDACTED if k.lower() in _SECRET_FIELDS else _redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact(v) for v in value]
+    return value
+
+
+def _redacted_content(content: bytes) -> bytes:
+    try:
+        return json.dumps(_redact(json.loads(content)), ensure_ascii=False).encode()
+    except ValueError:
+        return content
+
+
+def _muted_response(request: requests.PreparedRequest) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 204
+    response.reason = "No Content"
+    response._content = b""
+    response.url = request.url
+    response.request = request
+    return response
+
+
+def _request_key(request: requests.PreparedRequest) -> str:
+    url = parse.urlsplit(request.url)
+    params = _strip_secrets(dict(parse.parse_qsl(url.query)))
+
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    try:
+        body = json.dumps(_strip_secrets(json.loads(body)), ensure_ascii=False).encode()
+    except (ValueError, AttributeError):
+        pass
+
+    key_parts = [request.method, url.netloc, url.path, params]
+    headers = {name: request.headers[name] for name in _KEY_HEADERS if request.headers.get(name)}
+    if headers:
+        # keys of requests without such headers are unchanged, so earlier recordings still replay
+        key_parts.append(headers)
+
+    canonical = json.dumps(key_parts, ensure_ascii=False).encode() + body
+    return hashlib.sha1(canonical).hexdigest()
+
+
+def _call_key(key_parts: list[str]) -> str:
+    return hashlib.sha1(json.dumps(key_parts, ensure_ascii=False).encode()).hexdigest()
+
+
+class Cassette:
+    """Stores interactions as gzipped json files under `directory/namespace/`"""
+
+    def __init__(
+        self,
+        directory: str,
+        mode: cassette_config.Mode,
+        latency: float = 0.0,
+        muted_hosts: list[str] | None = None,
+    ):
+        self._directory = pathlib.Path(directory)
+        self._mode = mode
+        self._latency = latency
+        self._muted_hosts = set(muted_hosts or [])
+
+    @property
+    def mode(self) -> cassette_config.Mode:
+        return self._mode
+
+    def _path(self, namespace: str, key: str) -> pathlib.Path:
+        return self._directory / namespace / f"{key}.json.gz"
+
+    def load(self, namespace: str, key: str) -> dict | None:
+        path = self._path(namespace, key)
+        if not path.exists():
+            return None
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, namespace: str, key: str, payload: dict) -> None:
+        path = self._path(namespace, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+    def _load_recorded(self, namespace: str, key: str, description: str) -> dict:
+        payload = self.load(namespace, key)
+        if payload is None:
+            raise CassetteMissError(f"No recorded interaction for {description}")
+        return payload
+
+    def _replay(self, namespace: str, key: str, description: str) -> dict:
+        payload = self._load_recorded(namespace, key, description)
+
+        if self._latency > 0:
+            time.sleep(self._latency)
+        return payload
+
+    def send(
+        self,
+        send: Callable[..., requests.Response],
+        adapter: adapters.HTTPAdapter,
+        request: requests.PreparedRequest,
+        **kwargs,
+    ) -> requests.Response:
+        namespace = parse.urlsplit(request.url).netloc
+        if self._mode != cassette_config.Mode.OFF and parse.urlsplit(request.url).hostname in self._muted_hosts:
+            # side effects like notifications are neither sent while recording nor expected to be recorded
+            return _muted_response(request)
+
+        key = _request_key(request)
+
+        if self._mode == cassette_config.Mode.REPLAY:
+            payload = self._replay(namespace, key, f"{request.method} {request.url}")
+
+            response = requests.Response()
+            response.status_code = payload["status_code"]
+            response.reason = payload["reason"]
+            response.headers = structures.CaseInsensitiveDict(payload["headers"])
+            response.encoding = payload["encoding"]
+            response._content = base64.b64decode(payload["content"])
+            response.url = request.url
+            response.request = request
+            return response
+
+        response = send(adapter, request, **kwargs)
+
+        if self._mode == cassette_config.Mode.RECORD:
+            self.save(
+                namespace,
+                key,
+                {
+                    "status_code": response.status_code,
+                    "reason": response.reason,
+                    "headers": dict(response.headers),
+                    "encoding": response.encoding,
+                    "content": base64.b64encode(_redacted_content(response.content)).decode(),
+                },
+            )
+        return response
+
+    def call(self, namespace: str, key_parts: list[str], fn: Callable[[], str]) -> str:
+        """Record or replay a text-returning call which doesn't go through `requests`"""
+        key = _call_key(key_parts)
+
+        if self._mode == cassette_config.Mode.REPLAY:
+            return self._replay(namespace, key, f"{namespace} call")["text"]
+
+        text = fn()
+
+        if self._mode == cassette_config.Mode.RECORD:
+            self.save(namespace, key, {"text": text})
+        return text
+
+    async def acall(self, namespace: str, key_parts: list[str], fn: Callable[[], Awaitable[str]]) -> str:
+        """`call` for coroutines, shares recordings with `call` and replays without blocking the event loop"""
+        key = _call_key(key_parts)
+
+        if self._mode == cassette_config.Mode.REPLAY:
+            payload = self._load_recorded(namespace, key, f"{namespace} call")
+            if self._latency > 0:
+                await asyncio.sleep(self._latency)
+            return payload["text"]
+
+        text = await fn()
+
+        if self._mode == cassette_config.Mode.RECORD:
+            self.save(namespace, key, {"text": text})
+        return text
+
+
+def get_cassette() -> Cassette | None:
+    """Installed cassette, `None` when record/replay is off"""
+    return _CASSETTE
+
+
+def install() -> Cassette | None:
+    global _CASSETTE
+    cfg = cassette_config.load_config()
+
+    if cfg.mode == cassette_config.Mode.OFF:
+        return None
+
+    _CASSETTE = Cassette(cfg.directory, cfg.mode, cfg.latency, cfg.muted_hosts)
+
+    def send(adapter: adapters.HTTPAdapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        return _CASSETTE.send(_ORIGINAL_SEND, adapter, request, **kwargs)
+
+    adapters.HTTPAdapter.send = send
+    logger.warning(f"HTTP cassette installed in {cfg.mode} mode at {cfg.directory}")
+    return _CASSETTE
+
+
+def uninstall() -> None:
+    global _CASSETTE
+    _CASSETTE = None
+    adapters.HTTPAdapter.send = _ORIGINAL_SEND
@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+import requests
+
+from core.cassette import cassette
+from core.cassette import config as cassette_config
+
+
+def _prepare(url: str) -> requests.PreparedRequest:
+    return requests.Request("GET", url).prepare()
+
+
+def _fake_send(adapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.headers["content-type"] = "application/json"
+    response.encoding = "utf-8"
+    response._content = b'{"status": "000", "list": [1, 2, 3]}'
+    response.url = request.url
+    return response
+
+
+def test_record_then_replay(tmp_path):
+    recorder = cassette.Cassette(str(tmp_path), cassette_config.Mode.RECORD)
+    recorded = recorder.send(
+        _fake_send, None, _prepare("https://opendart.fss.or.kr/api/x.json?crtfc_key=a&corp_code=1")
+    )
+
+    player = cassette.Cassette(str(tmp_path), cassette_config.Mode.REPLAY)
+    # credentials are not part of the key, replaying with another key still hits
+    replayed = player.send(None, None, _prepare("https://opendart.fss.or.kr/api/x.json?corp_code=1&crtfc_key=b"))
+
+    assert replayed.status_code == recorded.status_code
+    assert replayed.json() == recorded.json()
+    assert replayed.headers["content-type"] == "application/json"
+
+
+def test_tokens_in_responses_are_redacted(tmp_path):
+    def send_token(adapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        response = _fake_send(adapter, request)
+        response._content = b'{"access_token": "secret", "token_type": "Bearer", "approval_key": "secret"}'
+        return response
+
+    recorder = cassette.Cassette(str(tmp_path), cassette_config.Mode.RECORD)
+    recorded = recorder.send(send_token, None, _prepare("https://openapi.koreainvestment.com/oauth2/tokenP"))
+    # the caller still gets the real token
+    assert recorded.json()["access_token"] == "secret"
+
+    player = cassette.Cassette(str(tmp_path), cassette_config.Mode.REPLAY)
+    replayed = player.send(None, None, _prepare("https://openapi.koreainvestment.com/oauth2/tokenP"))
+    assert replayed.json() == {"access_token": "REDACTED", "token_type": "Bearer", "approval_key": "REDACTED"}
+
+
+def test_muted_hosts_are_neither_sent_nor_recorded(tmp_path):
+    for mode in [cassette_config.Mode.RECORD, cassette_config.Mode.REPLAY]:
+        muted = cassette.Cassette(str(tmp_path), mode, muted_hosts=["discord.com"])
+        response = muted.send(
+            lambda *args, **kwargs: pytest.fail("should not be sent"),
+            None,
+            requests.Request("POST", "https://discord.com/api/webhooks/1", json={"content": "hi"}).prepare(),
+        )
+        assert response.status_code == 204
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_requests_differing_in_tr_id_are_recorded_apart(tmp_path):
+    url = "https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/trading/order-cash"
+    body = {"PDNO": "005930", "ORD_QTY": "1"}
+
+    def order(tr_id: str) -> requests.PreparedRequest:
+        return requests.Request("POST", url, json=body, headers={"tr_id": tr_id}).prepare()
+
+    def send_order(adapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        response = _fake_send(adapter, request)
+        response._content = json.dumps({"tr_id": request.headers["tr_id"]}).encode()
+        return response
+
+    recorder = cassette.Cassette(str(tmp_path), cassette_config.Mode.RECORD)
+    for tr_id in ["TTTC0802U", "TTTC0801U"]:
+        recorder.send(send_order, None, order(tr_id))
+
+    player = cassette.Cassette(str(tmp_path), cassette_config.Mode.REPLAY)
+    assert player.send(None, None, order("TTTC0802U")).json() == {"tr_id": "TTTC0802U"}
+    assert player.send(None, None, order("TTTC0801U")).json() == {"tr_id": "TTTC0801U"}
+
+
+def test_replay_miss_raises(tmp_path):
+    player = cassette.Cassette(str(tmp_path), cassette_config.Mode.REPLAY)
+
+    with pytest.raises(cassette.CassetteMissError):
+        player.send(None, None, _prepare("https://opendart.fss.or.kr/api/x.json?corp_code=2"))
+
+
+def test_call_roundtrip(tmp_path):
+    cassette.Cassette(str(tmp_path), cassette_config.Mode.RECORD).call("openai", ["model", "prompt"], lambda: "answer")
+
+    player = cassette.Cassette(str(tmp_path), cassette_config.Mode.REPLAY)
+    assert player.call("openai", ["model", "prompt"], lambda: pytest.fail("should be replayed")) == "answer"
+
+
+def test_acall_shares_recordings_with_call(tmp_path):
+    async def answer() -> str:
+        return "answer"
+
+    recorder = cassette.Cassette(str(tmp_path), cassette_config.Mode.RECORD)
+    assert asyncio.run(recorder.acall("openai", ["model", "prompt"], answer)) == "answer"
+
+    player = cassette.Cassette(str(tmp_path), cassette_config.Mode.REPLAY)
+    assert player.call("openai", ["model", "prompt"], lambda: pytest.fail("should be replayed")) == "answer"
+    with pytest.raises(cassette.CassetteMissError):
+        asyncio.run(player.acall("openai", ["model", "other"], answer))
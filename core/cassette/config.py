@@ -0,0 +1,22 @@
+import enum
+
+import pydantic_settings
+
+
+class Mode(enum.StrEnum):
+    OFF = "off"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class Config(pydantic_settings.BaseSettings):
+    mode: Mode = Mode.OFF
+    directory: str = "cassettes"
+    latency: float = 0.0  # seconds added to every replayed interaction
+    muted_hosts: list[str] = ["discord.com", "discordapp.com"]  # answered locally, neither sent nor recorded
+
+    model_config = pydantic_settings.SettingsConfigDict(env_file=[".env"], env_prefix="CASSETTE_", extra="allow")
+
+
+def load_config() -> Config:
+    return Config()
@@ -16,3 +16,18 @@ class MySqlConfig(pydantic_settings.BaseSettings):
 
 def load_config() -> MySqlConfig:
     return MySqlConfig()  # pylint: disable=no-value-for-parameter
+
+
+class SqliteConfig(pydantic_settings.BaseSettings):
+    """Databases served by SQLite instead of MySQL, file path or ":memory:" by database name
+
+    e.g. SQLITE_DATABASES='{"test": ":memory:", "finance": "finance.db"}'
+    """
+
+    databases: dict[str, str] = {}
+
+    model_config = pydantic_settings.SettingsConfigDict(env_file=[".env"], extra="allow", env_prefix="SQLITE_")
+
+
+def load_sqlite_config() -> SqliteConfig:
+    return SqliteConfig()
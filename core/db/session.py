@@ -1,33 +1,106 @@
 import contextlib
+import threading
 
 import sqlalchemy
 from sqlalchemy import orm
+from sqlalchemy import pool
+from sqlalchemy.pool import base as pool_base
 
 from core.db import config
 
 _engines: dict[str, sqlalchemy.Engine] = {}
+_sqlite_databases: dict[str, str] = {}
 
 _POOL_SIZE = 10
 _POOL_TIMEOUT = 60
 _POOL_RECYCLE = 3600
+_SQLITE_MEMORY = ":memory:"
+
+
+def use_sqlite(database: str, path: str = _SQLITE_MEMORY) -> None:
+    """Serves database from SQLite from now on, takes precedence over SQLITE_DATABASES"""
+    _sqlite_databases[database] = path
+
+    engine = _engines.pop(database, None)
+    if engine is not None:
+        engine.dispose()
+
+
+class _SerializedStaticPool(pool.StaticPool):
+    """StaticPool lending its single connection to one thread at a time, from checkout to checkin
+
+    The turn is taken before the shared connection record is touched, checkout events fire too late for that. Nested
+    checkouts of the holding thread reuse its connection like SingletonThreadPool does, and a session keeps the
+    connection from its first query to its commit or close: the turn lasts the whole `get_database_session` block and
+    other threads queue behind it. A thread must not wait on another thread's queries while it holds a session, keep
+    sessions short and open them inside each task of a thread pool rather than around it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._turn = threading.Lock()
+        self._thread_fairy = threading.local()
+
+    def connect(self) -> pool.PoolProxiedConnection:
+        current = getattr(self._thread_fairy, "current", None)
+        fairy = current() if current is not None else None
+        if fairy is not None:
+            return fairy._checkout_existing()
+
+        return pool_base._ConnectionFairy._checkout(self, self._thread_fairy)
+
+    def _do_get(self) -> pool.ConnectionPoolEntry:
+        self._turn.acquire()
+        try:
+            return super()._do_get()
+        except BaseException:
+            self._turn.release()
+            raise
+
+    def _do_return_conn(self, record: pool.ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self._turn.release()
+
+
+def _create_sqlite_engine(path: str, echo: bool) -> sqlalchemy.Engine:
+    if path == _SQLITE_MEMORY:
+        # every connection to :memory: opens its own empty database, so all threads share a single one and take turns
+        # on it, interleaved transactions on one connection would otherwise see and commit each other's writes
+        return sqlalchemy.create_engine(
+            "sqlite://",
+            echo=echo,
+            poolclass=_SerializedStaticPool,
+            connect_args={"check_same_thread": False},
+        )
+
+    return sqlalchemy.create_engine(f"sqlite:///{path}", echo=echo, connect_args={"check_same_thread": False})
+
+
+def _create_mysql_engine(database: str, echo: bool) -> sqlalchemy.Engine:
+    db_config = config.load_config()
+    dsn = db_config.dsn.rstrip("/")
+    db_name = database.lstrip("/")
+    url = f"{dsn}/{db_name}"
+
+    return sqlalchemy.create_engine(
+        url,
+        echo=echo,
+        pool_size=_POOL_SIZE,
+        pool_timeout=_POOL_TIMEOUT,
+        pool_recycle=_POOL_RECYCLE,
+    )
 
 
 def get_or_create_engine(database: str, echo: bool = False) -> sqlalchemy.Engine:
     global _engines
 
     if database not in _engines:
-        db_config = config.load_config()
-        dsn = db_config.dsn.rstrip("/")
-        db_name = database.lstrip("/")
-        url = f"{dsn}/{db_name}"
+        sqlite_path = _sqlite_databases.get(database) or config.load_sqlite_config().databases.get(database)
 
-        _engines[database] = sqlalchemy.create_engine(
-            url,
-            echo=echo,
-            pool_size=_POOL_SIZE,
-            pool_timeout=_POOL_TIMEOUT,
-            pool_recycle=_POOL_RECYCLE,
-        )
+        if sqlite_path is not None:
+            _engines[database] = _create_sqlite_engine(sqlite_path, echo)
+        else:
+            _engines[database] = _create_mysql_engine(database, echo)
 
     return _engines[database]
 
@@ -0,0 +1,56 @@
+from concurrent import futures
+import threading
+import time
+
+import pytest_mock
+import sqlalchemy
+
+from core.db import session
+
+
+def test_in_memory_connections_are_taken_in_turns():
+    engine = session._create_sqlite_engine(":memory:", echo=False)
+    entered = threading.Event()
+
+    def connect() -> None:
+        with engine.connect() as conn:
+            conn.execute(sqlalchemy.text("SELECT 1"))
+            entered.set()
+
+    with engine.connect() as conn:
+        # nested connections of the holding thread are not blocked
+        with engine.connect() as nested:
+            nested.execute(sqlalchemy.text("SELECT 1"))
+
+        thread = threading.Thread(target=connect)
+        thread.start()
+        assert not entered.wait(0.2)
+        conn.execute(sqlalchemy.text("SELECT 1"))
+
+    assert entered.wait(5)
+    thread.join()
+    engine.dispose()
+
+
+def test_in_memory_sessions_from_concurrent_threads(mocker: pytest_mock.MockerFixture):
+    mocker.patch.dict(session._engines, clear=True)
+    mocker.patch.dict(session._sqlite_databases, clear=True)
+    session.use_sqlite("concurrent")
+
+    with session.get_database_session("concurrent") as db_session:
+        db_session.execute(sqlalchemy.text("CREATE TABLE counter (worker INTEGER, step INTEGER)"))
+
+    def write(worker: int) -> None:
+        with session.get_database_session("concurrent") as db_session:
+            for step in range(5):
+                db_session.execute(sqlalchemy.text("INSERT INTO counter VALUES (:w, :s)"), {"w": worker, "s": step})
+                time.sleep(0.001)
+
+    with futures.ThreadPoolExecutor(max_workers=8) as executor:
+        for f in [executor.submit(write, worker) for worker in range(16)]:
+            f.result(timeout=10)
+
+    with session.get_database_session("concurrent") as db_session:
+        assert db_session.execute(sqlalchemy.text("SELECT COUNT(*) FROM counter")).scalar() == 80
+
+    session.get_or_create_engine("concurrent").dispose()
@@ -1,8 +1,93 @@
+import dataclasses
+import itertools
+import time
+from typing import Callable, Iterable
+
+from loguru import logger
+import sqlalchemy
 from sqlalchemy import orm
 from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects import sqlite
+
+_CHUNK_SIZE = 1000
+
+
+@dataclasses.dataclass
+class UpsertStats:
+    rows: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _on_conflict_update(model: orm.DeclarativeBase, dialect: str):
+    table = model.__table__
+    columns = [col.name for col in table.columns if not col.primary_key]
+
+    if dialect == "mysql":
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update(**{name: stmt.inserted[name] for name in columns})
+
+    if dialect == "sqlite":
+        stmt = sqlite.insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[col.name for col in table.primary_key],
+            set_={name: stmt.excluded[name] for name in columns},
+        )
+
+    raise ValueError(f"Upsert is not supported on {dialect}")
+
+
+def auto_upsert_stmt(model: orm.DeclarativeBase, values: list[dict], dialect: str = "mysql"):
+    return _on_conflict_update(model, dialect).values(values)
+
+
+def upsert_stmt(model: orm.DeclarativeBase, dialect: str = "mysql"):
+    """Parameterized upsert of model, to be executed with a list of rows executemany-style"""
+    return _on_conflict_update(model, dialect)
+
+
+def bulk_upsert(
+    engine: sqlalchemy.Engine,
+    model: orm.DeclarativeBase,
+    rows: Iterable[dict],
+    chunk_size: int = _CHUNK_SIZE,
+    commit_per_chunk: bool = False,
+    derived: dict[orm.DeclarativeBase, Callable[[list[dict]], list[dict]]] | None = None,
+) -> UpsertStats:
+    """Upserts rows chunk by chunk as they are consumed from the iterable
+
+    Rows are sent as bound parameters instead of literal values so statements stay below max_allowed_packet, with
+    `commit_per_chunk` every chunk is its own transaction instead of the whole iterable. Rows `derived` from a chunk,
+    e.g. dated copies for a history table, are upserted to their own model in the same transaction as the chunk.
+    """
+    stmt = upsert_stmt(model, engine.dialect.name)
+    derived_stmts = {
+        other: (upsert_stmt(other, engine.dialect.name), derive) for other, derive in (derived or {}).items()
+    }
+    stats = UpsertStats()
+    rows = iter(rows)
+    start = time.perf_counter()
+
+    with engine.connect() as conn:
+        while chunk := list(itertools.islice(rows, chunk_size)):
+            conn.execute(stmt, chunk)
+            for derived_stmt, derive in derived_stmts.values():
+                conn.execute(derived_stmt, derive(chunk))
+            stats.rows += len(chunk)
+            stats.chunks += 1
 
+            if commit_per_chunk:
+                conn.commit()
+        conn.commit()
 
-def auto_upsert_stmt(model: orm.DeclarativeBase, values: list[dict]):
-    stmt = mysql.insert(model).values(values)
-    update_dict = {col.name: stmt.inserted[col.name] for col in model.__table__.columns if not col.primary_key}
-    return stmt.on_duplicate_key_update(**update_dict)
+    stats.elapsed = time.perf_counter() - start
+    table_names = ", ".join([model.__tablename__] + [other.__tablename__ for other in derived_stmts])
+    logger.info(
+        f"Upserted {stats.rows} rows to {table_names} in {stats.chunks} chunks, "
+        f"{stats.elapsed:.2f}s, {stats.rows_per_second:.0f} rows/s"
+    )
+    return stats
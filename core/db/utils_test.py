@@ -0,0 +1,66 @@
+import datetime
+
+import pytest
+from sqlalchemy import orm
+from sqlalchemy.dialects import sqlite
+
+from core.db import session
+from core.db import utils
+from trading.database.finance import tables
+
+
+def _rows(num_rows: int, modify_date: str):
+    for i in range(num_rows):
+        yield {
+            "corp_code": f"{i:08d}",
+            "corp_name": f"corp_{i}",
+            "corp_eng_name": None,
+            "stock_code": None,
+            "modify_date": modify_date,
+        }
+
+
+def test_bulk_upsert_in_chunks(sqlite_db: orm.Session):
+    engine = session.get_or_create_engine("test")
+
+    stats = utils.bulk_upsert(engine, tables.CorporateInfo, _rows(25, "20250801"), chunk_size=10)
+    assert (stats.rows, stats.chunks) == (25, 3)
+
+    utils.bulk_upsert(engine, tables.CorporateInfo, _rows(5, "20250901"), chunk_size=10, commit_per_chunk=True)
+
+    rows = sqlite_db.query(tables.CorporateInfo).order_by(tables.CorporateInfo.corp_code).all()
+    assert len(rows) == 25
+    assert [r.modify_date for r in rows[:6]] == ["20250901"] * 5 + ["20250801"]
+
+
+def test_bulk_upsert_derived_rows(sqlite_db: orm.Session):
+    engine = session.get_or_create_engine("test")
+    quotes = ({"symbol": f"{i:06d}", "price": i} for i in range(5))
+
+    def history_rows(chunk: list[dict]) -> list[dict]:
+        return [{**row, "date": datetime.date(2026, 10, 1)} for row in chunk]
+
+    utils.bulk_upsert(
+        engine,
+        tables.CorporateQuote,
+        quotes,
+        chunk_size=2,
+        commit_per_chunk=True,
+        derived={tables.CorporateQuoteHistory: history_rows},
+    )
+
+    assert sqlite_db.query(tables.CorporateQuote).count() == 5
+    history = sqlite_db.query(tables.CorporateQuoteHistory).order_by(tables.CorporateQuoteHistory.symbol).all()
+    assert [(h.symbol, h.date, h.price) for h in history] == [
+        (f"{i:06d}", datetime.date(2026, 10, 1), i) for i in range(5)
+    ]
+
+
+def test_upsert_stmt_by_dialect():
+    assert "ON DUPLICATE KEY UPDATE" in str(utils.upsert_stmt(tables.DailyBarCoverage, "mysql"))
+    assert "ON CONFLICT (symbol) DO UPDATE" in str(
+        utils.upsert_stmt(tables.DailyBarCoverage, "sqlite").compile(dialect=sqlite.dialect())
+    )
+
+    with pytest.raises(ValueError):
+        utils.upsert_stmt(tables.DailyBarCoverage, "oracle")
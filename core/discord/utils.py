@@ -5,9 +5,9 @@ import traceback
 from typing import Callable
 
 from loguru import logger
-import requests
 
 from core.discord import config as discord_config
+from core.utils import http
 from core.utils import time as time_utils
 
 _CHAR_LIMIT = 2000
@@ -25,7 +25,7 @@ def send(message: str, image_url: str | None = None) -> None:
         embeds = [{"image": {"url": image_url}}]
 
     try:
-        response = requests.post(
+        response = http.get_session("discord").post(
             url=config.webhook,
             data=json.dumps(
                 {
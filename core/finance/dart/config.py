@@ -3,6 +3,14 @@ import pydantic_settings
 
 class Config(pydantic_settings.BaseSettings):
     crtfc_key: str
+    cache_dir: str = ".cache/dart"
+    corp_directory_ttl: float = 24 * 60 * 60  # DART updates the corp code file at most daily
+    report_negative_ttl: float = 12 * 60 * 60  # reports not filed yet are asked again on the next run
+
+    # DART allows 20,000 requests a day per key and blocks keys which burst
+    requests_per_second: float = 5
+    daily_quota: int = 20_000
+    quota_reserve: int = 1_000
 
     model_config = pydantic_settings.SettingsConfigDict(env_file=".env", env_prefix="DART_", extra="allow")
 
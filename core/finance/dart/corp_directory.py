@@ -0,0 +1,94 @@
+import gzip
+import json
+import pathlib
+import time
+from typing import Callable
+
+from loguru import logger
+import requests
+
+from core.finance.dart import model
+from core.finance.dart import quota
+
+
+class CorpDirectory:
+    """DART corp codes indexed by corp name, english name, corp code and stock code
+
+    Names are not unique in DART, the first item in file order wins as the linear scans used to do.
+    """
+
+    def __init__(self, items: list[model.CorpInfoItem], loaded_at: float | None = None):
+        self._items = items
+        self._loaded_at = time.time() if loaded_at is None else loaded_at
+        self._by_corp_code: dict[str, model.CorpInfoItem] = {}
+        self._by_stock_code: dict[str, model.CorpInfoItem] = {}
+        self._by_name: dict[str, model.CorpInfoItem] = {}
+
+        for item in items:
+            self._by_corp_code.setdefault(item.corp_code, item)
+            if item.stock_code:
+                self._by_stock_code.setdefault(item.stock_code, item)
+            self._by_name.setdefault(item.corp_name, item)
+            if item.corp_eng_name:
+                self._by_name.setdefault(item.corp_eng_name, item)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def items(self) -> list[model.CorpInfoItem]:
+        return self._items
+
+    @property
+    def loaded_at(self) -> float:
+        return self._loaded_at
+
+    def is_stale(self, ttl: float) -> bool:
+        return time.time() - self._loaded_at > ttl
+
+    def by_name(self, name: str) -> model.CorpInfoItem | None:
+        """lookup by corp name or corp english name"""
+        return self._by_name.get(name)
+
+    def by_corp_code(self, corp_code: str) -> model.CorpInfoItem | None:
+        return self._by_corp_code.get(corp_code)
+
+    def by_stock_code(self, stock_code: str) -> model.CorpInfoItem | None:
+        return self._by_stock_code.get(stock_code)
+
+    def save(self, path: pathlib.Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump([item.model_dump() for item in self._items], f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "CorpDirectory":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            items = [model.CorpInfoItem(**row) for row in json.load(f)]
+
+        return cls(items, loaded_at=path.stat().st_mtime)
+
+
+def load_or_refresh(path: pathlib.Path, ttl: float, loader: Callable[[], list[model.CorpInfoItem]]) -> CorpDirectory:
+    """Directory cached at path, downloaded again with loader once the file is older than ttl seconds"""
+    cached = None
+    if path.exists():
+        try:
+            cached = CorpDirectory.load(path)
+            if not cached.is_stale(ttl):
+                return cached
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring broken corp directory cache {path}: {e}")
+
+    try:
+        directory = CorpDirectory(loader())
+    except (quota.QuotaExhaustedError, requests.RequestException) as e:
+        if cached is None:
+            raise e
+        logger.warning(f"Serving stale corp directory, refresh failed: {e}")
+        return cached
+
+    directory.save(path)
+    logger.info(f"Refreshed corp directory of {len(directory)} corps at {path}")
+    return directory
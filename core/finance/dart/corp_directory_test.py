@@ -0,0 +1,61 @@
+import os
+import time
+
+from core.finance.dart import corp_directory
+from core.finance.dart import model
+
+_ITEMS = [
+    model.CorpInfoItem(
+        corp_code="00126380",
+        corp_name="삼성전자",
+        corp_eng_name="SAMSUNG ELECTRONICS CO,.LTD",
+        stock_code="005930",
+        modify_date="20250801",
+    ),
+    model.CorpInfoItem(
+        corp_code="00000001",
+        corp_name="삼성전자",
+        corp_eng_name=None,
+        stock_code=None,
+        modify_date="20200101",
+    ),
+    model.CorpInfoItem(
+        corp_code="00164779",
+        corp_name="SK하이닉스",
+        corp_eng_name="SK hynix Inc.",
+        stock_code="000660",
+        modify_date="20250801",
+    ),
+]
+
+
+def test_lookups():
+    directory = corp_directory.CorpDirectory(_ITEMS)
+
+    assert directory.by_name("삼성전자").corp_code == "00126380"  # first item wins on duplicated names
+    assert directory.by_name("SK hynix Inc.").stock_code == "000660"
+    assert directory.by_corp_code("00000001").modify_date == "20200101"
+    assert directory.by_stock_code("000660").corp_name == "SK하이닉스"
+    assert directory.by_name("없는회사") is None
+
+
+def test_load_or_refresh_uses_fresh_cache(tmp_path):
+    path = tmp_path / "corp_directory.json.gz"
+    calls = []
+
+    def loader() -> list[model.CorpInfoItem]:
+        calls.append(1)
+        return _ITEMS
+
+    first = corp_directory.load_or_refresh(path, ttl=60, loader=loader)
+    second = corp_directory.load_or_refresh(path, ttl=60, loader=loader)
+
+    assert len(calls) == 1
+    assert second.items == first.items
+
+    # expired cache file is downloaded again
+    expired = time.time() - 120
+    os.utime(path, (expired, expired))
+    corp_directory.load_or_refresh(path, ttl=60, loader=loader)
+
+    assert len(calls) == 2
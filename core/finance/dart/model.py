@@ -50,9 +50,10 @@ class FinancialReportItem(pydantic.BaseModel):
     corp_code: str
     sj_div: str
     sj_nm: str
-    account_id: str
+    account_id: str | None = None  # missing in key accounts of the multi company endpoint
     account_nm: str
-    account_detail: str | None
+    account_detail: str | None = None
+    fs_div: str | None = None
     thstrm_nm: str | None
     thstrm_amount: str | None
     thstrm_add_amount: str | None = None
@@ -67,13 +68,90 @@ class FinancialReportItem(pydantic.BaseModel):
     currency: str
 
 
+_AMOUNT_COLUMNS = (
+    "thstrm_amount",
+    "thstrm_add_amount",
+    "frmtrm_amount",
+    "frmtrm_q_amount",
+    "frmtrm_add_amount",
+    "bfefrmtrm_amount",
+)
+
+_INCOME_STATEMENTS = ("IS", "CIS")
+_BALANCE_SHEETS = ("BS",)
+
+
+class Account(enum.Enum):
+    """(statements, IFRS account ids, korean account names for key accounts which have no account id)"""
+
+    REVENUE = (_INCOME_STATEMENTS, ("ifrs-full_Revenue", "ifrs_Revenue"), ("매출액", "수익(매출액)", "영업수익"))
+    OPERATING_INCOME = (_INCOME_STATEMENTS, ("dart_OperatingIncomeLoss",), ("영업이익", "영업이익(손실)"))
+    NET_INCOME = (_INCOME_STATEMENTS, ("ifrs-full_ProfitLoss", "ifrs_ProfitLoss"), ("당기순이익", "당기순이익(손실)"))
+    TOTAL_LIABILITIES = (_BALANCE_SHEETS, ("ifrs-full_Liabilities", "ifrs_Liabilities"), ("부채총계",))
+    EQUITY = (_BALANCE_SHEETS, ("ifrs-full_Equity", "ifrs_Equity"), ("자본총계",))
+
+
 class FinancialReport:
-    def __init__(self, items: list[FinancialReportItem]):
-        self._items = items
+    """Report items held column-wise, amounts are parsed to nullable integers once on construction"""
+
+    def __init__(self, items: list[FinancialReportItem] | pd.DataFrame):
+        # a list of items is still accepted from callers which built reports before the column-wise frame
+        if not isinstance(items, pd.DataFrame):
+            items = self.from_rows([item.model_dump() for item in items])._frame
+        self._frame = items
+
+    @classmethod
+    def from_rows(cls, rows: list[dict]) -> "FinancialReport":
+        """Builds from DART json rows without validating each of them"""
+        frame = pd.DataFrame.from_records(rows, columns=list(FinancialReportItem.model_fields))
+
+        for column in _AMOUNT_COLUMNS:
+            # key accounts are comma separated, missing amounts come as empty strings or "-"
+            amounts = frame[column].astype("string").str.replace(",", "", regex=False)
+            frame[column] = pd.to_numeric(amounts, errors="coerce").astype("Int64")
+        frame["ord"] = pd.to_numeric(frame["ord"], errors="coerce").astype("Int64")
+
+        return cls(frame)
 
     @property
     def items(self) -> list[FinancialReportItem]:
-        return self._items
+        rows = self._frame.astype(object).where(self._frame.notna(), None).to_dict("records")
+        for row in rows:
+            for column in _AMOUNT_COLUMNS:
+                row[column] = None if row[column] is None else str(row[column])
+        return [FinancialReportItem(**row) for row in rows]
+
+    def as_dataframe(self) -> pd.DataFrame:
+        return self._frame.copy()
+
+    def amount(self, account: Account, column: str = "thstrm_amount") -> int | None:
+        """Amount of the first matching account, matched on account id and on account name for key accounts"""
+        statements, account_ids, account_names = account.value
+        frame = self._frame
 
-    def as_dataframe(self):
-        return pd.DataFrame([item.model_dump() for item in self._items])
+        matched = frame[
+            frame["sj_div"].isin(statements)
+            & (frame["account_id"].isin(account_ids) | frame["account_nm"].str.strip().isin(account_names))
+        ][column].dropna()
+
+        return int(matched.iloc[0]) if not matched.empty else None
+
+    @property
+    def revenue(self) -> int | None:
+        return self.amount(Account.REVENUE)
+
+    @property
+    def operating_income(self) -> int | None:
+        return self.amount(Account.OPERATING_INCOME)
+
+    @property
+    def net_income(self) -> int | None:
+        return self.amount(Account.NET_INCOME)
+
+    @property
+    def total_liabilities(self) -> int | None:
+        return self.amount(Account.TOTAL_LIABILITIES)
+
+    @property
+    def equity(self) -> int | None:
+        return self.amount(Account.EQUITY)
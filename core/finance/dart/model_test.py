@@ -0,0 +1,89 @@
+import pytest
+
+from core.finance.dart import model
+
+
+def _row(sj_div: str, account_id: str | None, account_nm: str, amount: str) -> dict:
+    return {
+        "rcept_no": "20250515000001",
+        "reprt_code": "11013",
+        "bsns_year": "2025",
+        "corp_code": "00126380",
+        "sj_div": sj_div,
+        "sj_nm": sj_div,
+        "account_id": account_id,
+        "account_nm": account_nm,
+        "account_detail": "-",
+        "thstrm_nm": "제 57 기 1분기",
+        "thstrm_amount": amount,
+        "ord": "1",
+        "currency": "KRW",
+    }
+
+
+_ROWS = [
+    _row("BS", "ifrs-full_Liabilities", "부채총계", "112339876000000"),
+    _row("BS", "ifrs-full_Equity", "자본총계", "402192070000000"),
+    _row("CIS", "ifrs-full_Revenue", "수익(매출액)", "79140502000000"),
+    _row("CIS", "dart_OperatingIncomeLoss", "영업이익", "6685344000000"),
+    _row("CIS", "ifrs-full_ProfitLoss", "당기순이익(손실)", "8224534000000"),
+    _row("SCE", "ifrs-full_ProfitLoss", "당기순이익(손실)", ""),
+]
+
+# key accounts of the multi company endpoint, no account_id and comma separated amounts
+_KEY_ACCOUNT_ROWS = [
+    _row("IS", None, "매출액", "79,140,502,000,000"),
+    _row("IS", None, "영업이익", "-1,234"),
+    _row("BS", None, "자본총계", "-"),
+]
+
+
+def test_typed_accessors():
+    report = model.FinancialReport.from_rows(_ROWS)
+
+    assert report.revenue == 79_140_502_000_000
+    assert report.operating_income == 6_685_344_000_000
+    assert report.net_income == 8_224_534_000_000
+    assert report.total_liabilities == 112_339_876_000_000
+    assert report.equity == 402_192_070_000_000
+
+
+def test_key_accounts_are_matched_by_name():
+    report = model.FinancialReport.from_rows(_KEY_ACCOUNT_ROWS)
+
+    assert report.revenue == 79_140_502_000_000
+    assert report.operating_income == -1234
+    assert report.equity is None
+    assert report.net_income is None
+
+
+def test_dataframe_keeps_item_columns():
+    frame = model.FinancialReport.from_rows(_ROWS).as_dataframe()
+
+    assert list(frame.columns) == list(model.FinancialReportItem.model_fields)
+    assert frame["thstrm_amount"].dtype == "Int64"
+    assert frame["thstrm_amount"].sum() == pytest.approx(608_582_326_000_000)
+
+
+def test_dataframe_is_a_copy():
+    report = model.FinancialReport.from_rows(_ROWS)
+    frame = report.as_dataframe()
+    frame.loc[:, "thstrm_amount"] = 0
+
+    assert report.revenue == 79_140_502_000_000
+
+
+def test_construct_from_items():
+    items = model.FinancialReport.from_rows(_ROWS).items
+    report = model.FinancialReport(items)
+
+    assert report.revenue == 79_140_502_000_000
+    assert report.items == items
+
+
+def test_items_roundtrip():
+    items = model.FinancialReport.from_rows(_ROWS).items
+
+    assert items[2].account_id == "ifrs-full_Revenue"
+    assert items[2].thstrm_amount == "79140502000000"
+    assert items[5].thstrm_amount is None
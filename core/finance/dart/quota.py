@@ -0,0 +1,103 @@
+import atexit
+import json
+import pathlib
+import threading
+import time
+
+from loguru import logger
+
+from core.finance.dart import config as dart_config
+from core.utils import time as time_utils
+
+_DAILY_QUOTA = None
+_DAILY_QUOTA_LOCK = threading.Lock()
+_SAVE_INTERVAL = 30.0
+
+
+class QuotaExhaustedError(RuntimeError):
+    """Raised instead of requesting DART once the daily quota reaches its reserve"""
+
+
+class DailyQuota:
+    """Requests made today against the DART daily quota, persisted across runs in a small json file
+
+    The last `reserve` requests are kept for interactive use, callers are expected to degrade to cached data or skip.
+    The count is per process: the file is read once and written every `save_interval` seconds and on `flush`, so
+    runs overlapping on the same file undercount each other.
+    """
+
+    def __init__(self, path: pathlib.Path, limit: int, reserve: int = 0, save_interval: float = _SAVE_INTERVAL):
+        self._path = path
+        self._limit = limit
+        self._reserve = reserve
+        self._save_interval = save_interval
+        self._lock = threading.Lock()
+        self._date, self._used = self._load()
+        self._saved_at = time.monotonic()
+        self._dirty = False
+
+    def _load(self) -> tuple[str, int]:
+        try:
+            state = json.loads(self._path.read_text())
+            return state["date"], int(state["used"])
+        except (OSError, ValueError, KeyError):
+            return self._today(), 0
+
+    def _save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_text(json.dumps({"date": self._date, "used": self._used}))
+        self._saved_at = time.monotonic()
+        self._dirty = False
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    @staticmethod
+    def _today() -> str:
+        # DART resets the quota at midnight KST
+        return time_utils.now().strftime("%Y-%m-%d")
+
+    def _roll_over(self) -> None:
+        today = self._today()
+        if self._date != today:
+            self._date, self._used = today, 0
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            self._roll_over()
+            return max(self._limit - self._used, 0)
+
+    def consume(self, num_requests: int = 1) -> None:
+        with self._lock:
+            self._roll_over()
+
+            if self._used + num_requests > self._limit - self._reserve:
+                raise QuotaExhaustedError(f"DART daily quota near exhaustion, {self._limit - self._used} remaining")
+
+            self._used += num_requests
+            self._dirty = True
+            if time.monotonic() - self._saved_at >= self._save_interval:
+                self._save()
+
+            if self._used % 1000 == 0:
+                logger.info(f"{self._used} DART requests used today")
+
+
+def get_daily_quota() -> DailyQuota:
+    global _DAILY_QUOTA
+    if _DAILY_QUOTA is not None:
+        return _DAILY_QUOTA
+
+    with _DAILY_QUOTA_LOCK:
+        if _DAILY_QUOTA is None:
+            cfg = dart_config.load_config()
+            _DAILY_QUOTA = DailyQuota(
+                pathlib.Path(cfg.cache_dir) / "quota.json",
+                limit=cfg.daily_quota,
+                reserve=cfg.quota_reserve,
+            )
+            atexit.register(_DAILY_QUOTA.flush)
+    return _DAILY_QUOTA
@@ -0,0 +1,46 @@
+import pytest
+import pytest_mock
+
+from core.finance.dart import quota
+
+
+def test_quota_persists_across_runs(tmp_path):
+    path = tmp_path / "quota.json"
+
+    daily_quota = quota.DailyQuota(path, limit=10)
+    daily_quota.consume(3)
+    daily_quota.flush()
+
+    assert quota.DailyQuota(path, limit=10).remaining == 7
+
+
+def test_quota_saves_periodically(tmp_path):
+    path = tmp_path / "quota.json"
+    daily_quota = quota.DailyQuota(path, limit=10, save_interval=60)
+
+    daily_quota.consume(3)
+    assert not path.exists()
+
+    daily_quota._saved_at -= 60
+    daily_quota.consume()
+
+    assert quota.DailyQuota(path, limit=10).remaining == 6
+
+
+def test_quota_keeps_reserve(tmp_path):
+    daily_quota = quota.DailyQuota(tmp_path / "quota.json", limit=10, reserve=2)
+    daily_quota.consume(8)
+
+    with pytest.raises(quota.QuotaExhaustedError):
+        daily_quota.consume()
+
+    assert daily_quota.remaining == 2
+
+
+def test_quota_resets_on_next_day(mocker: pytest_mock.MockerFixture, tmp_path):
+    daily_quota = quota.DailyQuota(tmp_path / "quota.json", limit=10)
+    daily_quota.consume(10)
+
+    mocker.patch.object(quota.DailyQuota, "_today", return_value="2999-01-01")
+
+    assert daily_quota.remaining == 10
@@ -0,0 +1,98 @@
+import dataclasses
+import gzip
+import json
+import pathlib
+import threading
+import time
+
+from core.finance.dart import config as dart_config
+
+_REPORT_CACHE = None
+_KEY_ACCOUNT_CACHE = None
+_REPORT_CACHE_LOCK = threading.Lock()
+
+
+@dataclasses.dataclass(frozen=True)
+class ReportKey:
+    corp_code: str
+    bsns_year: str
+    reprt_code: str
+    fs_div: str
+
+    @property
+    def filename(self) -> str:
+        return f"{self.corp_code}_{self.bsns_year}_{self.reprt_code}_{self.fs_div}"
+
+
+class ReportCache:
+    """On-disk cache of financial report items
+
+    Filed reports are immutable and kept forever, reports which are not filed yet are remembered for `negative_ttl`
+    seconds so that they are asked again on a later run.
+    """
+
+    def __init__(self, directory: pathlib.Path, negative_ttl: float):
+        self._directory = directory
+        self._negative_ttl = negative_ttl
+
+    def _path(self, key: ReportKey) -> pathlib.Path:
+        return self._directory / f"{key.filename}.json.gz"
+
+    def _missing_path(self, key: ReportKey) -> pathlib.Path:
+        return self._directory / f"{key.filename}.missing"
+
+    def get(self, key: ReportKey) -> list[dict] | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def put(self, key: ReportKey, items: list[dict]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # written aside and renamed, so that concurrent readers never see a partial file
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+        self._missing_path(key).unlink(missing_ok=True)
+
+    def is_known_missing(self, key: ReportKey) -> bool:
+        path = self._missing_path(key)
+        try:
+            return time.time() - path.stat().st_mtime <= self._negative_ttl
+        except FileNotFoundError:
+            return False
+
+    def put_missing(self, key: ReportKey) -> None:
+        path = self._missing_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+
+def _load_caches() -> tuple[ReportCache, ReportCache]:
+    global _REPORT_CACHE, _KEY_ACCOUNT_CACHE
+    if _REPORT_CACHE is not None and _KEY_ACCOUNT_CACHE is not None:
+        return _REPORT_CACHE, _KEY_ACCOUNT_CACHE
+
+    with _REPORT_CACHE_LOCK:
+        if _REPORT_CACHE is None or _KEY_ACCOUNT_CACHE is None:
+            cfg = dart_config.load_config()
+            cache_dir = pathlib.Path(cfg.cache_dir)
+            _REPORT_CACHE = ReportCache(cache_dir / "reports", negative_ttl=cfg.report_negative_ttl)
+            _KEY_ACCOUNT_CACHE = ReportCache(cache_dir / "key_accounts", negative_ttl=cfg.report_negative_ttl)
+    return _REPORT_CACHE, _KEY_ACCOUNT_CACHE
+
+
+def get_report_cache() -> ReportCache:
+    """full statements of fnlttSinglAcntAll"""
+    return _load_caches()[0]
+
+
+def get_key_account_cache() -> ReportCache:
+    """key accounts of fnlttMultiAcnt, both consolidated and separate statements under one key"""
+    return _load_caches()[1]
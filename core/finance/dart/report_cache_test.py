@@ -0,0 +1,35 @@
+import os
+import time
+
+from core.finance.dart import report_cache
+
+_KEY = report_cache.ReportKey(corp_code="00126380", bsns_year="2025", reprt_code="11012", fs_div="CFS")
+
+
+def test_filed_report_roundtrip(tmp_path):
+    cache = report_cache.ReportCache(tmp_path, negative_ttl=60)
+
+    assert cache.get(_KEY) is None
+
+    cache.put(_KEY, [{"account_id": "ifrs-full_Revenue", "thstrm_amount": "100"}])
+    assert cache.get(_KEY) == [{"account_id": "ifrs-full_Revenue", "thstrm_amount": "100"}]
+
+
+def test_missing_report_expires(tmp_path):
+    cache = report_cache.ReportCache(tmp_path, negative_ttl=60)
+
+    cache.put_missing(_KEY)
+    assert cache.is_known_missing(_KEY)
+
+    expired = time.time() - 120
+    os.utime(tmp_path / f"{_KEY.filename}.missing", (expired, expired))
+    assert not cache.is_known_missing(_KEY)
+
+
+def test_filing_clears_missing_mark(tmp_path):
+    cache = report_cache.ReportCache(tmp_path, negative_ttl=60)
+
+    cache.put_missing(_KEY)
+    cache.put(_KEY, [])
+
+    assert not cache.is_known_missing(_KEY)
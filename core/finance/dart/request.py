@@ -1,65 +1,139 @@
+import collections
+from concurrent import futures
 import datetime
 import io
+import itertools
+import pathlib
+import threading
+from typing import BinaryIO, Iterator
+from xml.etree import ElementTree
 import zipfile
 
 from loguru import logger
 import requests
-import xmltodict
 
 from core.finance.dart import config
+from core.finance.dart import corp_directory
 from core.finance.dart import model
+from core.finance.dart import quota
+from core.finance.dart import report_cache
 from core.finance.dart import url
+from core.utils import http
+from core.utils import rate_limit
 from core.utils import time as time_utils
 
+_CORP_DIRECTORY = None
+_CORP_DIRECTORY_LOCK = threading.Lock()
+_CORP_FIELDS = ("corp_code", "corp_name", "corp_eng_name", "stock_code", "modify_date")
+_CORP_BATCH_SIZE = 1000
+
+_RATE_LIMITER = None
+_RATE_LIMITER_LOCK = threading.Lock()
+_REPORT_MAX_WORKERS = 8
+_MULTI_CORP_BATCH_SIZE = 100  # maximum number of corp codes per fnlttMultiAcnt request
+_ALL_FS_DIV = "ALL"
+
+_STATUS_OK = "000"
+_STATUS_NO_DATA = "013"
+
 
 def _load_crtfc_key() -> str:
     cred = config.load_config()
     return cred.crtfc_key
 
 
-def get_corp_item_lists(url_key: str = "corp_code") -> list[model.CorpInfoItem]:
-    crtfc_key = _load_crtfc_key()
+def _get_rate_limiter() -> rate_limit.TokenBucket:
+    global _RATE_LIMITER
+    if _RATE_LIMITER is not None:
+        return _RATE_LIMITER
+
+    with _RATE_LIMITER_LOCK:
+        if _RATE_LIMITER is None:
+            _RATE_LIMITER = rate_limit.TokenBucket(config.load_config().requests_per_second)
+    return _RATE_LIMITER
 
-    resp = requests.get(
+
+def _request(url_key: str, params: dict, timeout: float) -> requests.Response:
+    """GET on DART under the rate limit, counted against the daily quota"""
+    quota.get_daily_quota().consume()
+    _get_rate_limiter().acquire()
+
+    return http.get_session("dart").get(
         url=url.get_url_by_name(url_key),
-        params={"crtfc_key": crtfc_key},
-        timeout=10,
+        params={"crtfc_key": _load_crtfc_key(), **params},
+        timeout=timeout,
     )
+
+
+def _parse_corp_code_xml(f: BinaryIO, listed_only: bool = False) -> Iterator[dict[str, str | None]]:
+    """Yields CORPCODE.xml items one by one, parsed elements are released right away so memory stays flat"""
+    root = None
+    for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+        if root is None:
+            root = elem
+        if event != "end" or elem.tag != "list":
+            continue
+
+        # unlisted corps carry a blank stock_code, which becomes None like xmltodict used to parse it
+        row = {field: (elem.findtext(field) or "").strip() or None for field in _CORP_FIELDS}
+        # cleared items would otherwise stay attached to the root
+        root.clear()
+
+        if listed_only and not row["stock_code"]:
+            continue
+        yield row
+
+
+def iter_corp_rows(url_key: str = "corp_code", listed_only: bool = False) -> Iterator[dict[str, str | None]]:
+    """Streams CorpInfoItem compatible rows of every corp, or listed corps only"""
+    resp = _request(url_key, params={}, timeout=10)
     zip_binary = io.BytesIO(resp.content)
-    with zipfile.ZipFile(zip_binary) as zf:
-        xml_bytes = zf.read("CORPCODE.xml")
+    with zipfile.ZipFile(zip_binary) as zf, zf.open("CORPCODE.xml") as f:
+        yield from _parse_corp_code_xml(f, listed_only=listed_only)
 
-    xml_str = xml_bytes.decode("utf-8")
-    data = xmltodict.parse(xml_str)["result"]["list"]
 
-    corp_item_lists = [model.CorpInfoItem(**item) for item in data]
-    return corp_item_lists
+def iter_corp_row_batches(
+    batch_size: int = _CORP_BATCH_SIZE,
+    url_key: str = "corp_code",
+    listed_only: bool = False,
+) -> Iterator[list[dict[str, str | None]]]:
+    rows = iter_corp_rows(url_key=url_key, listed_only=listed_only)
+    while batch := list(itertools.islice(rows, batch_size)):
+        yield batch
 
 
-def _is_corp_name_exists(corp_name_or_corp_eng_name: str) -> bool:
-    corp_codes = get_corp_item_lists()
-    for corp_code in corp_codes:
-        if corp_code.corp_name == corp_name_or_corp_eng_name or corp_code.corp_eng_name == corp_name_or_corp_eng_name:
-            return True
-    return False
+def get_corp_item_lists(url_key: str = "corp_code") -> list[model.CorpInfoItem]:
+    return [model.CorpInfoItem(**row) for row in iter_corp_rows(url_key=url_key)]
+
+
+def get_corp_directory() -> corp_directory.CorpDirectory:
+    """Corp directory cached in memory and on disk, refreshed at most every `corp_directory_ttl` seconds"""
+    global _CORP_DIRECTORY
+    cfg = config.load_config()
+
+    with _CORP_DIRECTORY_LOCK:
+        if _CORP_DIRECTORY is None or _CORP_DIRECTORY.is_stale(cfg.corp_directory_ttl):
+            _CORP_DIRECTORY = corp_directory.load_or_refresh(
+                pathlib.Path(cfg.cache_dir) / "corp_directory.json.gz",
+                ttl=cfg.corp_directory_ttl,
+                loader=get_corp_item_lists,
+            )
+        return _CORP_DIRECTORY
+
+
+def _find_corp_by_name(name: str) -> model.CorpInfoItem:
+    item = get_corp_directory().by_name(name)
+    if item is None:
+        raise ValueError(f"Cannot find corp by name: {name}")
+    return item
 
 
 def get_corp_code_by_name(name: str) -> str:
-    assert _is_corp_name_exists(name)
-    corp_codes = get_corp_item_lists()
-    for corp_code in corp_codes:
-        if corp_code.corp_name == name or corp_code.corp_eng_name == name:
-            return corp_code.corp_code
-    raise ValueError(f"Cannot find corp_code by name: {name}")
+    return _find_corp_by_name(name).corp_code
 
 
 def get_stock_code_by_name(name: str) -> str:
-    assert _is_corp_name_exists(name)
-    corp_codes = get_corp_item_lists()
-    for corp_code in corp_codes:
-        if corp_code.corp_name == name or corp_code.corp_eng_name == name:
-            return corp_code.stock_code
-    raise ValueError(f"Cannot find stock_code by name: {name}")
+    return _find_corp_by_name(name).stock_code
 
 
 def _resolve_reprt_code(date: datetime.date) -> model.ReportCode:
@@ -84,43 +158,184 @@ def _resolve_reprt_code(date: datetime.date) -> model.ReportCode:
         return model.ReportCode.THIRD_QUARTER
 
 
+def _report_periods(date: datetime.date) -> list[tuple[model.ReportCode, int]]:
+    """Report to try first, which may not be filed yet, and the one which should be online by date"""
+    reprt_code = _resolve_reprt_code(date)
+    next_year = date.year + 1 if reprt_code == model.ReportCode.THIRD_QUARTER else date.year
+
+    return [
+        (reprt_code.next(), next_year),
+        (reprt_code, date.year),
+    ]
+
+
+def _fetch_report_items(key: report_cache.ReportKey, url_key: str) -> list[dict] | None:
+    """Report items from DART, cached on disk when filed and remembered for a while when not filed yet"""
+    cache = report_cache.get_report_cache()
+
+    items = cache.get(key)
+    if items is not None or cache.is_known_missing(key):
+        return items
+
+    try:
+        resp = _request(
+            url_key,
+            params={
+                "corp_code": key.corp_code,
+                "bsns_year": key.bsns_year,
+                "reprt_code": key.reprt_code,
+                "fs_div": key.fs_div,
+            },
+            timeout=30,
+        )
+    except quota.QuotaExhaustedError as e:
+        logger.warning(f"Skipping {key}: {e}")
+        return None
+
+    resp.raise_for_status()
+    data = resp.json()
+
+    if data["status"] == _STATUS_OK:
+        cache.put(key, data["list"])
+        return data["list"]
+
+    if data["status"] == _STATUS_NO_DATA:
+        cache.put_missing(key)
+    else:
+        logger.warning(f"DART responded {data['status']} {data.get('message')} for {key}")
+    return None
+
+
 def get_financial_report(
     corp_code: str,
     fs_div: model.ReportType = model.ReportType.CONSOLIDATED.value,
     url_key: str = "finance",
     date: datetime.date = time_utils.now().date(),
 ) -> model.FinancialReport | None:
-    crtfc_key = _load_crtfc_key()
+    for code, bsns_year in _report_periods(date):
+        key = report_cache.ReportKey(corp_code, str(bsns_year), code.value, fs_div)
+        items = _fetch_report_items(key, url_key)
 
-    reprt_code = _resolve_reprt_code(date)
-    next_year = date.year + 1 if reprt_code == model.ReportCode.THIRD_QUARTER else date.year
+        if items:
+            logger.info(f"{bsns_year} {code.name} financial report loaded for {corp_code}")
+            return model.FinancialReport.from_rows(items)
+
+    logger.warning(f"Failed to load financial report for corp_code: {corp_code}")
+    return None
+
+
+def _get_financial_report_or_none(corp_code: str, **kwargs) -> model.FinancialReport | None:
+    try:
+        return get_financial_report(corp_code, **kwargs)
+    except Exception as e:
+        logger.error(f"Failed to get financial report for {corp_code}: {e}")
+        return None
+
+
+def get_financial_reports(
+    corp_codes: list[str],
+    max_workers: int = _REPORT_MAX_WORKERS,
+    **kwargs,
+) -> dict[str, model.FinancialReport | None]:
+    """Financial reports keyed by corp code, fetched concurrently under the DART rate limit and daily quota
+
+    Cached filings are served without requests, `None` for corps which are not filed, failed or skipped on quota.
+    """
+    unique_corp_codes = list(dict.fromkeys(corp_codes))
+    if not unique_corp_codes:
+        return {}
+
+    with futures.ThreadPoolExecutor(max_workers=min(max_workers, len(unique_corp_codes))) as executor:
+        reports = list(executor.map(lambda c: _get_financial_report_or_none(c, **kwargs), unique_corp_codes))
+
+    return dict(zip(unique_corp_codes, reports))
+
+
+def _fetch_key_account_items(
+    corp_codes: list[str],
+    bsns_year: str,
+    reprt_code: str,
+    url_key: str,
+) -> dict[str, list[dict] | None]:
+    """Key account items of each corp, uncached corps are requested up to 100 per request"""
+    cache = report_cache.get_key_account_cache()
+    items_by_corp = {}
+    uncached = []
+
+    for corp_code in corp_codes:
+        key = report_cache.ReportKey(corp_code, bsns_year, reprt_code, _ALL_FS_DIV)
+        items = cache.get(key)
+
+        if items is not None or cache.is_known_missing(key):
+            items_by_corp[corp_code] = items
+        else:
+            uncached.append(corp_code)
+
+    for i in range(0, len(uncached), _MULTI_CORP_BATCH_SIZE):
+        batch = uncached[i : i + _MULTI_CORP_BATCH_SIZE]
+        items_by_corp.update(dict.fromkeys(batch))
 
-    for code, bsns_year in [
-        (reprt_code.next(), next_year),
-        (reprt_code, date.year),
-    ]:
         try:
-            resp = requests.get(
-                url=url.get_url_by_name(url_key),
-                params={
-                    "crtfc_key": crtfc_key,
-                    "corp_code": corp_code,
-                    "bsns_year": str(bsns_year),
-                    "reprt_code": code.value,
-                    "fs_div": fs_div,
-                },
+            resp = _request(
+                url_key,
+                params={"corp_code": ",".join(batch), "bsns_year": bsns_year, "reprt_code": reprt_code},
                 timeout=30,
             )
-
             resp.raise_for_status()
             data = resp.json()
+        except quota.QuotaExhaustedError as e:
+            logger.warning(f"Skipping key accounts of {len(uncached) - i} corps: {e}")
+            break
+        except (requests.RequestException, ValueError) as e:
+            # the batch is left out of the cache so that the next run retries it
+            logger.error(f"Failed to get key accounts of {len(batch)} corps for {bsns_year} {reprt_code}: {e}")
+            continue
 
-            if data["status"] == "000":
-                items = [model.FinancialReportItem(**item) for item in resp.json()["list"]]
-                logger.info(f"{bsns_year} {code.name} financial report loaded for {corp_code}")
-                return model.FinancialReport(items)
+        if data["status"] not in (_STATUS_OK, _STATUS_NO_DATA):
+            logger.warning(f"DART responded {data['status']} {data.get('message')} for {bsns_year} {reprt_code}")
+            continue
 
-        except (requests.exceptions.RequestException, KeyError) as e:
-            raise e
-    logger.warning(f"Failed to load financial report for corp_code: {corp_code}")
-    return None
+        rows_by_corp = collections.defaultdict(list)
+        for row in data.get("list", []):
+            rows_by_corp[row["corp_code"]].append(row)
+
+        for corp_code in batch:
+            key = report_cache.ReportKey(corp_code, bsns_year, reprt_code, _ALL_FS_DIV)
+
+            if rows_by_corp[corp_code]:
+                cache.put(key, rows_by_corp[corp_code])
+                items_by_corp[corp_code] = rows_by_corp[corp_code]
+            else:
+                cache.put_missing(key)
+
+    return items_by_corp
+
+
+def get_key_account_reports(
+    corp_codes: list[str],
+    fs_div: model.ReportType = model.ReportType.CONSOLIDATED.value,
+    url_key: str = "multi_finance",
+    date: datetime.date | None = None,
+) -> dict[str, model.FinancialReport | None]:
+    """Key account reports keyed by corp code through the multi company endpoint, for screening the whole universe
+
+    Reports carry key accounts only (no account_id), `None` for corps which have no filed report of fs_div.
+    """
+    date = date or time_utils.now().date()
+    reports = dict.fromkeys(corp_codes)
+    pending = list(reports)
+
+    for code, bsns_year in _report_periods(date):
+        items_by_corp = _fetch_key_account_items(pending, str(bsns_year), code.value, url_key)
+
+        for corp_code, items in items_by_corp.items():
+            items = [item for item in items or [] if item.get("fs_div") == fs_div]
+            if items:
+                reports[corp_code] = model.FinancialReport.from_rows(items)
+
+        pending = [corp_code for corp_code in pending if reports[corp_code] is None]
+        if not pending:
+            break
+
+    logger.info(f"Key account reports loaded for {len(reports) - len(pending)} of {len(reports)} corps")
+    return reports
@@ -0,0 +1,200 @@
+import datetime
+import io
+from unittest import mock
+from xml.etree import ElementTree
+
+import pytest
+import pytest_mock
+import requests
+
+from core.finance.dart import model
+from core.finance.dart import quota
+from core.finance.dart import report_cache
+from core.finance.dart import request
+from core.utils import rate_limit
+
+_CORP_CODE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<result>
+    <list>
+        <corp_code>00126380</corp_code>
+        <corp_name>삼성전자</corp_name>
+        <corp_eng_name>SAMSUNG ELECTRONICS CO,.LTD</corp_eng_name>
+        <stock_code>005930</stock_code>
+        <modify_date>20250801</modify_date>
+    </list>
+    <list>
+        <corp_code>00434003</corp_code>
+        <corp_name>다코</corp_name>
+        <corp_eng_name>Daco corporation</corp_eng_name>
+        <stock_code> </stock_code>
+        <modify_date>20170630</modify_date>
+    </list>
+</result>
+"""
+_REPORT_ITEM = {
+    "rcept_no": "20250814000001",
+    "reprt_code": "11013",
+    "bsns_year": "2025",
+    "corp_code": "00126380",
+    "sj_div": "IS",
+    "sj_nm": "손익계산서",
+    "account_id": "ifrs-full_Revenue",
+    "account_nm": "매출액",
+    "account_detail": None,
+    "thstrm_nm": "제 57 기 1분기",
+    "thstrm_amount": "79140502000000",
+    "ord": 1,
+    "currency": "KRW",
+}
+
+
+def _parse(listed_only: bool) -> list[dict]:
+    return list(request._parse_corp_code_xml(io.BytesIO(_CORP_CODE_XML.encode()), listed_only=listed_only))
+
+
+def test_parse_corp_code_xml():
+    rows = _parse(listed_only=False)
+
+    assert rows == [
+        {
+            "corp_code": "00126380",
+            "corp_name": "삼성전자",
+            "corp_eng_name": "SAMSUNG ELECTRONICS CO,.LTD",
+            "stock_code": "005930",
+            "modify_date": "20250801",
+        },
+        {
+            "corp_code": "00434003",
+            "corp_name": "다코",
+            "corp_eng_name": "Daco corporation",
+            "stock_code": None,
+            "modify_date": "20170630",
+        },
+    ]
+
+
+def test_parse_corp_code_xml_listed_only():
+    assert [r["corp_code"] for r in _parse(listed_only=True)] == ["00126380"]
+
+
+def test_parse_corp_code_xml_blank_stock_code_is_none():
+    xml = _CORP_CODE_XML.replace("<stock_code> </stock_code>", "<stock_code />")
+    rows = list(request._parse_corp_code_xml(io.BytesIO(xml.encode())))
+
+    # empty and whitespace-only stock codes both mean unlisted, and are filtered by `WHERE stock_code` downstream
+    assert rows[1]["stock_code"] is None
+    assert model.CorpInfoItem(**rows[1]).stock_code is None
+
+
+def test_parse_corp_code_xml_releases_parsed_items(mocker: pytest_mock.MockerFixture):
+    iterparse = ElementTree.iterparse
+    elements = []
+
+    def recording_iterparse(*args, **kwargs):
+        for event, elem in iterparse(*args, **kwargs):
+            elements.append(elem)
+            yield event, elem
+
+    mocker.patch("core.finance.dart.request.ElementTree.iterparse", side_effect=recording_iterparse)
+
+    assert len(_parse(listed_only=False)) == 2
+    assert elements[0].tag == "result"
+    assert len(elements[0]) == 0
+
+
+@pytest.fixture
+def daily_quota(mocker: pytest_mock.MockerFixture, tmp_path) -> quota.DailyQuota:
+    daily_quota = quota.DailyQuota(tmp_path / "quota.json", limit=10)
+
+    mocker.patch("core.finance.dart.quota.get_daily_quota", return_value=daily_quota)
+    mocker.patch("core.finance.dart.request._get_rate_limiter", return_value=rate_limit.TokenBucket(1000))
+    mocker.patch("core.finance.dart.request._load_crtfc_key", return_value="key")
+    mocker.patch(
+        "core.finance.dart.report_cache.get_report_cache",
+        return_value=report_cache.ReportCache(tmp_path / "reports", negative_ttl=60),
+    )
+    mocker.patch(
+        "core.finance.dart.report_cache.get_key_account_cache",
+        return_value=report_cache.ReportCache(tmp_path / "key_accounts", negative_ttl=60),
+    )
+    return daily_quota
+
+
+def _get(url: str, params: dict, timeout: float) -> mock.Mock:
+    # the guessed newer report is not filed yet
+    if params["reprt_code"] == model.ReportCode.SECOND_QUARTER.value:
+        return mock.Mock(json=mock.Mock(return_value={"status": "013", "message": "no data"}))
+    return mock.Mock(json=mock.Mock(return_value={"status": "000", "list": [{**_REPORT_ITEM, **params}]}))
+
+
+def test_get_financial_report_hits_dart_once_per_filing(
+    mocker: pytest_mock.MockerFixture,
+    daily_quota: quota.DailyQuota,
+):
+    get_mock = mocker.patch("core.utils.http.PooledSession.get", side_effect=_get)
+
+    for _ in range(2):
+        report = request.get_financial_report("00126380", date=datetime.date(2025, 6, 1))
+        assert [item.account_id for item in report.items] == ["ifrs-full_Revenue"]
+
+    assert get_mock.call_count == 2
+    assert daily_quota.remaining == 8
+
+
+def test_get_financial_reports_skips_on_quota(mocker: pytest_mock.MockerFixture, daily_quota: quota.DailyQuota):
+    get_mock = mocker.patch("core.utils.http.PooledSession.get", side_effect=_get)
+
+    # two requests per corp, the quota runs out on the sixth corp
+    corp_codes = [f"{i:08d}" for i in range(6)]
+    reports = request.get_financial_reports(corp_codes + corp_codes[:1], max_workers=1, date=datetime.date(2025, 6, 1))
+
+    assert list(reports) == corp_codes
+    assert sum(r is not None for r in reports.values()) == 5
+    assert get_mock.call_count == 10
+
+
+def _get_key_accounts(url: str, params: dict, timeout: float) -> mock.Mock:
+    if params["reprt_code"] == model.ReportCode.SECOND_QUARTER.value:
+        return mock.Mock(json=mock.Mock(return_value={"status": "013", "message": "no data"}))
+
+    # even corps have filed, only every other one of them has subsidiaries
+    rows = []
+    for corp_code in params["corp_code"].split(","):
+        if int(corp_code) % 2 == 0:
+            fs_divs = ["CFS", "OFS"] if int(corp_code) % 4 == 0 else ["OFS"]
+            rows.extend({**_REPORT_ITEM, "account_id": None, "corp_code": corp_code, "fs_div": f} for f in fs_divs)
+
+    return mock.Mock(json=mock.Mock(return_value={"status": "000", "list": rows}))
+
+
+def test_get_key_account_reports(mocker: pytest_mock.MockerFixture, daily_quota: quota.DailyQuota):
+    get_mock = mocker.patch("core.utils.http.PooledSession.get", side_effect=_get_key_accounts)
+    corp_codes = [f"{i:08d}" for i in range(150)]
+
+    for _ in range(2):
+        reports = request.get_key_account_reports(corp_codes, date=datetime.date(2025, 6, 1))
+
+        assert list(reports) == corp_codes
+        assert [c for c, r in reports.items() if r] == [c for c in corp_codes if int(c) % 4 == 0]
+        assert {item.fs_div for item in reports["00000004"].items} == {"CFS"}
+
+    # two batches for each of the two guessed reports, served from cache afterwards
+    assert get_mock.call_count == 4
+    assert len(get_mock.call_args_list[0].kwargs["params"]["corp_code"].split(",")) == 100
+
+
+def test_get_key_account_reports_skips_failed_batch(mocker: pytest_mock.MockerFixture, daily_quota: quota.DailyQuota):
+    def get(url: str, params: dict, timeout: float) -> mock.Mock:
+        if params["corp_code"].startswith("00000000"):
+            return mock.Mock(raise_for_status=mock.Mock(side_effect=requests.HTTPError("500 Server Error")))
+        return _get_key_accounts(url, params, timeout)
+
+    mocker.patch("core.utils.http.PooledSession.get", side_effect=get)
+    corp_codes = [f"{i:08d}" for i in range(150)]
+
+    reports = request.get_key_account_reports(corp_codes, date=datetime.date(2025, 6, 1))
+
+    # only the corps of the failed batch are missing, and they are not cached as missing
+    assert [c for c, r in reports.items() if r] == [c for c in corp_codes[100:] if int(c) % 4 == 0]
+    key = report_cache.ReportKey("00000004", "2025", model.ReportCode.FIRST_QUARTER.value, "ALL")
+    assert not report_cache.get_key_account_cache().is_known_missing(key)
@@ -9,12 +9,14 @@ class DartURL(pydantic.BaseModel):
 _BASE_URL: DartURL = DartURL(name="base", url="https://opendart.fss.or.kr/api/")
 _CORP_CODE_URL: DartURL = DartURL(name="corp_code", url="https://opendart.fss.or.kr/api/corpCode.xml")
 _FINANCE_URL: DartURL = DartURL(name="finance", url="https://opendart.fss.or.kr/api/fnlttSinglAcntAll.json")
+_MULTI_FINANCE_URL: DartURL = DartURL(name="multi_finance", url="https://opendart.fss.or.kr/api/fnlttMultiAcnt.json")
 
 
 _URLS: list[DartURL] = [
     _BASE_URL,
     _CORP_CODE_URL,
     _FINANCE_URL,
+    _MULTI_FINANCE_URL,
 ]
 
 _URL_MAP: dict[str, DartURL] = {url.name: url.url for url in _URLS}
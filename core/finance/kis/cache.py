@@ -0,0 +1,77 @@
+import dataclasses
+import threading
+from typing import Any, Callable, Hashable
+
+import cachetools
+
+from core.finance.kis import config as kis_config
+
+_STOCK_CACHE = None
+_QUOTE_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CountingTTLCache:
+    """Thread-safe TTL/LRU cache which counts hits and misses, `None` values are never cached"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = cachetools.TTLCache(maxsize=maxsize, ttl=ttl)
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._stats.hits += 1
+                return value
+            self._stats.misses += 1
+
+        value = loader()
+
+        if value is not None:
+            with self._lock:
+                self._cache[key] = value
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._stats = CacheStats()
+
+
+def _load_caches() -> tuple[CountingTTLCache, CountingTTLCache]:
+    global _STOCK_CACHE, _QUOTE_CACHE
+    if _STOCK_CACHE is not None and _QUOTE_CACHE is not None:
+        return _STOCK_CACHE, _QUOTE_CACHE
+
+    with _CACHE_LOCK:
+        if _STOCK_CACHE is None or _QUOTE_CACHE is None:
+            cfg = kis_config.load_client_config()
+            _STOCK_CACHE = CountingTTLCache(maxsize=cfg.cache_maxsize, ttl=cfg.stock_cache_ttl)
+            _QUOTE_CACHE = CountingTTLCache(maxsize=cfg.cache_maxsize, ttl=cfg.quote_cache_ttl)
+    return _STOCK_CACHE, _QUOTE_CACHE
+
+
+def get_stock_cache() -> CountingTTLCache:
+    return _load_caches()[0]
+
+
+def get_quote_cache() -> CountingTTLCache:
+    return _load_caches()[1]
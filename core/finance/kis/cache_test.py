@@ -0,0 +1,36 @@
+import time
+
+from core.finance.kis import cache
+
+
+def test_counting_ttl_cache_counts_hits_and_misses():
+    kis_cache = cache.CountingTTLCache(maxsize=10, ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return "value"
+
+    assert kis_cache.get_or_load("key", loader) == "value"
+    assert kis_cache.get_or_load("key", loader) == "value"
+
+    assert len(calls) == 1
+    assert kis_cache.stats == cache.CacheStats(hits=1, misses=1)
+    assert kis_cache.stats.hit_rate == 0.5
+
+
+def test_counting_ttl_cache_skips_none():
+    kis_cache = cache.CountingTTLCache(maxsize=10, ttl=60)
+
+    assert kis_cache.get_or_load("key", lambda: None) is None
+    assert kis_cache.get_or_load("key", lambda: "value") == "value"
+    assert kis_cache.stats.misses == 2
+
+
+def test_counting_ttl_cache_expires():
+    kis_cache = cache.CountingTTLCache(maxsize=10, ttl=0.05)
+
+    kis_cache.get_or_load("key", lambda: "old")
+    time.sleep(0.1)
+
+    assert kis_cache.get_or_load("key", lambda: "new") == "new"
@@ -1,19 +1,38 @@
+from concurrent import futures
+import dataclasses
 import functools
+import threading
 import time
-from typing import Callable
+from typing import Callable, Iterator
 
 from loguru import logger
 import pykis
 from pykis.responses import exceptions
 from requests import exceptions as request_exceptions
 
+from core.finance.kis import cache as kis_cache
 from core.finance.kis import config as kis_config
+from core.finance.kis import limiter as kis_limiter
+from core.utils import singleflight
 
 _PYKIS_CLIENT = None
+_PYKIS_CLIENT_LOCK = threading.Lock()
 _DELAY = 0.2
+_SINGLE_FLIGHT = singleflight.SingleFlight()
+_MULTI_PRICE_PATH = "/uapi/domestic-stock/v1/quotations/intstock-multprice"
+_MULTI_PRICE_API = "FHKST11300006"
+_MULTI_PRICE_MAX_SYMBOLS = 30
 
 
 def _load_client() -> pykis.PyKis:
+    if _PYKIS_CLIENT is not None:
+        return _PYKIS_CLIENT
+
+    with _PYKIS_CLIENT_LOCK:
+        return _create_client()
+
+
+def _create_client() -> pykis.PyKis:
     global _PYKIS_CLIENT
     if _PYKIS_CLIENT is not None:
         return _PYKIS_CLIENT
@@ -38,6 +57,18 @@ def _load_client() -> pykis.PyKis:
     return _PYKIS_CLIENT
 
 
+def use_client(client: pykis.PyKis) -> None:
+    """Replaces the process-wide client, e.g. with a fake.FakeKis from tests and the load bench"""
+    global _PYKIS_CLIENT
+    with _PYKIS_CLIENT_LOCK:
+        _PYKIS_CLIENT = client
+    clear_cache()
+
+
+def _flight_key(endpoint: kis_limiter.Endpoint, symbol: str, args: tuple, kwargs: dict) -> tuple:
+    return endpoint, symbol, args, tuple(sorted(kwargs.items()))
+
+
 def _make_delayed_request_until_succeeds(fn: Callable):
     @functools.wraps(fn)
     def wrapper(*args, **kwargs):
@@ -57,11 +88,25 @@ def _make_delayed_request_until_succeeds(fn: Callable):
     return wrapper
 
 
-def buy(stock: pykis.KisStock, *args, **kwargs):
+def _rate_limited(endpoint: kis_limiter.Endpoint):
+    def decorator(fn: Callable):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            kis_limiter.get_limiter().acquire(endpoint, virtual=_load_client().virtual)
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@_rate_limited(kis_limiter.Endpoint.ORDER)
+def buy(stock: pykis.KisStock, *args, **kwargs) -> pykis.KisOrder | None:
     try:
-        stock.buy(*args, **kwargs)
+        return stock.buy(*args, **kwargs)
     except exceptions.KisMarketNotOpenedError:
         logger.warning("Market not open!")
+        return None
 
 
 @_make_delayed_request_until_succeeds
@@ -71,26 +116,211 @@ def get_account() -> pykis.KisAccount:
 
 
 @_make_delayed_request_until_succeeds
+@_rate_limited(kis_limiter.Endpoint.BALANCE)
+def get_balance(account: pykis.KisAccount) -> pykis.KisBalance:
+    return account.balance()
+
+
+@_make_delayed_request_until_succeeds
+@_rate_limited(kis_limiter.Endpoint.PENDING_ORDERS)
+def get_pending_orders(account: pykis.KisAccount) -> pykis.KisPendingOrders:
+    return account.pending_orders()
+
+
 def get_stock(symbol: str) -> pykis.KisStock | None:
+    key = _flight_key(kis_limiter.Endpoint.STOCK, symbol, (), {})
+    return kis_cache.get_stock_cache().get_or_load(symbol, lambda: _SINGLE_FLIGHT.do(key, _load_stock, symbol))
+
+
+@_make_delayed_request_until_succeeds
+@_rate_limited(kis_limiter.Endpoint.STOCK)
+def _load_stock(symbol: str) -> pykis.KisStock | None:
     _client = _load_client()
     return _client.stock(symbol)
 
 
-@_make_delayed_request_until_succeeds
 def get_quote(symbol: str) -> pykis.KisQuote | None:
+    key = _flight_key(kis_limiter.Endpoint.QUOTE, symbol, (), {})
+    return kis_cache.get_quote_cache().get_or_load(symbol, lambda: _SINGLE_FLIGHT.do(key, _load_quote, symbol))
+
+
+@_make_delayed_request_until_succeeds
+def _load_quote(symbol: str) -> pykis.KisQuote | None:
     stock = get_stock(symbol)
 
     if not stock:
         return None
 
-    return stock.quote()
+    return _fetch_quote(stock)
+
+
+@dataclasses.dataclass(frozen=True)
+class QuoteResult:
+    symbol: str
+    quote: pykis.KisQuote | None  # None when the symbol is not found or the lookup failed
+    latency: float
+    error: Exception | None = None
+
+
+def _timed_quote(symbol: str) -> QuoteResult:
+    start = time.perf_counter()
+    try:
+        return QuoteResult(symbol, get_quote(symbol), time.perf_counter() - start)
+    except Exception as e:
+        return QuoteResult(symbol, None, time.perf_counter() - start, error=e)
+
+
+def iter_quotes(symbols: list[str], max_workers: int = kis_config.QUOTE_MAX_WORKERS) -> Iterator[QuoteResult]:
+    """Full quotes of unique symbols yielded as they complete
+
+    The multi-symbol price inquiry screens symbols 30 per request first, so that only traded symbols cost a quote
+    request each, symbols of failed inquiries are quoted anyway. Use get_prices when the price, today's running OHLC
+    and amount are enough.
+    """
+    unique_symbols = list(dict.fromkeys(symbols))
+    if not unique_symbols:
+        return
+
+    start = time.perf_counter()
+    batch = get_prices(unique_symbols)
+    for symbol in batch.missing:
+        yield QuoteResult(symbol, None, time.perf_counter() - start)
+
+    quoted = [s for s in unique_symbols if s in batch.prices or s in batch.errors]
+    if not quoted:
+        return
+
+    with futures.ThreadPoolExecutor(max_workers=min(max_workers, len(quoted))) as executor:
+        for future in futures.as_completed([executor.submit(_timed_quote, s) for s in quoted]):
+            yield future.result()
+
+
+def get_quotes(symbols: list[str], max_workers: int = kis_config.QUOTE_MAX_WORKERS) -> dict[str, QuoteResult]:
+    """iter_quotes collected by symbol"""
+    return {result.symbol: result for result in iter_quotes(symbols, max_workers=max_workers)}
+
+
+@dataclasses.dataclass(frozen=True)
+class Price:
+    """Row of the multi-symbol price inquiry, usable as today's bar like a PriceTick"""
+
+    symbol: str
+    price: float
+    open: float
+    high: float
+    low: float
+    volume: int
+    amount: float
+    rate: float
+
+    @property
+    def close(self) -> float:
+        return self.price
+
+    @classmethod
+    def from_output(cls, row: dict) -> "Price":
+        return cls(
+            symbol=row["inter_shrn_iscd"],
+            price=float(row["inter2_prpr"]),
+            open=float(row["inter2_oprc"]),
+            high=float(row["inter2_hgpr"]),
+            low=float(row["inter2_lwpr"]),
+            volume=int(row["acml_vol"]),
+            amount=float(row["acml_tr_pbmn"]),
+            rate=float(row["prdy_ctrt"]),
+        )
+
+
+@dataclasses.dataclass
+class PriceBatch:
+    prices: dict[str, Price] = dataclasses.field(default_factory=dict)
+    missing: list[str] = dataclasses.field(default_factory=list)  # not listed or not trading
+    errors: dict[str, Exception] = dataclasses.field(default_factory=dict)  # requests that failed
+
+
+def get_prices(symbols: list[str]) -> PriceBatch:
+    """Current prices of unique symbols via the multi-symbol price inquiry, 30 symbols per request
+
+    Indicators, risk flags and price limits are not returned, use iter_quotes where full quotes are needed.
+    """
+    unique_symbols = list(dict.fromkeys(symbols))
+    batch = PriceBatch()
+
+    for i in range(0, len(unique_symbols), _MULTI_PRICE_MAX_SYMBOLS):
+        chunk = unique_symbols[i : i + _MULTI_PRICE_MAX_SYMBOLS]
+
+        try:
+            rows = _fetch_prices(chunk) or []
+        except Exception as e:
+            logger.error(f"Failed to get prices of {len(chunk)} symbols from {chunk[0]}: {e}")
+            batch.errors.update({s: e for s in chunk})
+            continue
+
+        for row in rows:
+            # unknown symbols come back as blank rows
+            if row.get("inter_shrn_iscd") in chunk and float(row.get("inter2_prpr") or 0) > 0:
+                price = Price.from_output(row)
+                batch.prices[price.symbol] = price
+
+        batch.missing.extend(s for s in chunk if s not in batch.prices)
+
+    return batch
 
 
 @_make_delayed_request_until_succeeds
+@_rate_limited(kis_limiter.Endpoint.MULTI_PRICE)
+def _fetch_prices(symbols: list[str]) -> list[dict]:
+    params = {}
+    for i, symbol in enumerate(symbols, start=1):
+        params[f"FID_COND_MRKT_DIV_CODE_{i}"] = "J"
+        params[f"FID_INPUT_ISCD_{i}"] = symbol
+
+    response = _load_client().request(
+        _MULTI_PRICE_PATH, params=params, headers={"tr_id": _MULTI_PRICE_API}, domain="real"
+    )
+    data = response.json()
+
+    if data.get("rt_cd") != "0":
+        raise RuntimeError(f"Multi-symbol price inquiry failed: {data.get('msg_cd')} {data.get('msg1')}")
+    return data.get("output") or []
+
+
+@_rate_limited(kis_limiter.Endpoint.QUOTE)
+def _fetch_quote(stock: pykis.KisStock) -> pykis.KisQuote:
+    return stock.quote()
+
+
 def get_chart(symbol: str, *args, **kwargs) -> pykis.KisChart | None:
+    key = _flight_key(kis_limiter.Endpoint.CHART, symbol, args, kwargs)
+    return _SINGLE_FLIGHT.do(key, _load_chart, symbol, *args, **kwargs)
+
+
+@_make_delayed_request_until_succeeds
+def _load_chart(symbol: str, *args, **kwargs) -> pykis.KisChart | None:
     stock = get_stock(symbol)
 
     if not stock:
         return None
 
+    return _fetch_chart(stock, *args, **kwargs)
+
+
+@_rate_limited(kis_limiter.Endpoint.CHART)
+def _fetch_chart(stock: pykis.KisStock, *args, **kwargs) -> pykis.KisChart:
     return stock.chart(*args, **kwargs)
+
+
+def num_shared_requests() -> int:
+    return _SINGLE_FLIGHT.num_shared
+
+
+def cache_stats() -> dict[str, kis_cache.CacheStats]:
+    return {
+        "stock": kis_cache.get_stock_cache().stats,
+        "quote": kis_cache.get_quote_cache().stats,
+    }
+
+
+def clear_cache() -> None:
+    kis_cache.get_stock_cache().clear()
+    kis_cache.get_quote_cache().clear()
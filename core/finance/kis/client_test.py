@@ -0,0 +1,75 @@
+import pytest_mock
+
+from core.finance.kis import client
+
+
+def _row(symbol: str, price: int) -> dict:
+    return {
+        "inter_shrn_iscd": symbol,
+        "inter2_prpr": str(price),
+        "inter2_oprc": str(price),
+        "inter2_hgpr": str(price),
+        "inter2_lwpr": str(price),
+        "acml_vol": "10",
+        "acml_tr_pbmn": str(price * 10),
+        "prdy_ctrt": "0.00",
+    }
+
+
+def test_get_quotes_screens_symbols_in_batches(mocker: pytest_mock.MockerFixture):
+    def fetch_prices(chunk: list[str]) -> list[dict]:
+        return [_row(s, 100) if s != "999999" else {"inter_shrn_iscd": "", "inter2_prpr": "0"} for s in chunk]
+
+    def get_quote(symbol: str) -> str | None:
+        if symbol == "000000":
+            raise RuntimeError("boom")
+        return f"quote-{symbol}"
+
+    fetch_mock = mocker.patch("core.finance.kis.client._fetch_prices", side_effect=fetch_prices)
+    get_quote_mock = mocker.patch("core.finance.kis.client.get_quote", side_effect=get_quote)
+
+    results = client.get_quotes(["005930", "000660", "005930", "999999", "000000"])
+
+    assert {s: r.quote for s, r in results.items()} == {
+        "005930": "quote-005930",
+        "000660": "quote-000660",
+        "999999": None,
+        "000000": None,
+    }
+    assert results["999999"].error is None
+    assert isinstance(results["000000"].error, RuntimeError)
+    assert all(r.latency >= 0 for r in results.values())
+    # one inquiry screens every symbol, the symbol it does not know is never quoted
+    assert fetch_mock.call_count == 1
+    assert sorted(c.args[0] for c in get_quote_mock.call_args_list) == ["000000", "000660", "005930"]
+
+
+def test_iter_quotes_quotes_symbols_of_failed_inquiries(mocker: pytest_mock.MockerFixture):
+    mocker.patch("core.finance.kis.client._fetch_prices", side_effect=RuntimeError("boom"))
+    mocker.patch("core.finance.kis.client.get_quote", side_effect=lambda s: f"quote-{s}")
+
+    assert {r.symbol: r.quote for r in client.iter_quotes(["005930"])} == {"005930": "quote-005930"}
+
+
+def test_iter_quotes_empty():
+    assert list(client.iter_quotes([])) == []
+
+
+def test_get_prices_batches_symbols(mocker: pytest_mock.MockerFixture):
+    symbols = [f"{i:06d}" for i in range(1, 36)]
+
+    def fetch_prices(chunk: list[str]) -> list[dict]:
+        if "000033" in chunk:
+            raise RuntimeError("boom")
+        return [_row(s, 100) if s != "000002" else {"inter_shrn_iscd": "", "inter2_prpr": "0"} for s in chunk]
+
+    fetch_mock = mocker.patch("core.finance.kis.client._fetch_prices", side_effect=fetch_prices)
+
+    batch = client.get_prices(symbols + ["000001"])
+
+    assert [len(c.args[0]) for c in fetch_mock.call_args_list] == [30, 5]
+    assert batch.missing == ["000002"]
+    assert sorted(batch.errors) == symbols[30:]
+    assert len(batch.prices) == 29
+    assert batch.prices["000001"].close == 100
+    assert batch.prices["000001"].amount == 1000
@@ -1,7 +1,26 @@
 import pydantic_settings
 
+# default of concurrent quote requests, shared by the client, the quote task and their command line arguments
+QUOTE_MAX_WORKERS = 8
 
-class Config(pydantic_settings.BaseSettings):
+
+class ClientConfig(pydantic_settings.BaseSettings):
+    """Client side rate limits and caches, also used by the fake client which needs no credentials"""
+
+    # KIS allows 20 requests/s for real accounts and 2 requests/s for virtual accounts
+    real_requests_per_second: float = 18
+    virtual_requests_per_second: float = 2
+    endpoint_weights: dict[str, float] = {}
+
+    # stock handles barely change within a day, quotes are only shared between near-simultaneous callers
+    stock_cache_ttl: float = 6 * 60 * 60
+    quote_cache_ttl: float = 2
+    cache_maxsize: int = 8192
+
+    model_config = pydantic_settings.SettingsConfigDict(env_file=[".env"], env_prefix="KIS_", extra="allow")
+
+
+class Config(ClientConfig):
     id: str
     account: str
     app_key: str
@@ -13,8 +32,10 @@ class Config(pydantic_settings.BaseSettings):
     virtual_app_key: str
     virtual_secret_key: str
 
-    model_config = pydantic_settings.SettingsConfigDict(env_file=[".env"], env_prefix="KIS_", extra="allow")
-
 
 def load_config() -> Config:
     return Config()
+
+
+def load_client_config() -> ClientConfig:
+    return ClientConfig()
@@ -0,0 +1,563 @@
+import dataclasses
+import datetime
+import decimal
+import json
+import math
+import random
+import threading
+import time
+
+import pydantic_settings
+from pykis.responses import exceptions
+import requests
+from requests import exceptions as request_exceptions
+
+from core.utils import rate_limit
+from core.utils import time as time_utils
+
+_HISTORY_DAYS = 250
+_UPPER_LIMIT_RATE = 0.3
+_TRADING_SECONDS = 6.5 * 60 * 60
+
+
+class FakeConfig(pydantic_settings.BaseSettings):
+    universe_size: int = 2000
+    seed: int = 0
+    volatility: float = 0.03  # daily sigma of the synthetic price paths
+    upper_limit_ratio: float = 0.02  # symbols which hit the upper limit on the previous session
+    latency: float = 0.02  # mean seconds per request
+    error_rate: float = 0.0
+    requests_per_second: float = 20  # server side throttling like KIS' EGW00201, 0 disables it
+    tick_interval: float = 0.5
+    deposit: int = 100_000_000
+
+    model_config = pydantic_settings.SettingsConfigDict(env_file=[".env"], env_prefix="KIS_FAKE_", extra="allow")
+
+
+def load_config() -> FakeConfig:
+    return FakeConfig()
+
+
+@dataclasses.dataclass
+class FakeServerStats:
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    orders: int = 0
+    order_latencies: list[float] = dataclasses.field(default_factory=list)
+
+    def order_latency(self, percentile: float) -> float:
+        if not self.order_latencies:
+            return 0.0
+
+        latencies = sorted(self.order_latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percentile))]
+
+
+@dataclasses.dataclass
+class FakeIndicator:
+    eps: decimal.Decimal
+    bps: decimal.Decimal
+    per: decimal.Decimal
+    pbr: decimal.Decimal
+    week52_high: decimal.Decimal
+    week52_low: decimal.Decimal
+    week52_high_date: datetime.date
+    week52_low_date: datetime.date
+
+
+@dataclasses.dataclass
+class FakeQuote:
+    """Attribute compatible with pykis.KisQuote"""
+
+    symbol: str
+    market: str
+    sector_name: str
+    price: decimal.Decimal
+    volume: int
+    amount: decimal.Decimal
+    market_cap: decimal.Decimal
+    sign: str
+    sign_name: str
+    risk: str
+    halt: bool
+    overbought: bool
+    prev_price: decimal.Decimal
+    prev_volume: int
+    change: decimal.Decimal
+    rate: decimal.Decimal
+    high_limit: decimal.Decimal
+    low_limit: decimal.Decimal
+    unit: int
+    tick: decimal.Decimal
+    decimal_places: int
+    currency: str
+    exchange_rate: decimal.Decimal
+    open: decimal.Decimal
+    high: decimal.Decimal
+    low: decimal.Decimal
+    indicator: FakeIndicator
+
+
+@dataclasses.dataclass
+class FakeChartBar:
+    """Attribute compatible with pykis.KisChartBar"""
+
+    time: datetime.datetime
+    open: decimal.Decimal
+    high: decimal.Decimal
+    low: decimal.Decimal
+    close: decimal.Decimal
+    volume: int
+    amount: decimal.Decimal
+    change: decimal.Decimal
+
+
+@dataclasses.dataclass
+class FakeChart:
+    symbol: str
+    bars: list[FakeChartBar]
+
+
+@dataclasses.dataclass
+class FakeOrder:
+    symbol: str
+    order_number: int
+    qty: int
+    price: decimal.Decimal
+    time_kst: datetime.datetime
+
+
+@dataclasses.dataclass
+class FakeDeposit:
+    currency: str
+    amount: decimal.Decimal
+
+
+@dataclasses.dataclass
+class _Session:
+    """Synthetic state of a symbol, history holds closed daily bars up to yesterday"""
+
+    history: list[FakeChartBar]
+    open: float
+    high: float
+    low: float
+    price: float
+    volume: int = 0
+    amount: float = 0.0
+
+    @property
+    def prev_close(self) -> float:
+        return float(self.history[-1].close)
+
+
+class FakeMarket:
+    """Synthetic KRX universe served with KIS-like latency, throttling and errors
+
+    Prices follow geometric brownian motion, a few symbols closed at the upper limit on the previous session and open
+    with a gap up so that upper limit strategies have something to trade.
+    """
+
+    def __init__(
+        self,
+        universe_size: int = 2000,
+        seed: int = 0,
+        volatility: float = 0.03,
+        upper_limit_ratio: float = 0.02,
+        latency: float = 0.02,
+        error_rate: float = 0.0,
+        requests_per_second: float = 20,
+        tick_interval: float = 0.5,
+        deposit: int = 100_000_000,
+    ):
+        self._seed = seed
+        self._volatility = volatility
+        self._upper_limit_ratio = upper_limit_ratio
+        self._latency = latency
+        self._error_rate = error_rate
+        self._bucket = rate_limit.TokenBucket(requests_per_second) if requests_per_second > 0 else None
+        self._tick_interval = tick_interval
+
+        self._symbols = [f"{i:06d}" for i in range(1, universe_size + 1)]
+        self._known = set(self._symbols)
+        self._sessions: dict[str, _Session] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+
+        self._deposit = decimal.Decimal(deposit)
+        self._holdings: dict[str, int] = {}
+        self._pending: list[FakeOrder] = []
+        self._stats = FakeServerStats()
+
+    @classmethod
+    def from_config(cls, cfg: FakeConfig) -> "FakeMarket":
+        return cls(
+            universe_size=cfg.universe_size,
+            seed=cfg.seed,
+            volatility=cfg.volatility,
+            upper_limit_ratio=cfg.upper_limit_ratio,
+            latency=cfg.latency,
+            error_rate=cfg.error_rate,
+            requests_per_second=cfg.requests_per_second,
+            tick_interval=cfg.tick_interval,
+            deposit=cfg.deposit,
+        )
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._symbols)
+
+    @property
+    def tick_interval(self) -> float:
+        return self._tick_interval
+
+    @property
+    def stats(self) -> FakeServerStats:
+        with self._lock:
+            return dataclasses.replace(self._stats, order_latencies=list(self._stats.order_latencies))
+
+    @property
+    def upper_limit_symbols(self) -> list[str]:
+        """Symbols which closed at the upper limit on the previous session"""
+        limit_rate = decimal.Decimal(_UPPER_LIMIT_RATE * 100 - 0.05)
+        return [
+            s
+            for s in self._symbols
+            if (bars := self._session(s).history)[-1].close >= bars[-2].close * (1 + limit_rate / 100)
+        ]
+
+    def has_symbol(self, symbol: str) -> bool:
+        return symbol in self._known
+
+    def serve(self) -> None:
+        """Simulates a round trip, raising like an overloaded or flaky KIS server"""
+        with self._lock:
+            self._stats.requests += 1
+            throttled = self._bucket is not None and not self._bucket.try_acquire()
+            failed = self._rng.random() < self._error_rate
+            latency = self._rng.uniform(0.5, 1.5) * self._latency
+
+            if throttled:
+                self._stats.throttled += 1
+            elif failed:
+                self._stats.errors += 1
+
+        if latency > 0:
+            time.sleep(latency)
+
+        if throttled:
+            raise request_exceptions.ConnectionError("EGW00201 초당 거래건수를 초과하였습니다.")
+        if failed:
+            raise request_exceptions.ConnectionError("Injected fake KIS server error")
+
+    def _create_session(self, symbol: str) -> _Session:
+        rng = random.Random(f"{self._seed}:{symbol}")
+        today = time_utils.now().date()
+        price = rng.uniform(1_000, 100_000)
+        volume = rng.randint(10_000, 1_000_000)
+
+        history = []
+        for i in range(_HISTORY_DAYS, 0, -1):
+            date = today - datetime.timedelta(days=i)
+            if date.weekday() >= 5:
+                continue
+
+            open_price = price * math.exp(rng.gauss(0, self._volatility / 4))
+            close = price * math.exp(rng.gauss(0, self._volatility))
+            day_volume = int(volume * rng.uniform(0.5, 1.5))
+            history.append(self._bar(date, open_price, close, day_volume, price, rng))
+            price = close
+
+        hits_upper_limit = rng.random() < self._upper_limit_ratio
+        if hits_upper_limit:
+            close = history[-2].close * decimal.Decimal(1 + _UPPER_LIMIT_RATE)
+            history[-1] = self._bar(history[-1].time.date(), float(history[-1].open), float(close), volume, price, rng)
+
+        prev_close = float(history[-1].close)
+        gap = rng.uniform(1.02, 1.08) if hits_upper_limit else math.exp(rng.gauss(0, self._volatility / 4))
+        open_price = round(prev_close * gap)
+        session = _Session(history=history, open=open_price, high=open_price, low=open_price, price=open_price)
+
+        if hits_upper_limit:
+            # follow-up buying right after the open
+            session.volume = int(history[-1].volume * 1.2)
+            session.amount = session.volume * open_price
+        return session
+
+    @staticmethod
+    def _bar(
+        date: datetime.date,
+        open_price: float,
+        close: float,
+        volume: int,
+        prev_close: float,
+        rng: random.Random,
+    ) -> FakeChartBar:
+        open_price, close = round(open_price), round(close)
+        high = max(open_price, close) * rng.uniform(1, 1.02)
+        low = min(open_price, close) * rng.uniform(0.98, 1)
+        return FakeChartBar(
+            time=datetime.datetime.combine(date, datetime.time(), time_utils.TimeZone.SEOUL.value),
+            open=decimal.Decimal(open_price),
+            high=decimal.Decimal(round(high)),
+            low=decimal.Decimal(round(low)),
+            close=decimal.Decimal(close),
+            volume=volume,
+            amount=decimal.Decimal(volume * close),
+            change=decimal.Decimal(close - round(prev_close)),
+        )
+
+    def _session(self, symbol: str) -> _Session:
+        with self._lock:
+            session = self._sessions.get(symbol)
+            if session is None:
+                session = self._sessions[symbol] = self._create_session(symbol)
+            return session
+
+    def _step(self, symbol: str, seconds: float) -> _Session:
+        """Moves the price of symbol forward by `seconds` of trading time"""
+        with self._lock:
+            session = self._session(symbol)
+            sigma = self._volatility * math.sqrt(seconds / _TRADING_SECONDS)
+            upper_limit = session.prev_close * (1 + _UPPER_LIMIT_RATE)
+            lower_limit = session.prev_close * (1 - _UPPER_LIMIT_RATE)
+
+            price = round(min(max(session.price * math.exp(self._rng.gauss(0, sigma)), lower_limit), upper_limit))
+            volume = self._rng.randint(1, 1_000)
+
+            session.price = price
+            session.high = max(session.high, price)
+            session.low = min(session.low, price)
+            session.volume += volume
+            session.amount += volume * price
+            return session
+
+    def quote(self, symbol: str) -> FakeQuote:
+        session = self._step(symbol, self._tick_interval)
+        prev_close = session.prev_close
+        price = decimal.Decimal(session.price)
+        change = decimal.Decimal(session.price - prev_close)
+
+        return FakeQuote(
+            symbol=symbol,
+            market="KRX",
+            sector_name="FAKE",
+            price=price,
+            volume=session.volume,
+            amount=decimal.Decimal(session.amount),
+            market_cap=price * 10_000_000 / 100_000_000,
+            sign="rise" if change > 0 else "fall" if change < 0 else "steady",
+            sign_name="상승" if change > 0 else "하락" if change < 0 else "보합",
+            risk="none",
+            halt=False,
+            overbought=False,
+            prev_price=decimal.Decimal(prev_close),
+            prev_volume=session.history[-1].volume,
+            change=change,
+            rate=change / decimal.Decimal(prev_close) * 100,
+            high_limit=decimal.Decimal(round(prev_close * (1 + _UPPER_LIMIT_RATE))),
+            low_limit=decimal.Decimal(round(prev_close * (1 - _UPPER_LIMIT_RATE))),
+            unit=1,
+            tick=decimal.Decimal(1),
+            decimal_places=0,
+            currency="KRW",
+            exchange_rate=decimal.Decimal(1),
+            open=decimal.Decimal(session.open),
+            high=decimal.Decimal(session.high),
+            low=decimal.Decimal(session.low),
+            indicator=FakeIndicator(
+                eps=decimal.Decimal(1_000),
+                bps=decimal.Decimal(10_000),
+                per=price / 1_000,
+                pbr=price / 10_000,
+                week52_high=max(b.high for b in session.history),
+                week52_low=min(b.low for b in session.history),
+                week52_high_date=max(session.history, key=lambda b: b.high).time.date(),
+                week52_low_date=min(session.history, key=lambda b: b.low).time.date(),
+            ),
+        )
+
+    def multi_price(self, symbols: list[str]) -> list[dict]:
+        """Output rows of the multi-symbol price inquiry, blank rows for unknown symbols like KIS"""
+        rows = []
+        for symbol in symbols:
+            if not self.has_symbol(symbol):
+                rows.append({"inter_shrn_iscd": "", "inter2_prpr": "0"})
+                continue
+
+            quote = self.quote(symbol)
+            rows.append(
+                {
+                    "inter_shrn_iscd": symbol,
+                    "inter2_prpr": str(quote.price),
+                    "inter2_oprc": str(quote.open),
+                    "inter2_hgpr": str(quote.high),
+                    "inter2_lwpr": str(quote.low),
+                    "acml_vol": str(quote.volume),
+                    "acml_tr_pbmn": str(int(quote.amount)),
+                    "prdy_ctrt": f"{quote.rate:.2f}",
+                }
+            )
+        return rows
+
+    def chart(self, symbol: str, start: datetime.date | None = None, end: datetime.date | None = None) -> FakeChart:
+        bars = self._session(symbol).history
+        return FakeChart(
+            symbol=symbol,
+            bars=[
+                b for b in bars if (start is None or b.time.date() >= start) and (end is None or b.time.date() <= end)
+            ],
+        )
+
+    def order(self, symbol: str, qty: int, price: float, started_at: float) -> FakeOrder:
+        """Accepts a buy order, filled right away when it crosses the current price"""
+        with self._lock:
+            session = self._session(symbol)
+            order = FakeOrder(
+                symbol=symbol,
+                order_number=self._stats.orders + 1,
+                qty=qty,
+                price=decimal.Decimal(str(price)),
+                time_kst=time_utils.now(),
+            )
+
+            if price >= session.price:
+                self._holdings[symbol] = self._holdings.get(symbol, 0) + qty
+                self._deposit -= order.price * qty
+            else:
+                self._pending.append(order)
+
+            self._stats.orders += 1
+            self._stats.order_latencies.append(time.monotonic() - started_at)
+            return order
+
+    def sell(self, symbol: str, qty: int, price: float) -> None:
+        with self._lock:
+            qty = min(qty, self._holdings.get(symbol, 0))
+            self._holdings[symbol] = self._holdings.get(symbol, 0) - qty
+            self._deposit += decimal.Decimal(str(price)) * qty
+
+            if not self._holdings[symbol]:
+                del self._holdings[symbol]
+
+    def balance(self) -> "FakeBalance":
+        with self._lock:
+            stocks = [
+                FakeBalanceStock(self, symbol=s, qty=qty, price=decimal.Decimal(self._session(s).price))
+                for s, qty in self._holdings.items()
+            ]
+            return FakeBalance(stocks=stocks, deposits={"KRW": FakeDeposit(currency="KRW", amount=self._deposit)})
+
+    def pending_orders(self) -> list[FakeOrder]:
+        with self._lock:
+            return list(self._pending)
+
+
+class FakeBalanceStock:
+    """Attribute compatible with pykis.KisBalanceStock"""
+
+    def __init__(self, market: FakeMarket, symbol: str, qty: int, price: decimal.Decimal):
+        self._market = market
+        self.symbol = symbol
+        self.qty = qty
+        self.price = price
+
+    def sell(self, qty: int, price: float) -> None:
+        self._market.serve()
+        self._market.sell(self.symbol, qty, price)
+
+
+@dataclasses.dataclass
+class FakeBalance:
+    stocks: list[FakeBalanceStock]
+    deposits: dict[str, FakeDeposit]
+
+    def deposit(self, currency: str) -> FakeDeposit | None:
+        return self.deposits.get(currency)
+
+
+class FakeAccount:
+    def __init__(self, market: FakeMarket):
+        self._market = market
+
+    def balance(self) -> FakeBalance:
+        self._market.serve()
+        return self._market.balance()
+
+    def pending_orders(self) -> list[FakeOrder]:
+        self._market.serve()
+        return self._market.pending_orders()
+
+
+class FakeStock:
+    """Attribute compatible with pykis.KisStock"""
+
+    def __init__(self, market: FakeMarket, symbol: str):
+        self._market = market
+        self.symbol = symbol
+        self.market = "KRX"
+        self.name = f"FAKE{symbol}"
+
+    def quote(self) -> FakeQuote:
+        self._market.serve()
+        return self._market.quote(self.symbol)
+
+    def chart(self, start: datetime.date | None = None, end: datetime.date | None = None, **kwargs) -> FakeChart:
+        self._market.serve()
+        return self._market.chart(self.symbol, start=start, end=end)
+
+    def buy(self, qty: int, price: float, **kwargs) -> FakeOrder:
+        started_at = time.monotonic()
+        self._market.serve()
+        return self._market.order(self.symbol, qty, price, started_at)
+
+
+class FakeKis:
+    """Duck-typed stand-in for pykis.PyKis backed by a FakeMarket"""
+
+    def __init__(self, market: FakeMarket, virtual: bool = False):
+        self._market = market
+        self._virtual = virtual
+
+    @property
+    def virtual(self) -> bool:
+        return self._virtual
+
+    @property
+    def market(self) -> FakeMarket:
+        return self._market
+
+    def stock(self, symbol: str) -> FakeStock:
+        self._market.serve()
+
+        if not self._market.has_symbol(symbol):
+            response = requests.Response()
+            response.status_code = 200
+            response.request = requests.Request("GET", "http://fake-kis").prepare()
+            raise exceptions.KisNotFoundError({}, response, f"Fake stock {symbol} not found")
+
+        return FakeStock(self._market, symbol)
+
+    def account(self) -> FakeAccount:
+        return FakeAccount(self._market)
+
+    def request(self, path: str, params: dict | None = None, **kwargs) -> requests.Response:
+        """Serves the raw inquiries the client calls directly, only the multi-symbol price inquiry for now"""
+        self._market.serve()
+
+        if not path.endswith("/intstock-multprice"):
+            raise ValueError(f"Unsupported fake request {path}")
+
+        params = params or {}
+        symbols = [params[f"FID_INPUT_ISCD_{i}"] for i in range(1, len(params) // 2 + 1)]
+        body = {
+            "rt_cd": "0",
+            "msg_cd": "MCA00000",
+            "msg1": "정상처리 되었습니다.",
+            "output": self._market.multi_price(symbols),
+        }
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(body).encode()
+        return response
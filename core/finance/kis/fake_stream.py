@@ -0,0 +1,98 @@
+import collections
+import queue
+import threading
+
+from core.finance.kis import fake as kis_fake
+from core.finance.kis import stream
+from core.utils import time as time_utils
+
+
+class FakePriceStream(stream.PriceStreamBase):
+    """In-process stand-in for the KIS realtime server, delivers published ticks from its own thread"""
+
+    def __init__(self):
+        self._callbacks: dict[str, list[stream.TickCallback]] = collections.defaultdict(list)
+        self._queue: queue.Queue[stream.PriceTick | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    @property
+    def symbols(self) -> list[str]:
+        with self._lock:
+            return list(self._callbacks)
+
+    def subscribe(self, symbol: str, callback: stream.TickCallback) -> bool:
+        with self._lock:
+            self._callbacks[symbol].append(callback)
+        return True
+
+    def publish(self, tick: stream.PriceTick) -> None:
+        self._queue.put(tick)
+
+    def join(self) -> None:
+        """block until every published tick is delivered"""
+        self._queue.join()
+
+    def close(self) -> None:
+        with self._lock:
+            self._callbacks.clear()
+        self._queue.put(None)
+
+    def _serve(self) -> None:
+        while True:
+            tick = self._queue.get()
+
+            try:
+                if tick is None:
+                    return
+
+                with self._lock:
+                    callbacks = list(self._callbacks.get(tick.symbol, []))
+
+                for callback in callbacks:
+                    callback(tick)
+            finally:
+                self._queue.task_done()
+
+
+class FakeMarketPriceStream(FakePriceStream):
+    """FakePriceStream fed by a FakeMarket, subscribed symbols tick every tick interval of the market
+
+    Takes up to `max_subscriptions` symbols like the KIS websocket, so the runners' overflow polling gets exercised.
+    """
+
+    def __init__(self, market: kis_fake.FakeMarket, max_subscriptions: int = stream.MAX_SUBSCRIPTIONS):
+        super().__init__()
+        self._market = market
+        self._max_subscriptions = max_subscriptions
+        self._stop_event = threading.Event()
+        self._ticker = threading.Thread(target=self._run_ticker, daemon=True)
+        self._ticker.start()
+
+    def subscribe(self, symbol: str, callback: stream.TickCallback) -> bool:
+        symbols = self.symbols
+        if not self._market.has_symbol(symbol) or (symbol not in symbols and len(symbols) >= self._max_subscriptions):
+            return False
+        return super().subscribe(symbol, callback)
+
+    def close(self) -> None:
+        self._stop_event.set()
+        super().close()
+
+    def _run_ticker(self) -> None:
+        while not self._stop_event.wait(self._market.tick_interval):
+            for symbol in self.symbols:
+                quote = self._market.quote(symbol)
+                self.publish(
+                    stream.PriceTick(
+                        symbol=symbol,
+                        time=time_utils.now(),
+                        price=float(quote.price),
+                        open=float(quote.open),
+                        high=float(quote.high),
+                        low=float(quote.low),
+                        volume=quote.volume,
+                        amount=float(quote.amount),
+                    )
+                )
@@ -0,0 +1,75 @@
+import decimal
+import time
+
+import pytest
+from requests import exceptions as request_exceptions
+
+from core.finance.kis import client
+from core.finance.kis import fake
+from core.finance.kis import fake_stream
+
+
+@pytest.fixture
+def market():
+    market = fake.FakeMarket(universe_size=10, latency=0, requests_per_second=0, tick_interval=0.01)
+    client.use_client(fake.FakeKis(market))
+
+    yield market
+
+    client.use_client(None)
+
+
+def test_quotes_and_charts_are_served(market: fake.FakeMarket):
+    quotes = {r.symbol: r.quote for r in client.iter_quotes(["000001", "000002", "999999"])}
+
+    assert quotes["999999"] is None
+    assert quotes["000001"].symbol == "000001"
+    assert quotes["000001"].low <= quotes["000001"].price <= quotes["000001"].high
+
+    batch = client.get_prices(["000001", "000002", "999999"])
+    assert batch.missing == ["999999"] and not batch.errors
+    assert batch.prices["000002"].low <= batch.prices["000002"].close <= batch.prices["000002"].high
+
+    chart = client.get_chart("000001")
+    assert chart.bars and all(b.low <= b.close <= b.high for b in chart.bars)
+
+
+def test_buy_order_updates_balance(market: fake.FakeMarket):
+    stock = client.get_stock("000003")
+    price = float(client.get_quote("000003").price) * 2
+
+    assert client.buy(stock, qty=3, price=price).qty == 3
+
+    balance = client.get_balance(client.get_account())
+    assert {s.symbol: s.qty for s in balance.stocks} == {"000003": 3}
+    assert balance.deposit("KRW").amount == decimal.Decimal(100_000_000) - decimal.Decimal(str(price)) * 3
+    assert market.stats.orders == 1
+
+
+def test_server_throttles_excess_requests():
+    market = fake.FakeMarket(universe_size=1, latency=0, requests_per_second=1)
+    kis = fake.FakeKis(market)
+
+    kis.stock("000001")
+    with pytest.raises(request_exceptions.ConnectionError):
+        kis.stock("000001")
+
+    assert market.stats.throttled == 1
+
+
+def test_realtime_ticks_are_published(market: fake.FakeMarket):
+    ticks = []
+    price_stream = fake_stream.FakeMarketPriceStream(market, max_subscriptions=1)
+
+    assert price_stream.subscribe("000004", ticks.append)
+    assert not price_stream.subscribe("000005", ticks.append)
+    unknown_stream = fake_stream.FakeMarketPriceStream(market)
+    assert not unknown_stream.subscribe("999999", ticks.append)
+    unknown_stream.close()
+
+    while not ticks:
+        time.sleep(0.001)
+
+    price_stream.close()
+    assert ticks[0].symbol == "000004"
+    assert ticks[0].low <= ticks[0].price <= ticks[0].high
@@ -0,0 +1,91 @@
+import enum
+import threading
+
+from loguru import logger
+
+from core.finance.kis import config as kis_config
+from core.utils import rate_limit
+
+
+class Domain(enum.StrEnum):
+    REAL = "real"
+    VIRTUAL = "virtual"
+
+
+class Endpoint(enum.StrEnum):
+    STOCK = "stock"
+    QUOTE = "quote"
+    MULTI_PRICE = "multi_price"
+    CHART = "chart"
+    BALANCE = "balance"
+    PENDING_ORDERS = "pending_orders"
+    ORDER = "order"
+
+
+# number of KIS requests a single call is expected to issue, e.g. daily charts are paged by 100 bars
+_DEFAULT_WEIGHTS: dict[Endpoint, float] = {
+    Endpoint.STOCK: 1,
+    Endpoint.QUOTE: 1,
+    Endpoint.MULTI_PRICE: 1,
+    Endpoint.CHART: 2,
+    Endpoint.BALANCE: 1,
+    Endpoint.PENDING_ORDERS: 1,
+    Endpoint.ORDER: 1,
+}
+
+# account and order requests go to the virtual domain for virtual accounts, market data always goes to real
+_ACCOUNT_ENDPOINTS = {Endpoint.BALANCE, Endpoint.PENDING_ORDERS, Endpoint.ORDER}
+
+_LIMITER = None
+_LIMITER_LOCK = threading.Lock()
+
+
+class KisRateLimiter:
+    """Process-wide token buckets for KIS requests, one budget per domain"""
+
+    def __init__(
+        self,
+        real_requests_per_second: float,
+        virtual_requests_per_second: float,
+        weights: dict[Endpoint, float] | None = None,
+    ):
+        self._buckets = {
+            Domain.REAL: rate_limit.TokenBucket(real_requests_per_second),
+            Domain.VIRTUAL: rate_limit.TokenBucket(virtual_requests_per_second),
+        }
+        self._weights = {**_DEFAULT_WEIGHTS, **(weights or {})}
+
+    @staticmethod
+    def resolve_domain(endpoint: Endpoint, virtual: bool) -> Domain:
+        if virtual and endpoint in _ACCOUNT_ENDPOINTS:
+            return Domain.VIRTUAL
+        return Domain.REAL
+
+    def weight(self, endpoint: Endpoint) -> float:
+        return self._weights[endpoint]
+
+    def acquire(self, endpoint: Endpoint, virtual: bool = False) -> float:
+        domain = self.resolve_domain(endpoint, virtual)
+        bucket = self._buckets[domain]
+        weight = min(self._weights[endpoint], bucket.capacity)
+
+        waited = bucket.acquire(weight)
+        if waited > 1:
+            logger.debug(f"Waited {waited:.2f}s for {domain} rate limit on {endpoint}")
+        return waited
+
+
+def get_limiter() -> KisRateLimiter:
+    global _LIMITER
+    if _LIMITER is not None:
+        return _LIMITER
+
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            cfg = kis_config.load_client_config()
+            _LIMITER = KisRateLimiter(
+                real_requests_per_second=cfg.real_requests_per_second,
+                virtual_requests_per_second=cfg.virtual_requests_per_second,
+                weights={Endpoint(k): v for k, v in cfg.endpoint_weights.items()},
+            )
+    return _LIMITER
@@ -0,0 +1,39 @@
+import pytest
+
+from core.finance.kis import limiter
+
+
+@pytest.mark.parametrize(
+    "endpoint, virtual, expected",
+    [
+        (limiter.Endpoint.QUOTE, False, limiter.Domain.REAL),
+        (limiter.Endpoint.QUOTE, True, limiter.Domain.REAL),
+        (limiter.Endpoint.CHART, True, limiter.Domain.REAL),
+        (limiter.Endpoint.BALANCE, False, limiter.Domain.REAL),
+        (limiter.Endpoint.BALANCE, True, limiter.Domain.VIRTUAL),
+        (limiter.Endpoint.ORDER, True, limiter.Domain.VIRTUAL),
+    ],
+)
+def test_resolve_domain(endpoint: limiter.Endpoint, virtual: bool, expected: limiter.Domain):
+    assert limiter.KisRateLimiter.resolve_domain(endpoint, virtual) == expected
+
+
+def test_weights_override_defaults():
+    kis_limiter = limiter.KisRateLimiter(
+        real_requests_per_second=10,
+        virtual_requests_per_second=2,
+        weights={limiter.Endpoint.CHART: 5},
+    )
+
+    assert kis_limiter.weight(limiter.Endpoint.CHART) == 5
+    assert kis_limiter.weight(limiter.Endpoint.QUOTE) == 1
+
+
+def test_budgets_are_separated_by_domain():
+    kis_limiter = limiter.KisRateLimiter(real_requests_per_second=100, virtual_requests_per_second=1)
+
+    # drains the virtual bucket, real bucket stays untouched
+    kis_limiter.acquire(limiter.Endpoint.ORDER, virtual=True)
+
+    assert kis_limiter.acquire(limiter.Endpoint.QUOTE, virtual=True) == 0
+    assert kis_limiter.acquire(limiter.Endpoint.ORDER, virtual=True) > 0
@@ -0,0 +1,89 @@
+import abc
+import dataclasses
+import datetime
+import threading
+from typing import Callable
+
+from loguru import logger
+import pykis
+
+from core.finance.kis import client as kis_client
+
+# KIS allows up to 41 realtime registrations per websocket session
+MAX_SUBSCRIPTIONS = 41
+
+
+@dataclasses.dataclass(frozen=True)
+class PriceTick:
+    """Realtime trade tick, also usable as today's bar since it carries the running OHLC values"""
+
+    symbol: str
+    time: datetime.datetime
+    price: float
+    open: float
+    high: float
+    low: float
+    volume: int
+    amount: float
+
+    @property
+    def close(self) -> float:
+        return self.price
+
+
+TickCallback = Callable[[PriceTick], None]
+
+
+class PriceStreamBase(abc.ABC):
+    @abc.abstractmethod
+    def subscribe(self, symbol: str, callback: TickCallback) -> bool:
+        """subscribe realtime price of symbol, returns if subscription succeeded"""
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """unsubscribe every symbol"""
+
+
+class KisPriceStream(PriceStreamBase):
+    """Realtime trade price stream over the KIS websocket"""
+
+    def __init__(self):
+        self._tickets = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _as_tick(price: pykis.KisRealtimePrice) -> PriceTick:
+        return PriceTick(
+            symbol=price.symbol,
+            time=price.time_kst,
+            price=float(price.price),
+            open=float(price.open),
+            high=float(price.high),
+            low=float(price.low),
+            volume=int(price.volume),
+            amount=float(price.amount),
+        )
+
+    def subscribe(self, symbol: str, callback: TickCallback) -> bool:
+        with self._lock:
+            if len(self._tickets) >= MAX_SUBSCRIPTIONS:
+                logger.debug(f"Cannot subscribe {symbol}, websocket subscription limit {MAX_SUBSCRIPTIONS} reached")
+                return False
+
+        stock = kis_client.get_stock(symbol)
+        if not stock:
+            logger.warning(f"Cannot subscribe {symbol}, stock not found")
+            return False
+
+        ticket = stock.on("price", lambda _, e: callback(self._as_tick(e.response)))
+
+        with self._lock:
+            self._tickets.append(ticket)
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            tickets, self._tickets = self._tickets, []
+
+        for ticket in tickets:
+            ticket.unsubscribe()
@@ -15,8 +15,8 @@ JOBSTORES = {
 }
 
 EXECUTORS = {
-    "default": {"type": "threadpool", "max_workers": 1},
-}  # 1 worker due to rate limit
+    "default": {"type": "threadpool", "max_workers": 4},
+}  # KIS requests are throttled process-wide by core.finance.kis.limiter
 
 SCHEDULER_ARGS = {
     "coalesce": True,
@@ -3,6 +3,8 @@ import argparse
 
 import overrides
 
+from core.bot import config as llm_config
+from core.finance.kis import config as kis_config
 from core.utils import time as time_utils
 
 
@@ -39,6 +41,54 @@ class BasicDBTaskArguments(ArgumentsBase):
         )
 
 
+class CorpInfoTaskArguments(BasicDBTaskArguments):
+    @staticmethod
+    @overrides.override
+    def add_arguments(parser: argparse.ArgumentParser):
+        BasicDBTaskArguments.add_arguments(parser)
+
+        parser.add_argument("--listed-only", action="store_true")
+        parser.add_argument("--full-refresh", action="store_true", help="rewrite rows regardless of modify_date")
+
+
+class QuoteTaskArguments(BasicDBTaskArguments):
+    @staticmethod
+    @overrides.override
+    def add_arguments(parser: argparse.ArgumentParser):
+        BasicDBTaskArguments.add_arguments(parser)
+
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=kis_config.QUOTE_MAX_WORKERS,
+        )
+
+
+class CandidateTaskArguments(BasicDBTaskArguments):
+    @staticmethod
+    @overrides.override
+    def add_arguments(parser: argparse.ArgumentParser):
+        BasicDBTaskArguments.add_arguments(parser)
+
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=30,
+        )
+        parser.add_argument(
+            "--max-in-flight",
+            type=int,
+            default=llm_config.MAX_IN_FLIGHT,
+            help="concurrent LLM calls",
+        )
+        parser.add_argument(
+            "--llm-timeout",
+            type=float,
+            default=llm_config.CALL_TIMEOUT,
+            help="seconds per LLM call",
+        )
+
+
 class BacktestArguments(BasicDBTaskArguments):
     @staticmethod
     @overrides.override
@@ -55,6 +105,7 @@ class BacktestArguments(BasicDBTaskArguments):
             type=int,
             required=True,
         )
+        parser.add_argument("--in-memory", action="store_true", help="run on an in-memory SQLite database")
 
         parser.add_argument("--skip-info", action="store_true")
         parser.add_argument("--skip-quote", action="store_true")
@@ -86,3 +137,63 @@ class PipelineTaskArguments(BasicDBTaskArguments):
 
         parser.add_argument("--skip-info", action="store_true")
         parser.add_argument("--skip-quote", action="store_true")
+
+
+class LoadTestArguments(ArgumentsBase):
+    @staticmethod
+    @overrides.override
+    def add_arguments(parser: argparse.ArgumentParser):
+        parser.add_argument(
+            "--num-candidates",
+            type=int,
+            default=100,
+        )
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=kis_config.QUOTE_MAX_WORKERS,
+        )
+        parser.add_argument(
+            "--trials",
+            type=int,
+            default=3,
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=10,
+            help="seconds to run each upper limit runner",
+        )
+
+
+class ScreeningBenchmarkArguments(ArgumentsBase):
+    @staticmethod
+    @overrides.override
+    def add_arguments(parser: argparse.ArgumentParser):
+        parser.add_argument(
+            "--database",
+            type=str,
+            required=True,
+            help="scratch database, tables are created and dropped",
+        )
+        parser.add_argument(
+            "--num-corps",
+            type=int,
+            default=100000,
+        )
+        parser.add_argument(
+            "--num-quotes",
+            type=int,
+            default=3000,
+        )
+        parser.add_argument(
+            "--num-days",
+            type=int,
+            default=250,
+            help="trading days of candidates kept",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+        )
@@ -0,0 +1,116 @@
+import collections
+import dataclasses
+import threading
+import time
+from urllib import parse
+
+from loguru import logger
+import requests
+from requests import adapters
+from urllib3 import util
+
+# (connect, read) seconds, requests waits forever without one
+_DEFAULT_TIMEOUT = (3.05, 30)
+_POOL_MAXSIZE = 16
+_RETRY_STATUSES = (429, 502, 503, 504)
+
+_SESSIONS: dict[str, "PooledSession"] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+@dataclasses.dataclass
+class HostMetrics:
+    requests: int = 0
+    errors: int = 0
+    connections: int = 0  # connections opened, keep-alive keeps this far below requests
+    elapsed: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.elapsed / self.requests if self.requests else 0.0
+
+
+class PooledSession(requests.Session):
+    """Keep-alive session with connection pooling, default timeouts and retries on connection errors and 429/5xx
+
+    Retry-After of 429 responses is respected. Only idempotent methods are retried once a request may have reached the
+    server, a retried webhook POST would post the message twice.
+    """
+
+    def __init__(
+        self,
+        timeout: tuple[float, float] = _DEFAULT_TIMEOUT,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_maxsize: int = _POOL_MAXSIZE,
+    ):
+        super().__init__()
+        self._timeout = timeout
+        self._adapter = adapters.HTTPAdapter(
+            pool_maxsize=pool_maxsize,
+            max_retries=util.Retry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=_RETRY_STATUSES,
+                allowed_methods=util.Retry.DEFAULT_ALLOWED_METHODS,
+                raise_on_status=False,
+            ),
+        )
+        self.mount("https://", self._adapter)
+        self.mount("http://", self._adapter)
+
+        self._metrics: dict[str, HostMetrics] = collections.defaultdict(HostMetrics)
+        self._metrics_lock = threading.Lock()
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        host = parse.urlsplit(url).netloc
+        started_at = time.perf_counter()
+
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            failed = not response.ok
+            return response
+        except requests.RequestException:
+            failed = True
+            raise
+        finally:
+            with self._metrics_lock:
+                metrics = self._metrics[host]
+                metrics.requests += 1
+                metrics.errors += failed
+                metrics.elapsed += time.perf_counter() - started_at
+
+    def metrics(self) -> dict[str, HostMetrics]:
+        connections = collections.Counter()
+        for key in self._adapter.poolmanager.pools.keys():
+            pool = self._adapter.poolmanager.pools.get(key)
+            if pool is not None:
+                connections[pool.host] += pool.num_connections
+
+        with self._metrics_lock:
+            return {
+                host: dataclasses.replace(m, connections=connections[host.split(":")[0]])
+                for host, m in self._metrics.items()
+            }
+
+
+def get_session(name: str) -> PooledSession:
+    """Process-wide session per client, e.g. "dart" or "discord" """
+    session = _SESSIONS.get(name)
+    if session is not None:
+        return session
+
+    with _SESSIONS_LOCK:
+        if name not in _SESSIONS:
+            _SESSIONS[name] = PooledSession()
+        return _SESSIONS[name]
+
+
+def log_metrics() -> None:
+    for name, session in list(_SESSIONS.items()):
+        for host, m in session.metrics().items():
+            logger.info(
+                f"[{name}] {host}: {m.requests} requests, {m.errors} errors, {m.connections} connections, "
+                f"mean latency {m.mean_latency * 1000:.1f}ms"
+            )
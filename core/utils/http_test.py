@@ -0,0 +1,42 @@
+import requests
+from requests import adapters
+
+from core.utils import http
+
+
+def _ok(adapter: adapters.HTTPAdapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200 if "ok" in request.url else 500
+    response.url = request.url
+    response.request = request
+    return response
+
+
+def test_metrics_per_host(mocker):
+    send = mocker.patch.object(adapters.HTTPAdapter, "send", autospec=True, side_effect=_ok)
+    session = http.PooledSession()
+
+    session.get("https://opendart.fss.or.kr/api/ok.json")
+    session.get("https://opendart.fss.or.kr/api/fail.json")
+    session.post("https://discord.com/api/webhooks/ok")
+
+    metrics = session.metrics()
+    assert metrics["opendart.fss.or.kr"].requests == 2
+    assert metrics["opendart.fss.or.kr"].errors == 1
+    assert metrics["discord.com"].requests == 1
+
+    # default timeouts are applied to every request
+    assert all(call.kwargs["timeout"] == http._DEFAULT_TIMEOUT for call in send.call_args_list)
+
+
+def test_post_is_not_retried_once_sent():
+    retry = http.PooledSession()._adapter.max_retries
+
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("POST", 503)
+    assert not retry._is_method_retryable("POST")
+
+
+def test_sessions_are_shared_by_name():
+    assert http.get_session("dart") is http.get_session("dart")
+    assert http.get_session("dart") is not http.get_session("discord")
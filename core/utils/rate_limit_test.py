@@ -0,0 +1,32 @@
+import time
+
+import pytest
+
+from core.utils import rate_limit
+
+
+def test_token_bucket_try_acquire_until_empty():
+    bucket = rate_limit.TokenBucket(rate=1, capacity=3)
+
+    assert bucket.try_acquire()
+    assert bucket.try_acquire(2)
+    assert not bucket.try_acquire()
+
+
+@pytest.mark.parametrize("rate, num_requests", [(50, 10), (100, 20)])
+def test_token_bucket_acquire_respects_rate(rate: float, num_requests: int):
+    bucket = rate_limit.TokenBucket(rate=rate, capacity=1)
+
+    start = time.monotonic()
+    for _ in range(num_requests):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= (num_requests - 1) / rate * 0.9
+
+
+def test_token_bucket_rejects_oversized_acquire():
+    bucket = rate_limit.TokenBucket(rate=1, capacity=1)
+
+    with pytest.raises(AssertionError):
+        bucket.acquire(2)
@@ -0,0 +1,42 @@
+from concurrent import futures
+import threading
+from typing import Any, Callable, Hashable
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls with the same key, followers wait for the leader's result"""
+
+    def __init__(self):
+        self._calls: dict[Hashable, futures.Future] = {}
+        self._lock = threading.Lock()
+        self._num_shared = 0
+
+    @property
+    def num_shared(self) -> int:
+        """number of calls served by another in-flight call"""
+        return self._num_shared
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+
+            if is_leader:
+                future = futures.Future()
+                self._calls[key] = future
+            else:
+                self._num_shared += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
@@ -0,0 +1,40 @@
+from concurrent import futures
+import threading
+import time
+
+import pytest
+
+from core.utils import singleflight
+
+
+def test_single_flight_shares_concurrent_calls():
+    flight = singleflight.SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch(symbol: str) -> str:
+        calls.append(symbol)
+        release.wait(timeout=5)
+        return f"quote-{symbol}"
+
+    with futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = [executor.submit(flight.do, ("quote", "005930"), fetch, "005930") for _ in range(4)]
+
+        while flight.num_shared < 3:
+            time.sleep(0.001)
+        release.set()
+
+    assert [r.result() for r in results] == ["quote-005930"] * 4
+    assert len(calls) == 1
+
+
+def test_single_flight_propagates_errors_and_forgets_key():
+    flight = singleflight.SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+
+    assert flight.do("key", lambda: "ok") == "ok"
@@ -1,10 +1,12 @@
 import time
 
+from core.cassette import cassette
 from core.scheduler import instance
 from trading import jobs
 
 
 def main():
+    cassette.install()
     instance.DefaultBackgroundScheduler.start()
     jobs.register_jobs()
 
@@ -0,0 +1,72 @@
+"""Create corporate quote history table
+
+Revision ID: 3f6d8b2e7a14
+Revises: 8c3f2a1d9b57
+Create Date: 2026-10-18 21:05:37.284913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6d8b2e7a14"
+down_revision: Union[str, Sequence[str], None] = "8c3f2a1d9b57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "corporate_quote_history",
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("symbol", sa.String(length=6), nullable=False),
+        sa.Column("market", sa.String(length=10), nullable=True),
+        sa.Column("sector_name", sa.String(length=30), nullable=True),
+        sa.Column("price", sa.Float(), nullable=True),
+        sa.Column("volume", sa.BigInteger(), nullable=True),
+        sa.Column("amount", sa.BigInteger(), nullable=True),
+        sa.Column("market_cap", sa.BigInteger(), nullable=True),
+        sa.Column("sign", sa.String(length=10), nullable=True),
+        sa.Column("sign_name", sa.String(length=20), nullable=True),
+        sa.Column("risk", sa.String(length=50), nullable=True),
+        sa.Column("halt", sa.Boolean(), nullable=True),
+        sa.Column("overbought", sa.String(length=50), nullable=True),
+        sa.Column("prev_price", sa.Float(), nullable=True),
+        sa.Column("prev_volume", sa.BigInteger(), nullable=True),
+        sa.Column("change", sa.Float(), nullable=True),
+        sa.Column("rate", sa.Float(), nullable=True),
+        sa.Column("high_limit", sa.Float(), nullable=True),
+        sa.Column("low_limit", sa.Float(), nullable=True),
+        sa.Column("unit", sa.Integer(), nullable=True),
+        sa.Column("tick", sa.Float(), nullable=True),
+        sa.Column("decimal_places", sa.Integer(), nullable=True),
+        sa.Column("currency", sa.String(length=10), nullable=True),
+        sa.Column("exchange_rate", sa.Float(), nullable=True),
+        sa.Column("open_price", sa.Float(), nullable=True),
+        sa.Column("high_price", sa.Float(), nullable=True),
+        sa.Column("low_price", sa.Float(), nullable=True),
+        sa.Column("eps", sa.Float(), nullable=True),
+        sa.Column("bps", sa.Float(), nullable=True),
+        sa.Column("per", sa.Float(), nullable=True),
+        sa.Column("pbr", sa.Float(), nullable=True),
+        sa.Column("week52_high", sa.Float(), nullable=True),
+        sa.Column("week52_low", sa.Float(), nullable=True),
+        sa.Column("week52_high_date", sa.Date(), nullable=True),
+        sa.Column("week52_low_date", sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint("date", "symbol"),
+        # monthly partitions are split off p_future by quote_history.ensure_partitions
+        mysql_partition_by="RANGE COLUMNS(date) (PARTITION p_future VALUES LESS THAN (MAXVALUE))",
+    )
+    op.create_index(
+        "ix_corporate_quote_history_symbol_date", "corporate_quote_history", ["symbol", "date"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_corporate_quote_history_symbol_date", table_name="corporate_quote_history")
+    op.drop_table("corporate_quote_history")
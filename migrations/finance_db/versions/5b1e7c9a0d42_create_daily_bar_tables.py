@@ -0,0 +1,48 @@
+"""Create daily bar tables
+
+Revision ID: 5b1e7c9a0d42
+Revises: 2d4460acacf2
+Create Date: 2026-10-18 10:12:40.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1e7c9a0d42"
+down_revision: Union[str, Sequence[str], None] = "2d4460acacf2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_bar",
+        sa.Column("symbol", sa.String(length=6), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("open_price", sa.Float(), nullable=True),
+        sa.Column("high_price", sa.Float(), nullable=True),
+        sa.Column("low_price", sa.Float(), nullable=True),
+        sa.Column("close_price", sa.Float(), nullable=True),
+        sa.Column("volume", sa.BigInteger(), nullable=True),
+        sa.Column("amount", sa.BigInteger(), nullable=True),
+        sa.Column("change", sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint("symbol", "date"),
+    )
+    op.create_table(
+        "daily_bar_coverage",
+        sa.Column("symbol", sa.String(length=6), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint("symbol"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_bar_coverage")
+    op.drop_table("daily_bar")
@@ -0,0 +1,33 @@
+"""Add screening indexes
+
+Revision ID: 8c3f2a1d9b57
+Revises: 5b1e7c9a0d42
+Create Date: 2026-10-18 19:42:03.512470
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c3f2a1d9b57"
+down_revision: Union[str, Sequence[str], None] = "5b1e7c9a0d42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_corporate_info_stock_code", "corporate_info", ["stock_code"], unique=False)
+    op.create_index(
+        "ix_corporate_quote_screening", "corporate_quote", ["risk", "overbought", "market_cap"], unique=False
+    )
+    op.create_index("ix_corporate_quote_upper_limit", "corporate_quote", ["risk", "halt", "rate"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_corporate_quote_upper_limit", table_name="corporate_quote")
+    op.drop_index("ix_corporate_quote_screening", table_name="corporate_quote")
+    op.drop_index("ix_corporate_info_stock_code", table_name="corporate_info")
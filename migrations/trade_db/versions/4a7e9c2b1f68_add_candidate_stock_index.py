@@ -0,0 +1,32 @@
+"""Add candidate stock index
+
+Revision ID: 4a7e9c2b1f68
+Revises: 13caa98c019e
+Create Date: 2026-10-18 19:42:31.208113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4a7e9c2b1f68"
+down_revision: Union[str, Sequence[str], None] = "13caa98c019e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_candidate_stock_date_scores",
+        "candidate_stock",
+        ["date", "growth_score", "financial_stability_score"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_candidate_stock_date_scores", table_name="candidate_stock")
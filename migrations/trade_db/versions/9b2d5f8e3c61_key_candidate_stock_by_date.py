@@ -0,0 +1,47 @@
+"""Key candidate stock by date and stock code
+
+Revision ID: 9b2d5f8e3c61
+Revises: 4a7e9c2b1f68
+Create Date: 2026-10-18 22:18:09.630417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2d5f8e3c61"
+down_revision: Union[str, Sequence[str], None] = "4a7e9c2b1f68"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # undated rows can't be told apart by day and would fail NOT NULL, no run writes them anymore
+    op.execute("DELETE FROM candidate_stock WHERE date IS NULL")
+    op.alter_column(
+        "candidate_stock",
+        "date",
+        existing_type=mysql.VARCHAR(collation="utf8mb4_unicode_ci", length=10),
+        nullable=False,
+    )
+    op.execute("ALTER TABLE candidate_stock DROP PRIMARY KEY, ADD PRIMARY KEY (date, stock_code)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # only the latest day of each stock fits the stock_code key
+    op.execute(
+        "DELETE older FROM candidate_stock older "
+        "JOIN candidate_stock newer ON older.stock_code = newer.stock_code AND older.date < newer.date"
+    )
+    op.execute("ALTER TABLE candidate_stock DROP PRIMARY KEY, ADD PRIMARY KEY (stock_code)")
+    op.alter_column(
+        "candidate_stock",
+        "date",
+        existing_type=mysql.VARCHAR(collation="utf8mb4_unicode_ci", length=10),
+        nullable=True,
+    )
@@ -1,33 +1,107 @@
 import abc
+import decimal
+import threading
+import time
 
-from pykis.api.account.balance import KisBalance
+import pykis
 
 from core.finance.kis import client as kis_client
 from trading.model import type as model_type
 
+_BALANCE_TTL = 5.0
+
 
 class WalletBase(abc.ABC):
     """Base class for wallet"""
 
 
 class KISWallet(WalletBase):
-    _account = kis_client.get_account()
+    """Wallet serving a short-lived balance snapshot, refreshed after `balance_ttl` seconds or on sell orders
+
+    With `track_deposit`, buy orders are deducted from the deposit locally instead of invalidating the snapshot,
+    while holdings are refetched on their next read so a bought symbol shows up once it is filled.
+    """
+
+    def __init__(self, balance_ttl: float = _BALANCE_TTL, track_deposit: bool = True):
+        self._account = None
+        self._balance_ttl = balance_ttl
+        self._track_deposit = track_deposit
+
+        self._snapshot = None
+        self._snapshot_at = 0.0
+        self._spent: dict[model_type.Currency, decimal.Decimal] = {}
+        self._holdings_dirty = False
+        self._lock = threading.RLock()
 
     @property
-    def balance(self):
-        return self._account.balance()
+    def account(self) -> pykis.KisAccount:
+        if self._account is None:
+            self._account = kis_client.get_account()
+        return self._account
+
+    @property
+    def balance(self) -> pykis.KisBalance:
+        with self._lock:
+            if self._snapshot is None or time.monotonic() - self._snapshot_at > self._balance_ttl:
+                self._refresh()
+
+            return self._snapshot
+
+    def _refresh(self) -> None:
+        self._snapshot = kis_client.get_balance(self.account)
+        self._snapshot_at = time.monotonic()
+        self._spent.clear()
+        self._holdings_dirty = False
 
     @property
     def pending_orders(self):
-        return self._account.pending_orders()
+        return kis_client.get_pending_orders(self.account)
 
     @property
     def holding_stocks(self):
-        stocks = self.balance.stocks
+        with self._lock:
+            if self._holdings_dirty:
+                self._refresh()
+            stocks = self.balance.stocks
         return {s.symbol: s for s in stocks}
 
-    def deposit(self, currency: model_type.Currency) -> KisBalance:
-        return self.balance.deposit(currency.value)
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def deposit_amount(self, currency: model_type.Currency) -> decimal.Decimal:
+        """Deposit of the snapshot minus orders placed since then"""
+        with self._lock:
+            deposit = self.balance.deposit(currency.value)
+            amount = deposit.amount if deposit else decimal.Decimal(0)
+            return amount - self._spent.get(currency, decimal.Decimal(0))
+
+    def buy(
+        self,
+        stock: pykis.KisStock,
+        qty: int,
+        price: float,
+        currency: model_type.Currency = model_type.Currency.KRW,
+    ):
+        order = kis_client.buy(stock=stock, qty=qty, price=price)
+
+        if order is None:
+            return None
+
+        with self._lock:
+            if self._track_deposit and self._snapshot is not None:
+                spent = decimal.Decimal(qty) * decimal.Decimal(str(price))
+                self._spent[currency] = self._spent.get(currency, decimal.Decimal(0)) + spent
+                self._holdings_dirty = True
+            else:
+                self._snapshot = None
+
+        return order
+
+    def sell(self, stock: pykis.KisBalanceStock, qty: int, price: float):
+        order = stock.sell(qty=qty, price=price)
+        self.invalidate()
+        return order
 
 
 _KIS_WALLET = KISWallet()
@@ -0,0 +1,84 @@
+import dataclasses
+import decimal
+
+import pytest_mock
+
+from trading.asset import wallet
+from trading.model import type as model_type
+
+
+@dataclasses.dataclass
+class _Deposit:
+    amount: decimal.Decimal
+
+
+@dataclasses.dataclass
+class _Balance:
+    amount: decimal.Decimal
+    stocks: tuple = ()
+
+    def deposit(self, currency: str) -> _Deposit:
+        return _Deposit(self.amount)
+
+
+def _patch_client(mocker: pytest_mock.MockerFixture, amount: int = 1_000_000):
+    mocker.patch("core.finance.kis.client.get_account", return_value="account")
+    get_balance = mocker.patch(
+        "core.finance.kis.client.get_balance", return_value=_Balance(amount=decimal.Decimal(amount))
+    )
+    mocker.patch("core.finance.kis.client.buy", return_value="order")
+    return get_balance
+
+
+def test_balance_snapshot_is_reused_within_ttl(mocker: pytest_mock.MockerFixture):
+    get_balance = _patch_client(mocker)
+    kis_wallet = wallet.KISWallet(balance_ttl=60)
+
+    kis_wallet.deposit_amount(model_type.Currency.KRW)
+    kis_wallet.deposit_amount(model_type.Currency.KRW)
+    kis_wallet.holding_stocks
+
+    assert get_balance.call_count == 1
+
+
+def test_buy_deducts_deposit_locally(mocker: pytest_mock.MockerFixture):
+    get_balance = _patch_client(mocker)
+    kis_wallet = wallet.KISWallet(balance_ttl=60, track_deposit=True)
+
+    kis_wallet.balance
+    kis_wallet.buy("stock", qty=3, price=10_000)
+
+    assert kis_wallet.deposit_amount(model_type.Currency.KRW) == decimal.Decimal(970_000)
+    assert get_balance.call_count == 1
+
+
+def test_buy_refetches_holdings(mocker: pytest_mock.MockerFixture):
+    get_balance = _patch_client(mocker)
+    kis_wallet = wallet.KISWallet(balance_ttl=60, track_deposit=True)
+
+    kis_wallet.holding_stocks
+    kis_wallet.buy("stock", qty=3, price=10_000)
+    assert kis_wallet.deposit_amount(model_type.Currency.KRW) == decimal.Decimal(970_000)
+
+    bought = mocker.Mock(symbol="005930")
+    get_balance.return_value = _Balance(amount=decimal.Decimal(970_000), stocks=(bought,))
+
+    assert kis_wallet.holding_stocks == {"005930": bought}
+    assert kis_wallet.deposit_amount(model_type.Currency.KRW) == decimal.Decimal(970_000)
+    assert get_balance.call_count == 2
+
+
+def test_orders_invalidate_snapshot(mocker: pytest_mock.MockerFixture):
+    get_balance = _patch_client(mocker)
+    kis_wallet = wallet.KISWallet(balance_ttl=60, track_deposit=False)
+
+    kis_wallet.balance
+    kis_wallet.buy("stock", qty=3, price=10_000)
+    kis_wallet.balance
+
+    sold_stock = mocker.Mock()
+    kis_wallet.sell(sold_stock, qty=1, price=11_000)
+    kis_wallet.balance
+
+    sold_stock.sell.assert_called_once_with(qty=1, price=11_000)
+    assert get_balance.call_count == 3
@@ -3,12 +3,13 @@ import datetime
 import lightweight_charts
 from loguru import logger
 
+from core.cassette import cassette
 from core.db import session
-from core.finance.kis import client as kis_client
 from core.utils import args as args_utils
 from core.utils import indicator as indicator_utils
 from core.utils import time as time_utils
 from trading.database import base
+from trading.database.finance import bar_store
 from trading.database.finance import build_corporate_info
 from trading.database.finance import build_corporate_quote
 from trading.database.trade import build_candidate_stock
@@ -27,7 +28,7 @@ def _teardown(database: str = "test") -> None:
     logger.info("Test database cleaned up")
 
 
-def _visualize(candidate_stock: trade_tables.StockCandidate, date: datetime.date) -> None:
+def _visualize(candidate_stock: trade_tables.StockCandidate, date: datetime.date, database: str) -> None:
     stock_code = candidate_stock.stock_code
     support_price = candidate_stock.support_price
     resistent_price = candidate_stock.resistance_price
@@ -36,9 +37,9 @@ def _visualize(candidate_stock: trade_tables.StockCandidate, date: datetime.date
     end = time_utils.get_months_after(date, 6)
 
     chart_view = lightweight_charts.Chart(width=1280, height=720)
-    chart = kis_client.get_chart(stock_code, start=start, end=end)
+    bars = bar_store.get_bars(stock_code, start=start, end=end, database=database)
 
-    chart_view.set(chart.df())
+    chart_view.set(bar_store.as_dataframe(bars))
 
     chart_view.set_visible_range(start, end)
     fallback_prices = indicator_utils.get_finbonacci_fallback(support_price, resistent_price)
@@ -51,13 +52,17 @@ def _visualize(candidate_stock: trade_tables.StockCandidate, date: datetime.date
     chart_view.show(block=True)
 
 
-def main(database: str, start_date: datetime.date, end_date: datetime.date):
+def main(database: str, start_date: datetime.date, end_date: datetime.date, in_memory: bool = False):
+    if in_memory:
+        session.use_sqlite(database)
+
     logger.info(
         f"Backtest started at {time_utils.DateTimeFormatter.DATETIME_FULL.format(time_utils.now())}"
         f"with following arguments: \n"
         f"\t database: {database}\n"
         f"\t start_date: {start_date}\n"
         f"\t end_date: {end_date}\n"
+        f"\t in_memory: {in_memory}\n"
     )
     try:
         _setup(database=database)
@@ -66,10 +71,14 @@ def main(database: str, start_date: datetime.date, end_date: datetime.date):
         build_candidate_stock.main(read_database=database, write_database=database, date=start_date)
 
         with session.get_database_session(database) as db_session:
-            candidate_stocks = db_session.query(trade_tables.StockCandidate).all()
+            candidate_stocks = (
+                db_session.query(trade_tables.StockCandidate)
+                .filter(trade_tables.StockCandidate.date == start_date.strftime("%Y-%m-%d"))
+                .all()
+            )
 
             for c in candidate_stocks:
-                _visualize(c, date=start_date)
+                _visualize(c, date=start_date, database=database)
 
     except Exception as e:
         logger.error(e)
@@ -79,6 +88,7 @@ def main(database: str, start_date: datetime.date, end_date: datetime.date):
 
 
 if __name__ == "__main__":
+    cassette.install()
     opts = args_utils.BacktestArguments.parse()
 
     database = opts.database
@@ -89,4 +99,5 @@ if __name__ == "__main__":
         database,
         start_date,
         time_utils.get_days_after(start_date, window),
+        in_memory=opts.in_memory,
     )
@@ -0,0 +1,182 @@
+import dataclasses
+import datetime
+
+from loguru import logger
+import pandas as pd
+
+from core.db import session
+from core.db import utils as db_utils
+from core.finance.kis import client as kis_client
+from core.utils import time as time_utils
+from trading.database.finance import tables
+
+# daily bars are final once the closing auction and after-hours single price trading settle
+_SESSION_CLOSE = datetime.time(hour=18)
+_ONE_DAY = datetime.timedelta(days=1)
+
+
+@dataclasses.dataclass(frozen=True)
+class Bar:
+    """Daily bar, attribute compatible with pykis.KisChartBar"""
+
+    time: datetime.datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    amount: int
+    change: float
+
+    @classmethod
+    def from_row(cls, row: tables.DailyBar) -> "Bar":
+        return cls(
+            time=datetime.datetime.combine(row.date, datetime.time(), time_utils.TimeZone.SEOUL.value),
+            open=row.open_price,
+            high=row.high_price,
+            low=row.low_price,
+            close=row.close_price,
+            volume=row.volume,
+            amount=row.amount,
+            change=row.change,
+        )
+
+    @classmethod
+    def from_chart_bar(cls, bar) -> "Bar":
+        return cls(
+            time=bar.time,
+            open=float(bar.open),
+            high=float(bar.high),
+            low=float(bar.low),
+            close=float(bar.close),
+            volume=int(bar.volume),
+            amount=int(bar.amount),
+            change=float(bar.change),
+        )
+
+
+def _as_date(date: datetime.date | datetime.datetime) -> datetime.date:
+    return date.date() if isinstance(date, datetime.datetime) else date
+
+
+def _last_closed_date() -> datetime.date:
+    now = time_utils.now()
+    return now.date() if now.time() >= _SESSION_CLOSE else now.date() - _ONE_DAY
+
+
+def _missing_ranges(
+    coverage: tuple[datetime.date, datetime.date] | None,
+    start: datetime.date,
+    end: datetime.date,
+) -> list[tuple[datetime.date, datetime.date]]:
+    """Ranges to fetch so that coverage stays contiguous after fetching"""
+    if coverage is None:
+        return [(start, end)]
+
+    covered_start, covered_end = coverage
+    ranges = []
+
+    if start < covered_start:
+        ranges.append((start, covered_start - _ONE_DAY))
+    if end > covered_end:
+        ranges.append((covered_end + _ONE_DAY, end))
+
+    return ranges
+
+
+def _fetch_bars(symbol: str, start: datetime.date, end: datetime.date) -> list[Bar] | None:
+    chart = kis_client.get_chart(symbol, start=start, end=end)
+
+    if chart is None:
+        return None
+
+    return [Bar.from_chart_bar(b) for b in chart.bars if start <= b.time.date() <= end]
+
+
+def _backfill(symbol: str, start: datetime.date, end: datetime.date, database: str) -> None:
+    with session.get_database_session(database) as db_session:
+        coverage = db_session.get(tables.DailyBarCoverage, symbol)
+        covered = (coverage.start_date, coverage.end_date) if coverage else None
+
+    missing = _missing_ranges(covered, start, end)
+    if not missing:
+        return
+
+    rows = []
+    for missing_start, missing_end in missing:
+        bars = _fetch_bars(symbol, missing_start, missing_end)
+
+        if bars is None:
+            logger.warning(f"Failed to backfill bars of {symbol} from {missing_start} to {missing_end}")
+            return
+
+        rows.extend(
+            {
+                "symbol": symbol,
+                "date": b.time.date(),
+                "open_price": b.open,
+                "high_price": b.high,
+                "low_price": b.low,
+                "close_price": b.close,
+                "volume": b.volume,
+                "amount": b.amount,
+                "change": b.change,
+            }
+            for b in bars
+        )
+
+    coverage_row = {
+        "symbol": symbol,
+        "start_date": min(start, covered[0]) if covered else start,
+        "end_date": max(end, covered[1]) if covered else end,
+    }
+
+    with session.get_or_create_engine(database).begin() as conn:
+        if rows:
+            conn.execute(db_utils.auto_upsert_stmt(tables.DailyBar, rows, conn.dialect.name))
+        conn.execute(db_utils.auto_upsert_stmt(tables.DailyBarCoverage, [coverage_row], conn.dialect.name))
+
+    logger.debug(f"Backfilled {len(rows)} bars of {symbol} for {missing}")
+
+
+def get_bars(
+    symbol: str,
+    start: datetime.date | datetime.datetime,
+    end: datetime.date | datetime.datetime,
+    database: str = "finance",
+) -> list[Bar]:
+    """Daily bars between start and end inclusive, closed sessions are served from the finance database"""
+    start, end = _as_date(start), _as_date(end)
+    stored_end = min(end, _last_closed_date())
+
+    bars = []
+    if start <= stored_end:
+        _backfill(symbol, start, stored_end, database)
+
+        with session.get_database_session(database) as db_session:
+            rows = (
+                db_session.query(tables.DailyBar)
+                .filter(tables.DailyBar.symbol == symbol)
+                .filter(tables.DailyBar.date.between(start, stored_end))
+                .order_by(tables.DailyBar.date)
+                .all()
+            )
+            bars = [Bar.from_row(row) for row in rows]
+
+    if end > stored_end:
+        bars.extend(_fetch_bars(symbol, max(start, stored_end + _ONE_DAY), end) or [])
+
+    return bars
+
+
+def as_dataframe(bars: list[Bar]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "time": [b.time for b in bars],
+            "open": [b.open for b in bars],
+            "high": [b.high for b in bars],
+            "low": [b.low for b in bars],
+            "close": [b.close for b in bars],
+            "volume": [b.volume for b in bars],
+        }
+    )
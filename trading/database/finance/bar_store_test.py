@@ -0,0 +1,76 @@
+import dataclasses
+import datetime
+
+import pytest
+import pytest_mock
+from sqlalchemy import orm
+
+from trading.database.finance import bar_store
+from trading.database.finance import tables
+
+
+@dataclasses.dataclass
+class _ChartBar:
+    time: datetime.datetime
+    open: float = 100
+    high: float = 110
+    low: float = 90
+    close: float = 105
+    volume: int = 1_000
+    amount: int = 105_000
+    change: float = 5
+
+
+@dataclasses.dataclass
+class _Chart:
+    bars: list[_ChartBar]
+
+
+def _chart(start: datetime.date, end: datetime.date) -> _Chart:
+    days = (end - start).days + 1
+    dates = [start + datetime.timedelta(days=i) for i in range(days)]
+    return _Chart(
+        bars=[_ChartBar(time=datetime.datetime.combine(d, datetime.time())) for d in dates if d.weekday() < 5]
+    )
+
+
+@pytest.mark.parametrize(
+    "coverage, start, end, expected",
+    [
+        (None, "2025-08-01", "2025-08-10", [("2025-08-01", "2025-08-10")]),
+        (("2025-08-01", "2025-08-10"), "2025-08-03", "2025-08-05", []),
+        (("2025-08-01", "2025-08-10"), "2025-07-20", "2025-08-05", [("2025-07-20", "2025-07-31")]),
+        (("2025-08-01", "2025-08-10"), "2025-08-05", "2025-08-15", [("2025-08-11", "2025-08-15")]),
+        (("2025-08-01", "2025-08-10"), "2025-08-20", "2025-08-25", [("2025-08-11", "2025-08-25")]),
+        (
+            ("2025-08-01", "2025-08-10"),
+            "2025-07-30",
+            "2025-08-12",
+            [("2025-07-30", "2025-07-31"), ("2025-08-11", "2025-08-12")],
+        ),
+    ],
+)
+def test_missing_ranges(coverage, start, end, expected):
+    def to_date(d: str) -> datetime.date:
+        return datetime.date.fromisoformat(d)
+
+    covered = (to_date(coverage[0]), to_date(coverage[1])) if coverage else None
+    ranges = bar_store._missing_ranges(covered, to_date(start), to_date(end))
+
+    assert ranges == [(to_date(s), to_date(e)) for s, e in expected]
+
+
+def test_get_bars_only_fetches_missing_days(mocker: pytest_mock.MockerFixture, test_db: orm.Session):
+    get_chart = mocker.patch(
+        "core.finance.kis.client.get_chart",
+        side_effect=lambda symbol, start, end: _chart(start, end),
+    )
+
+    first = bar_store.get_bars("005930", datetime.date(2025, 8, 4), datetime.date(2025, 8, 8), database="test")
+    second = bar_store.get_bars("005930", datetime.date(2025, 8, 4), datetime.date(2025, 8, 15), database="test")
+
+    assert len(first) == 5
+    assert len(second) == 10
+    assert get_chart.call_count == 2
+    assert get_chart.call_args.kwargs == {"start": datetime.date(2025, 8, 9), "end": datetime.date(2025, 8, 15)}
+    assert test_db.query(tables.DailyBar).count() == 10
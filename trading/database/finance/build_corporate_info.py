@@ -1,4 +1,8 @@
+import dataclasses
+from typing import Iterator
+
 from loguru import logger
+import sqlalchemy
 
 from core.db import session
 from core.db import utils as db_utils
@@ -9,19 +13,58 @@ from core.utils import time as time_utils
 from trading.database.finance import tables
 
 
+@dataclasses.dataclass
+class BuildCounts:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+
+def _load_modify_dates(conn: sqlalchemy.Connection) -> dict[str, str]:
+    stmt = sqlalchemy.select(tables.CorporateInfo.corp_code, tables.CorporateInfo.modify_date)
+    return dict(conn.execute(stmt).all())
+
+
+def _changed_rows(modify_dates: dict[str, str], counts: BuildCounts, listed_only: bool) -> Iterator[dict]:
+    for corp_infos in dart_request.iter_corp_row_batches(listed_only=listed_only):
+        for corp_info in corp_infos:
+            stored_modify_date = modify_dates.get(corp_info["corp_code"])
+
+            if stored_modify_date is None:
+                counts.inserted += 1
+            elif stored_modify_date != corp_info["modify_date"]:
+                counts.updated += 1
+            else:
+                counts.unchanged += 1
+                continue
+            yield corp_info
+
+
 @time_utils.timeit
 @discord_utils.monitor
-def main(database: str = "finance"):
-    corp_infos = [item.model_dump() for item in dart_request.get_corp_item_lists()]
+def main(database: str = "finance", listed_only: bool = False, incremental: bool = True) -> BuildCounts:
+    """Upserts corp infos, only new corps and corps with a newer modify_date are written when incremental"""
+    counts = BuildCounts()
 
     db_engine = session.get_or_create_engine(database)
-    with db_engine.begin() as conn:
-        upsert_stmt = db_utils.auto_upsert_stmt(tables.CorporateInfo, corp_infos)
-        conn.execute(upsert_stmt)
+    with db_engine.connect() as conn:
+        modify_dates = _load_modify_dates(conn) if incremental else {}
+
+    # chunks are upserted while the rest of CORPCODE.xml is still being parsed
+    db_utils.bulk_upsert(
+        db_engine,
+        tables.CorporateInfo,
+        _changed_rows(modify_dates, counts, listed_only),
+        commit_per_chunk=True,
+    )
 
-    logger.info(f"Upserted {len(corp_infos)} items to {database}.{tables.CorporateInfo.__tablename__}")
+    logger.info(
+        f"Upserted {counts.inserted + counts.updated} items to {database}.{tables.CorporateInfo.__tablename__}, "
+        f"{counts.inserted} inserted, {counts.updated} updated, {counts.unchanged} unchanged"
+    )
+    return counts
 
 
 if __name__ == "__main__":
-    task_args = args_utils.BasicDBTaskArguments().parse()
-    main(task_args.database)
+    task_args = args_utils.CorpInfoTaskArguments().parse()
+    main(task_args.database, listed_only=task_args.listed_only, incremental=not task_args.full_refresh)
@@ -28,7 +28,10 @@ def test_corporate_info(
     mocker: pytest_mock.MockerFixture,
     test_db: orm.Session,
 ):
-    mocker.patch("core.finance.dart.request.get_corp_item_lists", return_value=_TEST_CORPORATE_INFO)
+    mocker.patch(
+        "core.finance.dart.request.iter_corp_row_batches",
+        return_value=[[item.model_dump() for item in _TEST_CORPORATE_INFO]],
+    )
 
     build_corporate_info.main()
 
@@ -43,3 +46,24 @@ def test_corporate_info(
         assert elem.corp_eng_name == _TEST_CORPORATE_INFO[i].corp_eng_name
         assert elem.stock_code == _TEST_CORPORATE_INFO[i].stock_code
         assert elem.modify_date == _TEST_CORPORATE_INFO[i].modify_date
+
+
+def test_corporate_info_incremental(
+    mocker: pytest_mock.MockerFixture,
+    test_db: orm.Session,
+):
+    rows = [item.model_dump() for item in _TEST_CORPORATE_INFO]
+    iter_mock = mocker.patch("core.finance.dart.request.iter_corp_row_batches", return_value=[rows])
+
+    assert build_corporate_info.main() == build_corporate_info.BuildCounts(inserted=2)
+
+    iter_mock.return_value = [
+        [
+            rows[0],
+            {**rows[1], "corp_name": "test_corp_2_renamed", "modify_date": "20250901"},
+            {**rows[0], "corp_code": "222222", "stock_code": None},
+        ]
+    ]
+
+    assert build_corporate_info.main() == build_corporate_info.BuildCounts(inserted=1, updated=1, unchanged=1)
+    assert test_db.get(tables.CorporateInfo, "111111").corp_name == "test_corp_2_renamed"
@@ -1,82 +1,156 @@
+import statistics
+import time
+from typing import Iterator
+
 from loguru import logger
+import pykis
 import tqdm
 
 from core.db import session
 from core.db import utils as db_utils
 from core.discord import utils as discord_utils
 from core.finance.kis import client as kis_client
+from core.finance.kis import config as kis_config
 from core.utils import args as args_utils
 from core.utils import time as time_utils
+from trading.database.finance import quote_history
 from trading.database.finance import tables
 
+_UPSERT_CHUNK_SIZE = 500
+
+
+def _as_quote_data(quote: pykis.KisQuote) -> dict:
+    return {
+        "symbol": quote.symbol,
+        "market": quote.market,
+        "sector_name": quote.sector_name,
+        "price": quote.price,
+        "volume": quote.volume,
+        "amount": quote.amount,
+        "market_cap": quote.market_cap,
+        "sign": quote.sign,
+        "sign_name": quote.sign_name,
+        "risk": quote.risk,
+        "halt": quote.halt,
+        "overbought": quote.overbought,
+        "prev_price": quote.prev_price,
+        "prev_volume": quote.prev_volume,
+        "change": quote.change,
+        "rate": quote.rate,
+        "high_limit": quote.high_limit,
+        "low_limit": quote.low_limit,
+        "unit": quote.unit,
+        "tick": quote.tick,
+        "decimal_places": quote.decimal_places,
+        "currency": quote.currency,
+        "exchange_rate": quote.exchange_rate,
+        "open_price": quote.open,
+        "high_price": quote.high,
+        "low_price": quote.low,
+        "eps": quote.indicator.eps if quote.indicator else None,
+        "bps": quote.indicator.bps if quote.indicator else None,
+        "per": quote.indicator.per if quote.indicator else None,
+        "pbr": quote.indicator.pbr if quote.indicator else None,
+        "week52_high": quote.indicator.week52_high if quote.indicator else None,
+        "week52_low": quote.indicator.week52_low if quote.indicator else None,
+        "week52_high_date": quote.indicator.week52_high_date
+        if quote.indicator and quote.indicator.week52_high_date
+        else None,
+        "week52_low_date": quote.indicator.week52_low_date
+        if quote.indicator and quote.indicator.week52_low_date
+        else None,
+    }
+
+
+def _quote_rows(
+    symbols: list[str],
+    max_workers: int,
+    latencies: list[float],
+    missing_symbols: list[str],
+    failed_symbols: list[str],
+) -> Iterator[dict]:
+    """Quote rows of symbols in completion order, latencies and missing or failed symbols are appended as it goes"""
+    for result in tqdm.tqdm(
+        kis_client.iter_quotes(symbols, max_workers=max_workers), total=len(symbols), desc="Getting quote data..."
+    ):
+        latencies.append(result.latency)
+
+        if result.error is not None:
+            failed_symbols.append(result.symbol)
+        elif result.quote is None:
+            missing_symbols.append(result.symbol)
+        else:
+            yield _as_quote_data(result.quote)
+
+
+def _log_summary(num_requested: int, num_missing: int, num_failed: int, latencies: list[float], elapsed: float) -> None:
+    num_completed = num_requested - num_missing - num_failed
+    throughput = num_requested / elapsed if elapsed > 0 else 0.0
+
+    logger.info(
+        f"Quote collection finished in {elapsed:.1f}s: {num_completed}/{num_requested} completed, "
+        f"{num_missing} missing, {num_failed} failed, {throughput:.2f} quotes/s"
+    )
+
+    if len(latencies) >= 2:
+        percentiles = statistics.quantiles(latencies, n=100)
+        logger.info(
+            f"Quote latency p50: {percentiles[49]:.3f}s, p95: {percentiles[94]:.3f}s, max: {max(latencies):.3f}s"
+        )
+
 
 @time_utils.timeit
 @discord_utils.monitor
-def main(database: str = "finance", top_k: int = -1):
-    corp_quotes = []
+def main(
+    database: str = "finance",
+    top_k: int = -1,
+    max_workers: int = kis_config.QUOTE_MAX_WORKERS,
+    upsert_chunk_size: int = _UPSERT_CHUNK_SIZE,
+    record_history: bool = True,
+):
     with session.get_database_session(database) as db_session:
         corps_with_stock_codes = db_session.query(tables.CorporateInfo).filter(tables.CorporateInfo.stock_code).all()
+        symbols = [corp.stock_code for corp in corps_with_stock_codes]
+
+    logger.info(f"Getting quotes for the number of {len(symbols)} companies")
+
+    if top_k == -1:
+        top_k = len(symbols)
+    symbols = symbols[:top_k]
+
+    engine = session.get_or_create_engine(database)
+    snapshot_date = time_utils.now().date()
+    if record_history:
+        quote_history.ensure_partitions(engine, snapshot_date)
+
+    latencies = []
+    missing_symbols = []
+    failed_symbols = []
+    # re-runs on the same day replace that day's snapshot
+    derived = (
+        {tables.CorporateQuoteHistory: lambda chunk: quote_history.history_rows(chunk, snapshot_date)}
+        if record_history
+        else None
+    )
+
+    # quotes are written chunk by chunk while the following ones are still being fetched, each chunk is committed along
+    # with its history rows so that no transaction stays open across the KIS requests
+    start = time.perf_counter()
+    stats = db_utils.bulk_upsert(
+        engine,
+        tables.CorporateQuote,
+        _quote_rows(symbols, max_workers, latencies, missing_symbols, failed_symbols),
+        chunk_size=upsert_chunk_size,
+        commit_per_chunk=True,
+        derived=derived,
+    )
+    _log_summary(len(symbols), len(missing_symbols), len(failed_symbols), latencies, time.perf_counter() - start)
+    if failed_symbols:
+        logger.warning(f"Failed to get quotes of {len(failed_symbols)} symbols, e.g. {failed_symbols[:10]}")
 
-        logger.info(f"Getting quotes for the number of {len(corps_with_stock_codes)} companies")
-
-        if top_k == -1:
-            top_k = len(corps_with_stock_codes)
-
-        for corp in tqdm.tqdm(corps_with_stock_codes[:top_k], desc="Getting quote data..."):
-            quote = kis_client.get_quote(corp.stock_code)
-
-            if not quote:
-                continue
-
-            quote_data = {
-                "symbol": quote.symbol,
-                "market": quote.market,
-                "sector_name": quote.sector_name,
-                "price": quote.price,
-                "volume": quote.volume,
-                "amount": quote.amount,
-                "market_cap": quote.market_cap,
-                "sign": quote.sign,
-                "sign_name": quote.sign_name,
-                "risk": quote.risk,
-                "halt": quote.halt,
-                "overbought": quote.overbought,
-                "prev_price": quote.prev_price,
-                "prev_volume": quote.prev_volume,
-                "change": quote.change,
-                "rate": quote.rate,
-                "high_limit": quote.high_limit,
-                "low_limit": quote.low_limit,
-                "unit": quote.unit,
-                "tick": quote.tick,
-                "decimal_places": quote.decimal_places,
-                "currency": quote.currency,
-                "exchange_rate": quote.exchange_rate,
-                "open_price": quote.open,
-                "high_price": quote.high,
-                "low_price": quote.low,
-                "eps": quote.indicator.eps if quote.indicator else None,
-                "bps": quote.indicator.bps if quote.indicator else None,
-                "per": quote.indicator.per if quote.indicator else None,
-                "pbr": quote.indicator.pbr if quote.indicator else None,
-                "week52_high": quote.indicator.week52_high if quote.indicator else None,
-                "week52_low": quote.indicator.week52_low if quote.indicator else None,
-                "week52_high_date": quote.indicator.week52_high_date
-                if quote.indicator and quote.indicator.week52_high_date
-                else None,
-                "week52_low_date": quote.indicator.week52_low_date
-                if quote.indicator and quote.indicator.week52_low_date
-                else None,
-            }
-            corp_quotes.append(quote_data)
-
-    with session.get_or_create_engine(database).begin() as conn:
-        upsert_stmt = db_utils.auto_upsert_stmt(tables.CorporateQuote, corp_quotes)
-        conn.execute(upsert_stmt)
-
-    logger.info(f"Upserted {len(corp_quotes)} items to {database}.{tables.CorporateQuote.__tablename__}")
+    logger.info(f"Upserted {stats.rows} items to {database}.{tables.CorporateQuote.__tablename__}")
 
 
 if __name__ == "__main__":
-    task_args = args_utils.BasicDBTaskArguments().parse()
-    main(task_args.database)
+    task_args = args_utils.QuoteTaskArguments().parse()
+    main(task_args.database, max_workers=task_args.max_workers)
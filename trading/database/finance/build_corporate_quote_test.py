@@ -29,7 +29,10 @@ def test_build_corporate_info(
     mocker: pytest_mock.MockerFixture,
     test_db: orm.Session,
 ):
-    mocker.patch("core.finance.dart.request.get_corp_item_lists", return_value=_TEST_CORPORATE_INFO)
+    mocker.patch(
+        "core.finance.dart.request.iter_corp_row_batches",
+        return_value=[[item.model_dump() for item in _TEST_CORPORATE_INFO]],
+    )
 
     build_corporate_info.main()
 
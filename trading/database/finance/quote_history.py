@@ -0,0 +1,138 @@
+import datetime
+
+from loguru import logger
+import sqlalchemy
+from sqlalchemy import func
+from sqlalchemy import orm
+
+from trading.database.finance import tables
+
+# snapshots older than this are not considered current as of a date, e.g. halted or delisted symbols
+_LOOKBACK = datetime.timedelta(days=14)
+_MONTHS_AHEAD = 1
+
+
+def _month_start(date: datetime.date) -> datetime.date:
+    return date.replace(day=1)
+
+
+def _next_month(date: datetime.date) -> datetime.date:
+    return (date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def _partitions_to_add(last_bound: datetime.date | None, until: datetime.date) -> list[tuple[str, datetime.date]]:
+    """Monthly (name, exclusive upper bound) partitions past last_bound covering until
+
+    Range partitions can only be appended above the highest bound, the first partition also holds everything before.
+    """
+    month = last_bound if last_bound is not None else _month_start(until)
+    partitions = []
+
+    while month <= until:
+        partitions.append((f"p{month:%Y%m}", _next_month(month)))
+        month = _next_month(month)
+
+    return partitions
+
+
+def _last_bound(conn: sqlalchemy.Connection, table_name: str) -> tuple[bool, datetime.date | None]:
+    rows = conn.execute(
+        sqlalchemy.text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+        ),
+        {"table_name": table_name},
+    ).all()
+
+    if not rows or rows[0][0] is None:
+        return False, None
+
+    bounds = [
+        datetime.date.fromisoformat(description.strip("'"))
+        for name, description in rows
+        if name != tables.FUTURE_PARTITION
+    ]
+    return True, max(bounds, default=None)
+
+
+def ensure_partitions(engine: sqlalchemy.Engine, date: datetime.date, months_ahead: int = _MONTHS_AHEAD) -> None:
+    """Splits monthly partitions off the catch-all partition up to `months_ahead` months past date
+
+    Called before every write so the catch-all partition stays empty and splitting it never copies rows.
+    """
+    if engine.dialect.name != "mysql":
+        return
+
+    table_name = tables.CorporateQuoteHistory.__tablename__
+    until = _month_start(date)
+    for _ in range(months_ahead):
+        until = _next_month(until)
+
+    with engine.begin() as conn:
+        partitioned, last_bound = _last_bound(conn, table_name)
+        if not partitioned:
+            logger.warning(f"{table_name} is not partitioned, skipping partition maintenance")
+            return
+
+        partitions = _partitions_to_add(last_bound, until)
+        if not partitions:
+            return
+
+        definitions = ", ".join(f"PARTITION {name} VALUES LESS THAN ('{bound}')" for name, bound in partitions)
+        conn.execute(
+            sqlalchemy.text(
+                f"ALTER TABLE {table_name} REORGANIZE PARTITION {tables.FUTURE_PARTITION} INTO "
+                f"({definitions}, PARTITION {tables.FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE))"
+            )
+        )
+
+    logger.info(f"Added partitions {[name for name, _ in partitions]} to {table_name}")
+
+
+def history_rows(rows: list[dict], date: datetime.date) -> list[dict]:
+    """corporate_quote rows dated for corporate_quote_history"""
+    return [{**row, "date": date} for row in rows]
+
+
+def get_quotes_as_of(
+    db_session: orm.Session,
+    date: datetime.date,
+    symbols: list[str] | None = None,
+    lookback: datetime.timedelta = _LOOKBACK,
+) -> list[tables.CorporateQuoteHistory]:
+    """Latest snapshot per symbol taken on or before date, only the partitions within lookback are read"""
+    history = tables.CorporateQuoteHistory
+
+    latest = (
+        db_session.query(history.symbol, func.max(history.date).label("date"))
+        .filter(history.date.between(date - lookback, date))
+        .group_by(history.symbol)
+    )
+    if symbols is not None:
+        latest = latest.filter(history.symbol.in_(symbols))
+    latest = latest.subquery()
+
+    return (
+        db_session.query(history)
+        .join(latest, (history.symbol == latest.c.symbol) & (history.date == latest.c.date))
+        .order_by(history.symbol)
+        .all()
+    )
+
+
+def get_quote_history(
+    db_session: orm.Session,
+    symbol: str,
+    start: datetime.date,
+    end: datetime.date,
+) -> list[tables.CorporateQuoteHistory]:
+    """Snapshots of symbol between start and end inclusive in date order"""
+    history = tables.CorporateQuoteHistory
+
+    return (
+        db_session.query(history)
+        .filter(history.symbol == symbol)
+        .filter(history.date.between(start, end))
+        .order_by(history.date)
+        .all()
+    )
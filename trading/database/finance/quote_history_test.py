@@ -0,0 +1,53 @@
+import datetime
+
+from sqlalchemy import orm
+
+from trading.database.finance import quote_history
+from trading.database.finance import tables
+
+
+def test_partitions_to_add():
+    assert quote_history._partitions_to_add(None, datetime.date(2026, 11, 1)) == [
+        ("p202611", datetime.date(2026, 12, 1)),
+    ]
+    assert quote_history._partitions_to_add(datetime.date(2026, 11, 1), datetime.date(2027, 1, 1)) == [
+        ("p202611", datetime.date(2026, 12, 1)),
+        ("p202612", datetime.date(2027, 1, 1)),
+        ("p202701", datetime.date(2027, 2, 1)),
+    ]
+    # already split up to until
+    assert quote_history._partitions_to_add(datetime.date(2027, 2, 1), datetime.date(2027, 1, 1)) == []
+
+
+def test_get_quotes_as_of(sqlite_db: orm.Session):
+    sqlite_db.add_all(
+        [
+            tables.CorporateQuoteHistory(date=datetime.date(2026, 10, 1), symbol="000000", price=100),
+            tables.CorporateQuoteHistory(date=datetime.date(2026, 10, 2), symbol="000000", price=110),
+            tables.CorporateQuoteHistory(date=datetime.date(2026, 10, 5), symbol="000000", price=120),
+            tables.CorporateQuoteHistory(date=datetime.date(2026, 10, 1), symbol="111111", price=200),
+            tables.CorporateQuoteHistory(date=datetime.date(2026, 9, 1), symbol="222222", price=300),
+        ]
+    )
+    sqlite_db.commit()
+
+    quotes = quote_history.get_quotes_as_of(sqlite_db, datetime.date(2026, 10, 3))
+    assert [(q.symbol, q.date, q.price) for q in quotes] == [
+        ("000000", datetime.date(2026, 10, 2), 110),
+        ("111111", datetime.date(2026, 10, 1), 200),
+    ]
+
+    quotes = quote_history.get_quotes_as_of(sqlite_db, datetime.date(2026, 10, 10), symbols=["000000"])
+    assert [(q.symbol, q.price) for q in quotes] == [("000000", 120)]
+
+    # beyond the default lookback of 14 days nothing is current, a wider lookback reaches back to the last snapshot
+    assert quote_history.get_quotes_as_of(sqlite_db, datetime.date(2026, 10, 31)) == []
+    quotes = quote_history.get_quotes_as_of(
+        sqlite_db, datetime.date(2026, 10, 31), symbols=["000000"], lookback=datetime.timedelta(days=30)
+    )
+    assert [(q.symbol, q.date, q.price) for q in quotes] == [("000000", datetime.date(2026, 10, 5), 120)]
+
+    history = quote_history.get_quote_history(
+        sqlite_db, "000000", datetime.date(2026, 10, 2), datetime.date(2026, 10, 31)
+    )
+    assert [q.price for q in history] == [110, 120]
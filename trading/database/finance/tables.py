@@ -3,6 +3,7 @@ from sqlalchemy import Boolean
 from sqlalchemy import Column
 from sqlalchemy import Date
 from sqlalchemy import Float
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 
@@ -10,10 +11,17 @@ from trading.database import base
 
 _DATABASE: str = "finance"
 
+# catch-all partition of the dated tables, always kept empty by splitting it ahead of time
+FUTURE_PARTITION: str = "p_future"
+
 
 class CorporateInfo(base.Base):
     __tablename__ = "corporate_info"
     __bind_key__ = _DATABASE
+    __table_args__ = (
+        # joined on from corporate_quote.symbol when screening candidates
+        Index("ix_corporate_info_stock_code", "stock_code"),
+    )
 
     corp_code = Column(String(8), primary_key=True)
     corp_name = Column(String(150))
@@ -22,11 +30,9 @@ class CorporateInfo(base.Base):
     modify_date = Column(String(8))
 
 
-class CorporateQuote(base.Base):
-    __tablename__ = "corporate_quote"
-    __bind_key__ = _DATABASE
+class _QuoteColumns:
+    """Columns of a quote snapshot shared by the current and the dated tables"""
 
-    symbol = Column(String(6), primary_key=True)
     market = Column(String(10))
     sector_name = Column(String(30))
 
@@ -90,3 +96,61 @@ class CorporateQuote(base.Base):
             f"52-Week Low: {self.week52_low} (on {self.week52_low_date})",
         ]
         return "\n".join(summary_lines)
+
+
+class CorporateQuote(_QuoteColumns, base.Base):
+    __tablename__ = "corporate_quote"
+    __bind_key__ = _DATABASE
+    __table_args__ = (
+        # candidate screening, equality filters first so that market_cap serves both the range and the ordering
+        Index("ix_corporate_quote_screening", "risk", "overbought", "market_cap"),
+        # upper limit runner
+        Index("ix_corporate_quote_upper_limit", "risk", "halt", "rate"),
+    )
+
+    symbol = Column(String(6), primary_key=True)
+
+
+class CorporateQuoteHistory(_QuoteColumns, base.Base):
+    """Quote snapshot per day, build_corporate_quote appends one row per symbol next to the current snapshot
+
+    Range partitioned by month on MySQL, quote_history.ensure_partitions splits the catch-all partition ahead of writes.
+    """
+
+    __tablename__ = "corporate_quote_history"
+    __bind_key__ = _DATABASE
+    __table_args__ = (
+        # latest snapshot per symbol as of a date
+        Index("ix_corporate_quote_history_symbol_date", "symbol", "date"),
+        {"mysql_partition_by": f"RANGE COLUMNS(date) (PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE))"},
+    )
+
+    date = Column(Date, primary_key=True)
+    symbol = Column(String(6), primary_key=True)
+
+
+class DailyBar(base.Base):
+    __tablename__ = "daily_bar"
+    __bind_key__ = _DATABASE
+
+    symbol = Column(String(6), primary_key=True)
+    date = Column(Date, primary_key=True)
+
+    open_price = Column(Float)
+    high_price = Column(Float)
+    low_price = Column(Float)
+    close_price = Column(Float)
+    volume = Column(BigInteger)
+    amount = Column(BigInteger)
+    change = Column(Float)
+
+
+class DailyBarCoverage(base.Base):
+    """Contiguous date range of daily bars already fetched per symbol, including non-trading days"""
+
+    __tablename__ = "daily_bar_coverage"
+    __bind_key__ = _DATABASE
+
+    symbol = Column(String(6), primary_key=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
@@ -4,6 +4,7 @@ import argparse
 
 from loguru import logger
 
+from core.cassette import cassette
 from core.utils import args as args_utils
 from core.utils import time as time_utils
 from trading.database.finance import build_corporate_info
@@ -31,5 +32,6 @@ def main(opts: argparse.Namespace):
 
 
 if __name__ == "__main__":
+    cassette.install()
     opts = args_utils.PipelineTaskArguments.parse()
     main(opts)
@@ -0,0 +1,220 @@
+"""Latency and query plans of the screening queries with and without their indexes
+
+Seeds corporate_info, corporate_quote and candidate_stock of a realistic size in a scratch MySQL database, e.g.
+
+    python -m trading.database.screening_benchmark --database benchmark --num-corps 100000 --num-days 250
+
+Plans are read from EXPLAIN on MySQL and EXPLAIN QUERY PLAN on SQLite, other dialects are timed only.
+"""
+
+import argparse
+import datetime
+import random
+import statistics
+import time
+from typing import Callable, Iterator
+
+from loguru import logger
+import sqlalchemy
+from sqlalchemy import orm
+
+from core.db import session as db_session_utils
+from core.db import utils as db_utils
+from core.utils import args as args_utils
+from core.utils import time as time_utils
+from trading.database.finance import tables as data_tables
+from trading.database.trade import build_candidate_stock
+from trading.database.trade import tables as trade_tables
+from trading.runners.stock import krx_periodic
+from trading.runners.stock import krx_upper
+
+_TABLES = [
+    data_tables.CorporateInfo.__table__,
+    data_tables.CorporateQuote.__table__,
+    trade_tables.StockCandidate.__table__,
+]
+_CANDIDATES_PER_DAY = 20
+_SCORES = range(1, 11)
+_VALUATIONS = ["Undervalued", "Fairly valued", "Overvalued"]
+_SIGNALS = [
+    "Golden Cross Occured",
+    "Entering Oversold Territory",
+    "Range Bound Movement",
+    "Approaching Key Support",
+    "Dead Cross Occured",
+    "Breaking Resistance",
+]
+
+
+def _stock_code(i: int) -> str:
+    return f"{i:06d}"
+
+
+def _corp_rows(num_corps: int, num_quotes: int) -> Iterator[dict]:
+    # most of DART is unlisted, those corps come without a stock code
+    for i in range(num_corps):
+        yield dict(
+            corp_code=f"{i:08d}",
+            corp_name=f"corp {i}",
+            corp_eng_name=f"Corp {i}",
+            stock_code=_stock_code(i) if i < num_quotes else " ",
+            modify_date="20240101",
+        )
+
+
+def _quote_rows(num_quotes: int, rng: random.Random) -> Iterator[dict]:
+    for i in range(num_quotes):
+        price = rng.uniform(1000, 500000)
+        eps = rng.uniform(-5000, 20000)
+        bps = rng.uniform(1000, 100000)
+        rate = 29.98 if rng.random() < 0.005 else rng.gauss(0, 3)
+
+        yield dict(
+            symbol=_stock_code(i),
+            market="KOSPI" if i % 3 == 0 else "KOSDAQ",
+            price=price,
+            market_cap=int(rng.lognormvariate(7, 1.5)),
+            risk=rng.choices(["none", "caution", "warning", "danger"], weights=[90, 6, 3, 1])[0],
+            halt=rng.random() < 0.01,
+            overbought=rng.choices(["0", "1"], weights=[97, 3])[0],
+            rate=rate,
+            eps=eps,
+            bps=bps,
+            per=price / eps if eps else None,
+            pbr=price / bps,
+        )
+
+
+def _candidate_rows(num_days: int, num_quotes: int, rng: random.Random) -> Iterator[dict]:
+    today = time_utils.now().date()
+
+    for d in range(num_days):
+        date = (today - datetime.timedelta(days=d)).strftime("%Y-%m-%d")
+        for i in rng.sample(range(num_quotes), min(_CANDIDATES_PER_DAY, num_quotes)):
+            yield dict(
+                stock_code=_stock_code(i),
+                corp_code=f"{i:08d}",
+                corp_name=f"corp {i}",
+                financial_stability_score=rng.choice(_SCORES),
+                growth_score=rng.choice(_SCORES),
+                valuation_attractiveness=rng.choice(_VALUATIONS),
+                support_price=rng.randint(1000, 100000),
+                resistance_price=rng.randint(100000, 500000),
+                technical_signal=rng.choice(_SIGNALS),
+                date=date,
+            )
+
+
+def _analyze(conn: sqlalchemy.Connection, table_name: str) -> None:
+    if conn.dialect.name == "mysql":
+        conn.execute(sqlalchemy.text(f"ANALYZE TABLE {table_name}"))
+    elif conn.dialect.name == "sqlite":
+        conn.execute(sqlalchemy.text(f"ANALYZE {table_name}"))
+
+
+def _seed(engine: sqlalchemy.Engine, opts: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    db_utils.bulk_upsert(engine, data_tables.CorporateInfo, _corp_rows(opts.num_corps, opts.num_quotes))
+    db_utils.bulk_upsert(engine, data_tables.CorporateQuote, _quote_rows(opts.num_quotes, rng))
+    db_utils.bulk_upsert(engine, trade_tables.StockCandidate, _candidate_rows(opts.num_days, opts.num_quotes, rng))
+
+    counts = {}
+    with engine.begin() as conn:
+        for table in _TABLES:
+            _analyze(conn, table.name)
+            counts[table.name] = conn.execute(
+                sqlalchemy.select(sqlalchemy.func.count()).select_from(table)
+            ).scalar_one()
+            logger.info(f"Seeded {counts[table.name]} rows in {table.name}")
+
+    # upserts collapse rows sharing a key, candidates are expected to be unique per (date, stock_code)
+    expected = opts.num_days * min(_CANDIDATES_PER_DAY, opts.num_quotes)
+    if counts[trade_tables.StockCandidate.__tablename__] != expected:
+        logger.warning(
+            f"Expected {expected} candidate rows but seeded {counts[trade_tables.StockCandidate.__tablename__]}"
+        )
+
+
+def _queries() -> dict[str, Callable[[orm.Session], orm.Query]]:
+    today = time_utils.now().strftime("%Y-%m-%d")
+    holdings = [_stock_code(i) for i in range(5)]
+
+    return {
+        "candidate screening": build_candidate_stock._screening_query,
+        "upper limit": krx_upper._upper_limit_query,
+        "periodic candidates": lambda s: krx_periodic._candidate_query(s, today, holdings),
+    }
+
+
+def _explain(session: orm.Session, query: orm.Query) -> list[str]:
+    """Plan lines of query, empty on dialects other than MySQL and SQLite"""
+    dialect = session.bind.dialect
+    statement = query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+
+    if dialect.name == "mysql":
+        return [
+            f"table={row['table']} type={row['type']} key={row['key']} rows={row['rows']} extra={row['Extra']}"
+            for row in (r._mapping for r in session.execute(sqlalchemy.text(f"EXPLAIN {statement}")))
+        ]
+    if dialect.name == "sqlite":
+        return [row.detail for row in session.execute(sqlalchemy.text(f"EXPLAIN QUERY PLAN {statement}"))]
+    return []
+
+
+def _measure(engine: sqlalchemy.Engine, repeat: int) -> dict[str, float]:
+    latencies = {}
+
+    with orm.Session(bind=engine) as session:
+        for name, make_query in _queries().items():
+            query = make_query(session)
+            for line in _explain(session, query):
+                logger.info(f"[{name}] {line}")
+
+            query.all()  # warm up the buffer pool
+            elapsed = []
+            for _ in range(repeat):
+                started_at = time.perf_counter()
+                query.all()
+                elapsed.append(time.perf_counter() - started_at)
+            latencies[name] = statistics.median(elapsed)
+
+    return latencies
+
+
+def main(opts: argparse.Namespace):
+    engine = db_session_utils.get_or_create_engine(opts.database)
+    indexes = [index for table in _TABLES for index in table.indexes]
+
+    with engine.begin() as conn:
+        for table in _TABLES:
+            table.create(conn)
+        for index in indexes:
+            index.drop(conn)
+
+    try:
+        _seed(engine, opts)
+
+        logger.info("Without screening indexes")
+        before = _measure(engine, opts.repeat)
+
+        with engine.begin() as conn:
+            for index in indexes:
+                index.create(conn)
+
+        logger.info("With screening indexes")
+        after = _measure(engine, opts.repeat)
+
+        for name in before:
+            logger.info(
+                f"[{name}] median {before[name] * 1000:.2f}ms -> {after[name] * 1000:.2f}ms, "
+                f"{before[name] / after[name]:.1f}x"
+            )
+    finally:
+        with engine.begin() as conn:
+            for table in _TABLES:
+                table.drop(conn)
+
+
+if __name__ == "__main__":
+    opts = args_utils.ScreeningBenchmarkArguments.parse()
+    main(opts)
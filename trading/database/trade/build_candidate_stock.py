@@ -1,16 +1,21 @@
+import datetime
 import json
 import re
 import time
 
 from loguru import logger
 import pandas as pd
+from sqlalchemy import orm
 
+from core.bot import config as llm_config
 from core.db import session
 from core.discord import utils as discord_utils
+from core.finance.dart import model as dart_model
 from core.finance.dart import request as dart_request
-from core.finance.kis import client as kis_client
 from core.utils import args as args_utils
+from core.utils import http
 from core.utils import time as time_utils
+from trading.database.finance import bar_store
 from trading.database.finance import tables as data_tables
 from trading.database.trade import tables as advisor_tables
 from trading.model import llm
@@ -34,25 +39,24 @@ def _as_json(response: str) -> dict:
     return advice_dict
 
 
-def _summarize_chart(chart) -> str:
+def _summarize_chart(bars: list[bar_store.Bar]) -> str:
     rows = []
-    if chart and chart.bars:
-        for b in chart.bars:
-            rows.append(
-                pd.DataFrame(
-                    {
-                        "Time": b.time,
-                        "Open": b.open,
-                        "High": b.high,
-                        "Low": b.low,
-                        "Close": b.close,
-                        "Volume": b.volume,
-                        "Amount": b.amount,
-                        "Change": b.change,
-                    },
-                    index=[0],
-                )
+    for b in bars:
+        rows.append(
+            pd.DataFrame(
+                {
+                    "Time": b.time,
+                    "Open": b.open,
+                    "High": b.high,
+                    "Low": b.low,
+                    "Close": b.close,
+                    "Volume": b.volume,
+                    "Amount": b.amount,
+                    "Change": b.change,
+                },
+                index=[0],
             )
+        )
 
     if not rows:
         columns = ["Time", "Open", "High", "Low", "Close", "Volume", "Amount", "Change"]
@@ -61,109 +65,166 @@ def _summarize_chart(chart) -> str:
     return pd.concat(rows).to_csv()
 
 
+def _build_prompt(
+    quote_obj: data_tables.CorporateQuote,
+    info_obj: data_tables.CorporateInfo,
+    finance_report: dart_model.FinancialReport,
+    date: datetime.date,
+    database: str,
+) -> str:
+    chart_data_csv = _summarize_chart(
+        bar_store.get_bars(
+            info_obj.stock_code,
+            start=time_utils.get_months_before(date, 6),
+            end=date,
+            database=database,
+        )
+    )
+
+    return (
+        f"This is csv report of company name {info_obj.corp_name}\n"
+        f"{finance_report.as_dataframe().to_csv()}\n"
+        f"This is summary of stock quote:\n{quote_obj.summary()}\n"
+        f"This is bar chart csv data over last 6 months:\n{chart_data_csv}"
+    )
+
+
+def _screening_query(db_session: orm.Session) -> orm.Query:
+    return (
+        db_session.query(data_tables.CorporateQuote, data_tables.CorporateInfo)
+        .outerjoin(data_tables.CorporateInfo, data_tables.CorporateQuote.symbol == data_tables.CorporateInfo.stock_code)
+        .filter(data_tables.CorporateQuote.market_cap >= 500)
+        .filter(data_tables.CorporateQuote.eps > 0)
+        .filter(data_tables.CorporateQuote.rate > 0)
+        .filter(data_tables.CorporateQuote.risk == "none")
+        .filter(data_tables.CorporateQuote.overbought == "0")
+        .filter((0.5 <= data_tables.CorporateQuote.per) & (data_tables.CorporateQuote.per <= 10))
+        .filter((0.5 <= data_tables.CorporateQuote.pbr) & (data_tables.CorporateQuote.pbr <= 5))
+        .filter(data_tables.CorporateQuote.eps / data_tables.CorporateQuote.bps >= 0.1)
+        .order_by(data_tables.CorporateQuote.market_cap.desc())
+    )
+
+
+def _replace_candidates(db_session: orm.Session, date: str, candidates: list[advisor_tables.StockCandidate]) -> None:
+    """Replaces candidates of the day within the session transaction, so that re-runs of a day are idempotent
+
+    A run without any candidate, e.g. on an LLM outage, keeps what an earlier run of the day wrote.
+    """
+    if not candidates:
+        logger.warning(f"No candidates for {date}, keeping the existing ones")
+        return
+
+    num_deleted = (
+        db_session.query(advisor_tables.StockCandidate)
+        .filter(advisor_tables.StockCandidate.date == date)
+        .delete(synchronize_session=False)
+    )
+    if num_deleted:
+        logger.info(f"Replacing {num_deleted} candidates of {date}")
+
+    db_session.add_all(candidates)
+
+
 @time_utils.timeit
 @discord_utils.monitor
 def main(
     read_database: str = "finance",
     write_database: str = "trade",
     top_k: int = 30,
+    max_in_flight: int = llm_config.MAX_IN_FLIGHT,
+    llm_timeout: float = llm_config.CALL_TIMEOUT,
+    date: datetime.date | None = None,
 ):
+    """Screens and analyzes candidates of date, today by default, backtests pass the date they start from"""
     bot = llm.load_financial_bot()
-    date = time_utils.now().date()
-    candidates = []
-    raw_responses = []
+    date = date or time_utils.now().date()
     with session.get_database_session(read_database) as db_session:
-        corp_quotes = (
-            db_session.query(data_tables.CorporateQuote, data_tables.CorporateInfo)
-            .outerjoin(
-                data_tables.CorporateInfo, data_tables.CorporateQuote.symbol == data_tables.CorporateInfo.stock_code
-            )
-            .filter(data_tables.CorporateQuote.market_cap >= 500)
-            .filter(data_tables.CorporateQuote.eps > 0)
-            .filter(data_tables.CorporateQuote.rate > 0)
-            .filter(data_tables.CorporateQuote.risk == "none")
-            .filter(data_tables.CorporateQuote.overbought == "0")
-            .filter((0.5 <= data_tables.CorporateQuote.per) & (data_tables.CorporateQuote.per <= 10))
-            .filter((0.5 <= data_tables.CorporateQuote.pbr) & (data_tables.CorporateQuote.pbr <= 5))
-            .filter(data_tables.CorporateQuote.eps / data_tables.CorporateQuote.bps >= 0.1)
-            .order_by(data_tables.CorporateQuote.market_cap.desc())
-            .all()
-        )
+        corp_quotes = _screening_query(db_session).all()
         logger.info(f"Inspecting {min(len(corp_quotes), top_k)} stocks...")
 
-        for quote_obj, info_obj in corp_quotes[:top_k]:
-            if not info_obj or not info_obj.corp_code or not info_obj.stock_code:
-                continue
+        corp_quotes = [
+            (quote_obj, info_obj)
+            for quote_obj, info_obj in corp_quotes[:top_k]
+            if info_obj and info_obj.corp_code and info_obj.stock_code
+        ]
+        finance_reports = dart_request.get_financial_reports(
+            [info_obj.corp_code for _, info_obj in corp_quotes], date=date
+        )
 
+        # prompts are built one by one, only the LLM calls below run concurrently
+        corps = []
+        prompts = []
+        prompt_start = time.perf_counter()
+        for quote_obj, info_obj in corp_quotes:
             try:
-                corp_code = info_obj.corp_code
-                stock_code = info_obj.stock_code
-
-                finance_report = dart_request.get_financial_report(corp_code)
+                finance_report = finance_reports[info_obj.corp_code]
                 if not finance_report:
                     continue
 
-                finance_report_df = finance_report.as_dataframe()
-
-                chart_data_csv = _summarize_chart(
-                    kis_client.get_chart(
-                        stock_code,
-                        start=time_utils.get_months_before(date, 6),
-                        end=date,
-                    )
-                )
-                quote_summary_text = quote_obj.summary()
-
-                prompt = (
-                    f"This is csv report of company name {info_obj.corp_name}\n"
-                    f"{finance_report_df.to_csv()}\n"
-                    f"This is summary of stock quote:\n{quote_summary_text}\n"
-                    f"This is bar chart csv data over last 6 months:\n{chart_data_csv}"
-                )
-
-                response_content = bot.invoke(prompt).content
-                data = _as_json(response_content)
-                data.update(
+                prompts.append(_build_prompt(quote_obj, info_obj, finance_report, date, read_database))
+                corps.append(
                     {
                         "corp_name": info_obj.corp_name,
                         "corp_code": info_obj.corp_code,
                         "stock_code": info_obj.stock_code,
-                        "date": date.strftime("%Y-%m-%d"),
                     }
                 )
-
-                raw_responses.append(data)
-
-                candidates_dict = {k: v for k, v in data.items() if k != "summary"}
-                candidates.append(advisor_tables.StockCandidate(**candidates_dict))
-
-                time.sleep(0.5)
             except Exception as e:
                 logger.error(f"Error processing {info_obj.corp_name} ({info_obj.stock_code}): {e}")
                 continue
 
-        discord_messages = []
-        for i, data in enumerate(raw_responses):
-            discord_messages.append(
-                f"회사: {data['corp_name']}\n"
-                f"종목 코드: {data['stock_code']}\n"
-                f"재무건전성: {data['financial_stability_score']}\n"
-                f"성장지수: {data['growth_score']}\n"
-                f"매수지표: {data['valuation_attractiveness']}\n"
-                f"지지선(lower bound): {data['support_price']}\n"
-                f"저항선(upper bound): {data['resistance_price']}\n"
-                f"기술적 판단: {data['technical_signal']}\n"
-                f"AI 요약: {data['summary']}"
-            )
+    logger.info(f"Built {len(prompts)} prompts in {time.perf_counter() - prompt_start:.1f}s")
+    logger.info(f"Analyzing {len(prompts)} stocks with at most {max_in_flight} calls in flight")
+    responses = bot.invoke_all(prompts, max_in_flight=max_in_flight, timeout=llm_timeout)
+
+    candidates = []
+    raw_responses = []
+    for corp, response in zip(corps, responses):
+        if isinstance(response, Exception):
+            logger.error(f"LLM call failed for {corp['corp_name']} ({corp['stock_code']}): {response!r}")
+            continue
+
+        try:
+            data = _as_json(response.content)
+            data.update(corp)
+            data["date"] = date.strftime("%Y-%m-%d")
+
+            raw_responses.append(data)
+
+            candidates_dict = {k: v for k, v in data.items() if k != "summary"}
+            candidates.append(advisor_tables.StockCandidate(**candidates_dict))
+        except Exception as e:
+            logger.error(f"Error parsing analysis of {corp['corp_name']} ({corp['stock_code']}): {e}")
+            continue
+
+    discord_messages = []
+    for data in raw_responses:
+        discord_messages.append(
+            f"회사: {data['corp_name']}\n"
+            f"종목 코드: {data['stock_code']}\n"
+            f"재무건전성: {data['financial_stability_score']}\n"
+            f"성장지수: {data['growth_score']}\n"
+            f"매수지표: {data['valuation_attractiveness']}\n"
+            f"지지선(lower bound): {data['support_price']}\n"
+            f"저항선(upper bound): {data['resistance_price']}\n"
+            f"기술적 판단: {data['technical_signal']}\n"
+            f"AI 요약: {data['summary']}"
+        )
 
-        discord_utils.send_messages(discord_messages)
+    discord_utils.send_messages(discord_messages)
 
     with session.get_database_session(write_database) as db_session:
-        db_session.add_all(candidates)
+        _replace_candidates(db_session, date.strftime("%Y-%m-%d"), candidates)
 
     logger.info(f"Uploaded {len(candidates)} items to {write_database}.{advisor_tables.StockCandidate.__tablename__}")
+    http.log_metrics()
 
 
 if __name__ == "__main__":
-    opts = args_utils.BasicDBTaskArguments().parse()
-    main(read_database=opts.database)
+    opts = args_utils.CandidateTaskArguments().parse()
+    main(
+        read_database=opts.database,
+        top_k=opts.top_k,
+        max_in_flight=opts.max_in_flight,
+        llm_timeout=opts.llm_timeout,
+    )
@@ -0,0 +1,33 @@
+from sqlalchemy import orm
+
+from trading.database.trade import build_candidate_stock
+from trading.database.trade import tables
+
+
+def _candidate(date: str, stock_code: str, growth_score: int) -> tables.StockCandidate:
+    return tables.StockCandidate(date=date, stock_code=stock_code, corp_code="00000000", growth_score=growth_score)
+
+
+def _stored(db_session: orm.Session) -> list[tuple[str, str, int]]:
+    rows = db_session.query(tables.StockCandidate).order_by(
+        tables.StockCandidate.date, tables.StockCandidate.stock_code
+    )
+    return [(r.date, r.stock_code, r.growth_score) for r in rows]
+
+
+def test_replace_candidates(sqlite_db: orm.Session):
+    build_candidate_stock._replace_candidates(
+        sqlite_db, "2026-10-16", [_candidate("2026-10-16", "000000", 5), _candidate("2026-10-16", "111111", 6)]
+    )
+    build_candidate_stock._replace_candidates(sqlite_db, "2026-10-17", [_candidate("2026-10-17", "000000", 7)])
+    sqlite_db.commit()
+
+    # re-run of a day replaces only that day
+    build_candidate_stock._replace_candidates(sqlite_db, "2026-10-16", [_candidate("2026-10-16", "000000", 8)])
+    sqlite_db.commit()
+
+    # a run without candidates keeps the day
+    build_candidate_stock._replace_candidates(sqlite_db, "2026-10-17", [])
+    sqlite_db.commit()
+
+    assert _stored(sqlite_db) == [("2026-10-16", "000000", 8), ("2026-10-17", "000000", 7)]
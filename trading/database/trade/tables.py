@@ -1,4 +1,5 @@
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 
@@ -10,7 +11,13 @@ _DATABASE: str = "trade"
 class StockCandidate(base.Base):
     __tablename__ = "candidate_stock"
     __bind_key__ = _DATABASE
+    __table_args__ = (
+        # periodic runner loads candidates of the day filtered by scores
+        Index("ix_candidate_stock_date_scores", "date", "growth_score", "financial_stability_score"),
+    )
 
+    # one row per stock and day, date leads so that a day is a contiguous range of the primary key
+    date = Column(String(10), primary_key=True)
     stock_code = Column(String(6), primary_key=True)
     corp_code = Column(String(8))
     corp_name = Column(String(150))
@@ -20,4 +27,3 @@ class StockCandidate(base.Base):
     support_price = Column(Integer)
     resistance_price = Column(Integer)
     technical_signal = Column(String(40))
-    date = Column(String(10))
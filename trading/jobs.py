@@ -49,7 +49,7 @@ KRX_PERIODIC_JOBS = [
 
 
 KRX_UPPER_JOBS = [
-    jobs.RunnerJob(func="trading.runners.stock.krx_upper:run_krx_trader").add_trigger(
+    jobs.RunnerJob(func="trading.runners.stock.krx_upper:run_krx_trader", realtime=True).add_trigger(
         trigger=jobs.TriggerType.CRON,
         day_of_week="0, 1, 2, 3, 4",
         hour=8,
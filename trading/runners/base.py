@@ -1,11 +1,14 @@
 import abc
 import os
+import queue
 import sys
 import threading
 
 import loguru
 import overrides
+import pykis
 
+from core.finance.kis import stream
 from core.utils import time as time_utils
 
 
@@ -41,13 +44,14 @@ class AutoTraderBase(abc.ABC):
         """Executed after buy order"""
 
     @abc.abstractmethod
-    def _make_buy_order(self, symbol: str, buy_price: float, quantity: int) -> None:
-        """make buy order"""
+    def _make_buy_order(self, symbol: str, buy_price: float, quantity: int) -> pykis.KisOrder | None:
+        """make buy order, returning the order if one was placed"""
 
-    def _buy(self, symbol: str, **kwargs) -> None:
+    def _buy(self, symbol: str, **kwargs) -> pykis.KisOrder | None:
         self._on_buy_start(symbol)
-        self._make_buy_order(symbol, **kwargs)
+        order = self._make_buy_order(symbol, **kwargs)
         self._on_buy_end(symbol)
+        return order
 
     def _on_sell_start(self, symbol: str) -> None:
         """Executed before sell order"""
@@ -78,18 +82,84 @@ class PeriodicTrader(AutoTraderBase, abc.ABC):
 
 
 class RealTimeTrader(AutoTraderBase, abc.ABC):
+    """Monitor the market by polling every `_period` seconds, or by price ticks when a stream is given
+
+    In realtime mode ticks are queued by the stream thread and handled by a worker thread, so that orders placed from
+    `on_tick` never stall tick delivery. Symbols the stream cannot subscribe are handed to `poll_overflow`.
+    """
+
     _period: int = 60
 
-    def __init__(self):
+    def __init__(self, price_stream: stream.PriceStreamBase | None = None):
         self._monitor_thread = None
         self._stop_event = threading.Event()
+        self._price_stream = price_stream
+        self._ticks: queue.Queue[stream.PriceTick | None] = queue.Queue()
+
+    @property
+    def is_realtime(self) -> bool:
+        return self._price_stream is not None
 
     @abc.abstractmethod
     def monitor_loop(self, stop_event: threading.Event):
         pass
 
+    def _realtime_symbols(self) -> list[str]:
+        """Symbols to subscribe in realtime mode, most important first as the stream may not take all of them"""
+        return []
+
+    def on_tick(self, tick: stream.PriceTick) -> None:
+        """Executed on every realtime price tick"""
+
+    def poll_overflow(self, symbols: list[str], stop_event: threading.Event) -> None:
+        """Polls symbols beyond the stream subscription limit in realtime mode"""
+        self._logger.warning(f"{len(symbols)} symbols beyond the subscription limit are not monitored: {symbols}")
+
+    def _on_period(self) -> None:
+        """Executed every `_period` seconds in realtime mode"""
+
+    def _dispatch_tick(self, tick: stream.PriceTick) -> None:
+        if self._stop_event.is_set():
+            return
+
+        self._ticks.put(tick)
+
+    def _handle_ticks(self) -> None:
+        while (tick := self._ticks.get()) is not None:
+            try:
+                self.on_tick(tick)
+            except Exception as e:
+                self._logger.error(f"Failed handling tick {tick}: {e}")
+
+    def _run_stream_loop(self):
+        tick_worker = threading.Thread(target=self._handle_ticks, daemon=True)
+        tick_worker.start()
+
+        subscribed, overflow = [], []
+        for s in self._realtime_symbols():
+            (subscribed if self._price_stream.subscribe(s, self._dispatch_tick) else overflow).append(s)
+        self._logger.info(f"Subscribed realtime price of {len(subscribed)} symbols, {len(overflow)} left to polling")
+
+        poller = None
+        if overflow:
+            poller = threading.Thread(target=self.poll_overflow, args=(overflow, self._stop_event), daemon=True)
+            poller.start()
+
+        while not self._stop_event.wait(self._period):
+            self._on_period()
+
+        self._price_stream.close()
+        # ticks queued before the stop are still handled
+        self._ticks.put(None)
+        tick_worker.join()
+        if poller:
+            poller.join()
+
     def _run_monitor_loop(self):
-        self.monitor_loop(self._stop_event)
+        if self.is_realtime:
+            self._run_stream_loop()
+        else:
+            self.monitor_loop(self._stop_event)
 
     @overrides.override
     def start(self):
@@ -0,0 +1,130 @@
+import datetime
+import threading
+import time
+
+from core.finance.kis import fake_stream
+from core.finance.kis import stream
+from trading.runners import base
+
+
+class _TickRecorder(base.RealTimeTrader):
+    _name = "tick_recorder"
+
+    def __init__(self, symbols: list[str], price_stream: stream.PriceStreamBase | None = None):
+        super().__init__(price_stream=price_stream)
+        self._symbols = symbols
+        self.ticks = []
+        self.polled = threading.Event()
+        self.overflow = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def _realtime_symbols(self) -> list[str]:
+        return self._symbols
+
+    def on_tick(self, tick: stream.PriceTick) -> None:
+        self.release.wait()
+        self.ticks.append(tick)
+
+    def poll_overflow(self, symbols: list[str], stop_event: threading.Event) -> None:
+        self.overflow = symbols
+
+    def monitor_loop(self, stop_event: threading.Event):
+        self.polled.set()
+
+    def _on_startup(self) -> None:
+        pass
+
+    def _on_shutdown(self) -> None:
+        pass
+
+    def _make_buy_order(self, symbol: str, buy_price: float, quantity: int) -> None:
+        pass
+
+    def _make_sell_order(self, symbol: str, sell_price: float) -> None:
+        pass
+
+
+class _LimitedPriceStream(fake_stream.FakePriceStream):
+    def __init__(self, limit: int):
+        super().__init__()
+        self._limit = limit
+        self.subscribed = []
+
+    def subscribe(self, symbol: str, callback: stream.TickCallback) -> bool:
+        if len(self.subscribed) >= self._limit:
+            return False
+
+        self.subscribed.append(symbol)
+        return super().subscribe(symbol, callback)
+
+
+def _tick(symbol: str, price: float) -> stream.PriceTick:
+    return stream.PriceTick(
+        symbol=symbol,
+        time=datetime.datetime(2025, 8, 11, 14, 30),
+        price=price,
+        open=price,
+        high=price,
+        low=price,
+        volume=1,
+        amount=price,
+    )
+
+
+def test_realtime_trader_dispatches_subscribed_ticks():
+    price_stream = fake_stream.FakePriceStream()
+    trader = _TickRecorder(symbols=["005930"], price_stream=price_stream)
+
+    trader.start()
+    while price_stream.symbols != ["005930"]:
+        time.sleep(0.001)
+
+    price_stream.publish(_tick("005930", 70_000))
+    price_stream.publish(_tick("000660", 120_000))  # not subscribed
+    price_stream.publish(_tick("005930", 70_100))
+    price_stream.join()
+    trader.end()
+
+    assert [t.price for t in trader.ticks] == [70_000, 70_100]
+    assert not trader.polled.is_set()
+
+
+def test_realtime_trader_falls_back_to_polling_without_stream():
+    trader = _TickRecorder(symbols=["005930"])
+
+    trader.start()
+    trader.end()
+
+    assert trader.polled.is_set()
+    assert not trader.is_realtime
+
+
+def test_slow_tick_handling_does_not_stall_the_stream():
+    price_stream = fake_stream.FakePriceStream()
+    trader = _TickRecorder(symbols=["005930"], price_stream=price_stream)
+    trader.release.clear()  # e.g. an order in flight
+
+    trader.start()
+    while price_stream.symbols != ["005930"]:
+        time.sleep(0.001)
+
+    price_stream.publish(_tick("005930", 70_000))
+    price_stream.publish(_tick("005930", 70_100))
+    price_stream.join()  # delivered while the first tick is still being handled
+
+    trader.release.set()
+    trader.end()
+
+    assert [t.price for t in trader.ticks] == [70_000, 70_100]
+
+
+def test_symbols_beyond_subscription_limit_are_polled():
+    price_stream = _LimitedPriceStream(limit=2)
+    trader = _TickRecorder(symbols=["000001", "000002", "000003", "000004"], price_stream=price_stream)
+
+    trader.start()
+    trader.end()
+
+    assert price_stream.subscribed == ["000001", "000002"]
+    assert trader.overflow == ["000003", "000004"]
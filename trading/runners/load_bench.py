@@ -0,0 +1,201 @@
+"""Load bench of the KRX runners against the fake KIS server, neither the broker nor the database is needed
+
+The synthetic universe, server latency, throttling and error rate are configured with KIS_FAKE_* variables and the
+client side budget with KIS_REAL_REQUESTS_PER_SECOND, e.g.
+
+    KIS_FAKE_UNIVERSE_SIZE=3000 KIS_FAKE_ERROR_RATE=0.01 python -m trading.runners.load_bench --num-candidates 200
+"""
+
+import argparse
+import datetime
+import threading
+import time
+
+from loguru import logger
+import overrides
+
+from core.finance.kis import client as kis_client
+from core.finance.kis import fake as kis_fake
+from core.finance.kis import fake_stream
+from core.finance.kis import stream
+from core.utils import args as args_utils
+from core.utils import time as time_utils
+from trading.asset import wallet as wallet_asset
+from trading.database.finance import bar_store
+from trading.runners.stock import krx_periodic
+from trading.runners.stock import krx_upper
+from trading.strategy import base as strategy_base
+
+
+class _TimedWallet(wallet_asset.KISWallet):
+    """Records order latency as seen by runners, including the wait on the client side rate limiter"""
+
+    def __init__(self):
+        super().__init__()
+        self.latencies: list[float] = []
+        self._latency_lock = threading.Lock()
+
+    @overrides.override
+    def buy(self, *args, **kwargs):
+        started_at = time.monotonic()
+        order = super().buy(*args, **kwargs)
+
+        with self._latency_lock:
+            self.latencies.append(time.monotonic() - started_at)
+        return order
+
+
+class _UpperRunner(krx_upper.Runner):
+    _period = 1  # also the holdings refresh interval in realtime mode
+
+    def __init__(self, symbols: list[str], **kwargs):
+        super().__init__(
+            strategy=strategy_base.UpperLimitStrategy(),
+            trade_start=datetime.time(tzinfo=time_utils.TimeZone.SEOUL.value),
+            verbose=False,
+            **kwargs,
+        )
+        self._symbols = symbols
+        self.num_ticks = 0
+
+    @overrides.override
+    def _reset_daily_logger(self) -> None:
+        pass
+
+    @overrides.override
+    def _load_candidates(self) -> None:
+        self._current_candidates = [krx_upper.TradeObject(s) for s in self._symbols]
+
+    @overrides.override
+    def _load_prev_bars(self) -> None:
+        today = time_utils.now().date()
+
+        for s in self._symbols:
+            chart = kis_client.get_chart(s, start=time_utils.get_days_before(today, 7), end=today)
+            if chart and chart.bars:
+                self._prev_bars[s] = bar_store.Bar.from_chart_bar(chart.bars[-1])
+
+    @overrides.override
+    def on_tick(self, tick: stream.PriceTick) -> None:
+        self.num_ticks += 1
+        super().on_tick(tick)
+
+
+class _PeriodicRunner(krx_periodic.Runner):
+    def __init__(self, symbols: list[str], **kwargs):
+        super().__init__(
+            strategy=krx_periodic.Strategy(),
+            num_candidates=len(symbols),
+            num_max_stock=len(symbols),
+            verbose=False,
+            **kwargs,
+        )
+        self._symbols = symbols
+
+    @overrides.override
+    def _reset_daily_logger(self) -> None:
+        pass
+
+    @overrides.override
+    def _load_candidates(self) -> None:
+        # the lowest fibonacci target sits above the current price, so every candidate gets bought
+        prices = kis_client.get_prices(self._symbols).prices
+        self._current_candidates = [
+            krx_periodic.TradeObject(
+                stock_code=s,
+                support_price=int(p.price * 0.9),
+                resistance_price=int(p.price * 1.5),
+            )
+            for s, p in prices.items()
+        ]
+
+
+def _log_latencies(name: str, latencies: list[float]) -> None:
+    if not latencies:
+        logger.info(f"[{name}] no orders")
+        return
+
+    latencies = sorted(latencies)
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    logger.info(f"[{name}] {len(latencies)} orders, latency p50 {p50 * 1000:.1f}ms, p95 {p95 * 1000:.1f}ms")
+
+
+def _scan_universe(symbols: list[str], max_workers: int) -> None:
+    started_at = time.monotonic()
+    results = list(kis_client.iter_quotes(symbols, max_workers=max_workers))
+    elapsed = time.monotonic() - started_at
+
+    num_found = sum(r.quote is not None for r in results)
+    p95 = sorted(r.latency for r in results)[min(len(results) - 1, int(len(results) * 0.95))] if results else 0.0
+    logger.info(
+        f"[scan] {num_found}/{len(symbols)} quotes in {elapsed:.2f}s, {len(symbols) / elapsed:.1f} quotes/s, "
+        f"latency p95 {p95 * 1000:.1f}ms"
+    )
+
+    started_at = time.monotonic()
+    batch = kis_client.get_prices(symbols)
+    elapsed = time.monotonic() - started_at
+    logger.info(
+        f"[scan] {len(batch.prices)}/{len(symbols)} prices in {elapsed:.2f}s, {len(symbols) / elapsed:.1f} prices/s"
+    )
+
+
+def _run_upper(market: kis_fake.FakeMarket, symbols: list[str], trials: int, duration: float, realtime: bool) -> None:
+    name = "upper realtime" if realtime else "upper polling"
+    wallet = _TimedWallet()
+    runner = _UpperRunner(
+        symbols,
+        wallet=wallet,
+        max_trial=trials,
+        price_stream=fake_stream.FakeMarketPriceStream(market) if realtime else None,
+    )
+
+    started_at = time.monotonic()
+    runner.start()
+    # both modes stop on end(), polling runs up to `trials` rounds within the duration
+    time.sleep(duration)
+    runner.end()
+    elapsed = time.monotonic() - started_at
+
+    ticks = f", {runner.num_ticks} ticks" if realtime else ""
+    logger.info(f"[{name}] {len(symbols)} candidates in {elapsed:.2f}s{ticks}")
+    _log_latencies(name, wallet.latencies)
+
+
+def _run_periodic(symbols: list[str]) -> None:
+    wallet = _TimedWallet()
+    runner = _PeriodicRunner(symbols, wallet=wallet)
+
+    started_at = time.monotonic()
+    runner.start()
+    elapsed = time.monotonic() - started_at
+
+    logger.info(f"[periodic] {len(symbols)} candidates in {elapsed:.2f}s")
+    _log_latencies("periodic", wallet.latencies)
+
+
+def main(opts: argparse.Namespace):
+    market = kis_fake.FakeMarket.from_config(kis_fake.load_config())
+    kis_client.use_client(kis_fake.FakeKis(market))
+
+    symbols = market.symbols
+    upper_symbols = market.upper_limit_symbols[: opts.num_candidates]
+    logger.info(f"Load test on {len(symbols)} symbols, {len(upper_symbols)} of them hit the upper limit")
+
+    _scan_universe(symbols, opts.max_workers)
+    _run_upper(market, upper_symbols, opts.trials, opts.duration, realtime=True)
+    _run_upper(market, upper_symbols, opts.trials, opts.duration, realtime=False)
+    _run_periodic(symbols[: opts.num_candidates])
+
+    stats = market.stats
+    logger.info(
+        f"[server] {stats.requests} requests, {stats.throttled} throttled, {stats.errors} errors, {stats.orders} orders, "
+        f"order latency p50 {stats.order_latency(0.5) * 1000:.1f}ms, p95 {stats.order_latency(0.95) * 1000:.1f}ms"
+    )
+    logger.info(f"[client] cache {kis_client.cache_stats()}, shared {kis_client.num_shared_requests()}")
+
+
+if __name__ == "__main__":
+    opts = args_utils.LoadTestArguments.parse()
+    main(opts)
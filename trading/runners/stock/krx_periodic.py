@@ -1,6 +1,7 @@
 import dataclasses
 
 import overrides
+from sqlalchemy import orm
 
 from core.db import session
 from core.discord import utils as discord_utils
@@ -21,9 +22,30 @@ class TradeObject:
     resistance_price: int
 
 
+def _candidate_query(db_session: orm.Session, date: str, holdings: list[str]) -> orm.Query:
+    return (
+        db_session.query(trade_tables.StockCandidate)
+        .filter(trade_tables.StockCandidate.date == date)
+        .filter(trade_tables.StockCandidate.stock_code.not_in(holdings))
+        .filter(trade_tables.StockCandidate.growth_score >= 5)
+        .filter(trade_tables.StockCandidate.financial_stability_score >= 5)
+        .filter(trade_tables.StockCandidate.valuation_attractiveness.in_(["Undervalued", "Fairly valued"]))
+        .filter(
+            trade_tables.StockCandidate.technical_signal.in_(
+                [
+                    "Golden Cross Occured",
+                    "Entering Oversold Territory",
+                    "Range Bound Movement",
+                    "Approaching Key Support",
+                ]
+            )
+        )
+    )
+
+
 class Strategy(strategy_base.StrategyBase):
     def is_buyable(self, wallet: wallet_asset.KISWallet, price: float) -> bool:
-        return wallet.deposit(model_type.Currency.KRW).amount > price
+        return wallet.deposit_amount(model_type.Currency.KRW) > price
 
     def is_sellable(self, wallet: wallet_asset.KISWallet, price: float) -> bool:
         return True
@@ -53,25 +75,9 @@ class Runner(runner_base.PeriodicTrader):
 
     def _load_candidates(self) -> None:
         with session.get_database_session(self._database) as db_session:
-            candidates = (
-                db_session.query(trade_tables.StockCandidate)
-                .filter(trade_tables.StockCandidate.date == time_utils.now().strftime("%Y-%m-%d"))
-                .filter(trade_tables.StockCandidate.stock_code.not_in(self._current_holdings))
-                .filter(trade_tables.StockCandidate.growth_score >= 5)
-                .filter(trade_tables.StockCandidate.financial_stability_score >= 5)
-                .filter(trade_tables.StockCandidate.valuation_attractiveness.in_(["Undervalued", "Fairly valued"]))
-                .filter(
-                    trade_tables.StockCandidate.technical_signal.in_(
-                        [
-                            "Golden Cross Occured",
-                            "Entering Oversold Territory",
-                            "Range Bound Movement",
-                            "Approaching Key Support",
-                        ]
-                    )
-                )
-                .all()
-            )
+            candidates = _candidate_query(
+                db_session, time_utils.now().strftime("%Y-%m-%d"), list(self._current_holdings)
+            ).all()
             for c in candidates[: self._num_candidates]:
                 self._current_candidates.append(
                     TradeObject(
@@ -115,12 +121,12 @@ class Runner(runner_base.PeriodicTrader):
     def _make_buy_order(self, symbol: str, buy_price: float, quantity: int) -> None:
         stock = kis_client.get_stock(symbol)
 
-        if self._wallet.deposit(model_type.Currency.KRW).amount < buy_price * quantity:
+        if self._wallet.deposit_amount(model_type.Currency.KRW) < buy_price * quantity:
             self._logger.debug(f"Not enough money for stock {symbol}")
             return
 
         if self._strategy.is_buyable(self._wallet, buy_price * quantity):
-            kis_client.buy(stock=stock, qty=quantity, price=buy_price)
+            self._wallet.buy(stock, qty=quantity, price=buy_price)
 
     @overrides.override
     def _on_sell_start(self, symbol: str) -> None:
@@ -130,7 +136,7 @@ class Runner(runner_base.PeriodicTrader):
     def _make_sell_order(self, symbol: str, sell_price: float) -> None:
         """make sell order"""
         stock = self._current_holdings[symbol]
-        stock.sell(qty=stock.qty, price=sell_price)
+        self._wallet.sell(stock, qty=stock.qty, price=sell_price)
 
     @overrides.override
     def start(self) -> None:
@@ -151,7 +157,7 @@ class Runner(runner_base.PeriodicTrader):
             if quote.price <= target_prices[0]:
                 price = min(quote.price, target_prices[0])
 
-                if self._wallet.deposit(model_type.Currency.KRW).amount < price:
+                if self._wallet.deposit_amount(model_type.Currency.KRW) < price:
                     discord_utils.send_messages(f"Not enough money to buy stock {c.stock_code}")
                     continue
 
@@ -1,14 +1,17 @@
 import dataclasses
 import datetime
 import threading
-import time
 
 import overrides
+import pykis
+from sqlalchemy import orm
 
 from core.db import session
 from core.finance.kis import client as kis_client
+from core.finance.kis import stream
 from core.utils import time as time_utils
 from trading.asset import wallet as wallet_asset
+from trading.database.finance import bar_store
 from trading.database.finance import tables as data_tables
 from trading.model import type as model_type
 from trading.runners import base as runner_base
@@ -22,6 +25,15 @@ class TradeObject:
     stock_code: str
 
 
+def _upper_limit_query(db_session: orm.Session) -> orm.Query:
+    return (
+        db_session.query(data_tables.CorporateQuote)
+        .filter(data_tables.CorporateQuote.rate >= 29.95)  # 상한가
+        .filter(data_tables.CorporateQuote.risk == "none")
+        .filter(data_tables.CorporateQuote.halt == False)  # noqa: E712
+    )
+
+
 class Runner(runner_base.RealTimeTrader):
     _current_candidates: list = []
     _current_holdings: dict = {}
@@ -36,8 +48,10 @@ class Runner(runner_base.RealTimeTrader):
         num_max_stock: int = 10,
         max_trial: int = 20,
         verbose: bool = True,
+        price_stream: stream.PriceStreamBase | None = None,
+        trade_start: datetime.time = _TRADE_START,
     ):
-        super().__init__()
+        super().__init__(price_stream=price_stream)
         self._strategy = strategy
         self._wallet = wallet
         self._verbose = verbose
@@ -45,16 +59,14 @@ class Runner(runner_base.RealTimeTrader):
         self._num_max_stock = num_max_stock
         self._finance_database = "finance"
         self._max_trial = max_trial
+        self._prev_bars: dict[str, bar_store.Bar] = {}
+        self._ordered_symbols: set[str] = set()
+        self._order_lock = threading.Lock()
+        self._trade_start = trade_start
 
     def _load_candidates(self) -> None:
         with session.get_database_session(self._finance_database) as db_session:
-            corp_candidates = (
-                db_session.query(data_tables.CorporateQuote)
-                .filter(data_tables.CorporateQuote.rate >= 29.95)  # 상한가
-                .filter(data_tables.CorporateQuote.risk == "none")
-                .filter(data_tables.CorporateQuote.halt == False)  # noqa: E712
-                .all()
-            )
+            corp_candidates = _upper_limit_query(db_session).all()
 
             if not corp_candidates:
                 self._logger.info("There's nothing worthy to trade")
@@ -62,6 +74,19 @@ class Runner(runner_base.RealTimeTrader):
 
             self._current_candidates = [TradeObject(c.symbol) for c in corp_candidates]
 
+    def _load_prev_bars(self) -> None:
+        today = time_utils.now().date()
+
+        for c in self._current_candidates:
+            bars = bar_store.get_bars(
+                c.stock_code,
+                start=time_utils.get_days_before(today, 7),
+                end=time_utils.get_days_before(today, 1),
+                database=self._finance_database,
+            )
+            if bars:
+                self._prev_bars[c.stock_code] = bars[-1]  # day that hit upper limit
+
     def _update_holdings(self) -> None:
         current_holdings = self._current_holdings
         updated_holdings = self._wallet.holding_stocks
@@ -73,19 +98,23 @@ class Runner(runner_base.RealTimeTrader):
                 if u not in current_holdings:
                     self._logger.info(f"stock {u} bought")
 
-        self._current_holdings = updated_holdings
+        with self._order_lock:
+            self._current_holdings = updated_holdings
 
     @overrides.override
     def _on_startup(self) -> None:
         self._reset_daily_logger()
         self._current_holdings = self._wallet.holding_stocks
         self._load_candidates()
+        self._load_prev_bars()
 
         self._logger.debug(f"Current holdings: {self._current_holdings.keys()}")
         self._logger.debug(f"Current candidates: {self._current_candidates}")
 
     @overrides.override
     def _on_shutdown(self) -> None:
+        self._logger.debug(f"KIS cache stats: {kis_client.cache_stats()}")
+        self._logger.debug(f"KIS requests shared with in-flight calls: {kis_client.num_shared_requests()}")
         self._logger.debug(f"Trader {self._name} shutdown")
 
     @overrides.override
@@ -93,15 +122,15 @@ class Runner(runner_base.RealTimeTrader):
         self._logger.debug(f"Try buying symbol {symbol}")
 
     @overrides.override
-    def _make_buy_order(self, symbol: str, buy_price: float, quantity: int) -> None:
+    def _make_buy_order(self, symbol: str, buy_price: float, quantity: int) -> pykis.KisOrder | None:
         stock = kis_client.get_stock(symbol)
 
-        if not stock or self._wallet.deposit(model_type.Currency.KRW).amount < buy_price * quantity:
+        if not stock or self._wallet.deposit_amount(model_type.Currency.KRW) < buy_price * quantity:
             self._logger.debug(f"Not enough money for stock {symbol}")
-            return
+            return None
 
         self._logger.debug(f"Placing order for symbol: {stock} at price: {buy_price} with quantity: {quantity}")
-        kis_client.buy(stock=stock, qty=quantity, price=buy_price)
+        return self._wallet.buy(stock, qty=quantity, price=buy_price)
 
     @overrides.override
     def _on_sell_start(self, symbol: str) -> None:
@@ -111,51 +140,101 @@ class Runner(runner_base.RealTimeTrader):
     def _make_sell_order(self, symbol: str, sell_price: float) -> None:
         """make sell order"""
         stock = self._current_holdings[symbol]
-        stock.sell(qty=stock.qty, price=sell_price)
+        self._wallet.sell(stock, qty=stock.qty, price=sell_price)
 
-    @overrides.override
-    def monitor_loop(self, stop_event: threading.Event):
-        while not time_utils.now().time() >= _TRADE_START:
-            time.sleep(self._period)
+    def _try_buy(
+        self,
+        symbol: str,
+        price: float,
+        prev_chart: bar_store.Bar,
+        today_chart: pykis.KisQuote | stream.PriceTick,
+    ) -> bool:
+        """Buy the symbol if the strategy allows it, returning whether an order was placed"""
+        if not self._strategy.is_buyable(price, prev_chart, today_chart):
+            return False
+
+        target_price = self._strategy.target_price(today_chart)
+        quantity = max(1, self._max_buy_amount // target_price)
+
+        if price > target_price:
+            return False
+
+        # claimed under the lock, ordered outside of it so that a slow order never blocks other symbols
+        with self._order_lock:
+            if symbol in self._current_holdings or symbol in self._ordered_symbols:
+                return False
+            self._ordered_symbols.add(symbol)
+
+        order = None
+        try:
+            order = self._buy(symbol, buy_price=price, quantity=quantity)
+        finally:
+            # released when no order went out so that the symbol is tried again
+            if order is None:
+                with self._order_lock:
+                    self._ordered_symbols.discard(symbol)
+
+        return order is not None
+
+    def _watched_symbols(self) -> list[str]:
+        """Candidates with a previous bar, most traded first"""
+        symbols = [c.stock_code for c in self._current_candidates if c.stock_code in self._prev_bars]
+        return sorted(symbols, key=lambda s: self._prev_bars[s].amount, reverse=True)
+
+    def _poll(self, symbols: list[str], stop_event: threading.Event) -> None:
+        while not time_utils.now().time() >= self._trade_start:
+            if stop_event.wait(self._period):
+                return
 
-        self._logger.info(f"Trading started at {time_utils.now()}")
+        self._logger.info(f"Polling {len(symbols)} symbols from {time_utils.now()}")
 
-        for i in range(self._max_trial):
-            for c in self._current_candidates:
-                if c.stock_code in self._current_holdings:
-                    continue
+        for _ in range(self._max_trial):
+            with self._order_lock:
+                pending = [s for s in symbols if s not in self._current_holdings and s not in self._ordered_symbols]
 
-                now = time_utils.now()
+            # price carries today's running open, high, low and amount
+            for symbol, price in kis_client.get_prices(pending).prices.items():
+                self._try_buy(symbol, price.price, self._prev_bars[symbol], price)
 
-                quote = kis_client.get_quote(c.stock_code)
-                chart = kis_client.get_chart(
-                    c.stock_code,
-                    start=time_utils.get_days_before(time_utils.start_of_the_day(now), 4),
-                    end=now,
-                )
-                if not quote or not chart:
-                    continue
+            self._update_holdings()
+            if stop_event.wait(self._period):
+                return
 
-                prev_chart = chart.bars[-2]  # day that hit upper limit
-                today_chart = chart.bars[-1]  # today
+    @overrides.override
+    def _realtime_symbols(self) -> list[str]:
+        # the websocket takes a limited number of symbols, the most liquid get realtime prices
+        return self._watched_symbols()
 
-                if self._strategy.is_buyable(quote.price, prev_chart, today_chart):
-                    target_price = self._strategy.target_price(today_chart)
-                    quantity = max(1, self._max_buy_amount // target_price)
+    @overrides.override
+    def on_tick(self, tick: stream.PriceTick) -> None:
+        if not time_utils.now().time() >= self._trade_start:
+            return
 
-                    if quote.price <= target_price:
-                        self._buy(c.stock_code, buy_price=quote.price, quantity=quantity)
+        self._try_buy(tick.symbol, tick.price, self._prev_bars[tick.symbol], tick)
 
-            self._update_holdings()
-            time.sleep(self._period)
+    @overrides.override
+    def poll_overflow(self, symbols: list[str], stop_event: threading.Event) -> None:
+        self._poll(symbols, stop_event)
+
+    @overrides.override
+    def _on_period(self) -> None:
+        self._update_holdings()
+
+    @overrides.override
+    def monitor_loop(self, stop_event: threading.Event):
+        self._poll(self._watched_symbols(), stop_event)
 
 
 _RUNNER: Runner | None = None
 
 
-def run_krx_trader() -> None:
+def run_krx_trader(realtime: bool = False) -> None:
     global _RUNNER
-    _RUNNER = Runner(strategy=strategy_base.UpperLimitStrategy(), wallet=wallet_asset.get_kis_wallet())
+    _RUNNER = Runner(
+        strategy=strategy_base.UpperLimitStrategy(),
+        wallet=wallet_asset.get_kis_wallet(),
+        price_stream=stream.KisPriceStream() if realtime else None,
+    )
     _RUNNER.start()
 
 
@@ -0,0 +1,49 @@
+import decimal
+
+import pytest
+import pytest_mock
+
+from trading.runners.stock import krx_upper
+
+
+def _runner(mocker: pytest_mock.MockerFixture, order) -> krx_upper.Runner:
+    mocker.patch("core.finance.kis.client.get_stock", return_value="stock")
+
+    strategy = mocker.Mock()
+    strategy.is_buyable.return_value = True
+    strategy.target_price.return_value = 10_000
+
+    wallet = mocker.Mock()
+    wallet.deposit_amount.return_value = decimal.Decimal(1_000_000)
+    if isinstance(order, Exception):
+        wallet.buy.side_effect = order
+    else:
+        wallet.buy.return_value = order
+
+    return krx_upper.Runner(strategy=strategy, wallet=wallet, max_buy_amount=100_000)
+
+
+def test_try_buy_claims_symbol_once_ordered(mocker: pytest_mock.MockerFixture):
+    runner = _runner(mocker, order="order")
+
+    assert runner._try_buy("005930", 9_000, mocker.Mock(), mocker.Mock())
+    assert not runner._try_buy("005930", 9_000, mocker.Mock(), mocker.Mock())
+    runner._wallet.buy.assert_called_once_with("stock", qty=10, price=9_000)
+
+
+def test_try_buy_releases_symbol_without_order(mocker: pytest_mock.MockerFixture):
+    runner = _runner(mocker, order=None)
+
+    assert not runner._try_buy("005930", 9_000, mocker.Mock(), mocker.Mock())
+    assert not runner._try_buy("005930", 9_000, mocker.Mock(), mocker.Mock())
+    assert runner._wallet.buy.call_count == 2
+    assert "005930" not in runner._ordered_symbols
+
+
+def test_try_buy_releases_symbol_on_error(mocker: pytest_mock.MockerFixture):
+    runner = _runner(mocker, order=RuntimeError("order rejected"))
+
+    with pytest.raises(RuntimeError):
+        runner._try_buy("005930", 9_000, mocker.Mock(), mocker.Mock())
+
+    assert "005930" not in runner._ordered_symbols